@@ -17,7 +17,11 @@ load_dotenv()
 # 匯入自定義模組
 from line_handler import LINENewsBot
 from crawler import TechOrangeCrawler
+from async_crawler import ThreadedAsyncCrawler
+from ingest import FeedIngestor
 from summarizer import get_summarizer
+from deadline import Deadline
+from warmup import ConnectionWarmer
 
 # 設置日誌
 logging.basicConfig(level=logging.INFO)
@@ -30,10 +34,12 @@ app = Flask(__name__)
 line_bot = None
 crawler = None
 summarizer = None
+ingestor = None
+warmer = None
 
 def initialize_components():
     """初始化所有組件"""
-    global line_bot, crawler, summarizer
+    global line_bot, crawler, summarizer, ingestor, warmer
     
     try:
         # 檢查環境變數
@@ -57,9 +63,19 @@ def initialize_components():
         
         # 初始化爬蟲
         logger.info("正在初始化 TechOrange 爬蟲...")
-        crawler = TechOrangeCrawler()
+        if os.getenv('CRAWLER_ENGINE', 'sync').lower() == 'async':
+            # 非同步引擎：所有頁面擷取共用一個背景事件迴圈
+            crawler = ThreadedAsyncCrawler()
+        else:
+            crawler = TechOrangeCrawler()
         logger.info("TechOrange 爬蟲初始化成功")
         
+        # 啟動背景擷取（INGEST_INTERVAL 為 0 則停用）
+        if float(os.getenv('INGEST_INTERVAL', 0)) > 0 and ingestor is None:
+            ingestor = FeedIngestor()
+            ingestor.start()
+            logger.info("背景擷取已啟動")
+        
         # 初始化摘要器
         if gemini_key:
             logger.info("正在初始化 Gemini 摘要器...")
@@ -69,6 +85,12 @@ def initialize_components():
             logger.warning("GEMINI_API_KEY 未設置，摘要功能將不可用")
             summarizer = None
         
+        # 預熱上游連線並快取 DNS，之後定期刷新（WARMUP_INTERVAL 為 0 則停用）
+        if float(os.getenv('WARMUP_INTERVAL', 120)) > 0 and warmer is None:
+            warmer = ConnectionWarmer(probes={'gemini_sdk': summarizer.warm_up} if summarizer else None)
+            warmer.start()
+            logger.info("連線預熱已啟動")
+        
         return True
         
     except Exception as e:
@@ -161,6 +183,10 @@ def health_check():
             'environment_variables': env_vars
         }
         
+        # 連線預熱統計（冷/熱連線延遲與省下的交握時間）
+        if warmer:
+            status['warmup'] = warmer.get_stats()
+        
         # 如果有問題，添加建議
         if overall_status != 'healthy':
             suggestions = []
@@ -200,26 +226,32 @@ def test_endpoint():
         'status': 'OK'
     }
 
+# 請求期限中保留給推送結果的秒數（爬取與摘要必須在此之前完成）
+PUSH_RESERVE_SECONDS = 3
+
 class NewsBot:
     """新聞機器人主要邏輯類別"""
     
     def __init__(self):
         self.max_articles = int(os.getenv('MAX_ARTICLES', 3))
         
-    def process_user_query(self, user_id: str, keyword: str):
+    def process_user_query(self, user_id: str, keyword: str, deadline: Deadline = None):
         """
         處理用戶查詢請求（在背景執行）
         
         Args:
             user_id: LINE 用戶 ID
             keyword: 搜尋關鍵字
+            deadline: 收到 webhook 時建立的請求期限，預設依 REQUEST_DEADLINE 建立
         """
+        deadline = deadline or Deadline.from_env()
+        work_deadline = deadline.reserve(PUSH_RESERVE_SECONDS)
         try:
             logger.info(f"開始處理用戶查詢: 用戶ID={user_id}, 關鍵字={keyword}")
             
             # 1. 爬取文章
             logger.info(f"正在爬取 TechOrange 文章...")
-            articles = crawler.fetch_articles(keyword, self.max_articles)
+            articles = crawler.fetch_articles(keyword, self.max_articles, deadline=work_deadline)
             
             if not articles:
                 line_bot.send_article_results(user_id, [], keyword)
@@ -229,7 +261,7 @@ class NewsBot:
             
             # 2. 生成摘要
             logger.info("正在生成文章摘要...")
-            summarized_articles = summarizer.summarize_articles(articles)
+            summarized_articles = summarizer.summarize_articles(articles, deadline=work_deadline)
             
             if not summarized_articles:
                 logger.warning("摘要生成失敗")
@@ -239,9 +271,12 @@ class NewsBot:
             logger.info(f"成功生成 {len(summarized_articles)} 篇摘要")
             
             # 3. 發送結果
-            line_bot.send_article_results(user_id, summarized_articles, keyword)
+            line_bot.send_article_results(user_id, summarized_articles, keyword, deadline=deadline)
             
-            logger.info(f"用戶查詢處理完成: {keyword}")
+            if deadline.degraded:
+                logger.info(f"用戶查詢處理完成: {keyword}（降級: {'；'.join(deadline.degraded)}）")
+            else:
+                logger.info(f"用戶查詢處理完成: {keyword}")
             
         except Exception as e:
             logger.error(f"處理用戶查詢時發生錯誤: {str(e)}")
@@ -256,13 +291,16 @@ class NewsBot:
             except Exception as send_error:
                 logger.error(f"發送錯誤訊息失敗: {str(send_error)}")
     
-    def process_random_push(self, user_id: str):
+    def process_random_push(self, user_id: str, deadline: Deadline = None):
         """
         處理隨機推送請求（在背景執行）
         
         Args:
             user_id: LINE 用戶 ID
+            deadline: 收到 webhook 時建立的請求期限，預設依 REQUEST_DEADLINE 建立
         """
+        deadline = deadline or Deadline.from_env()
+        work_deadline = deadline.reserve(PUSH_RESERVE_SECONDS)
         try:
             logger.info(f"開始處理隨機推送: 用戶ID={user_id}")
             
@@ -283,7 +321,7 @@ class NewsBot:
             # 1. 隨機爬取文章
             logger.info(f"正在隨機擷取 TechOrange 文章...")
             try:
-                articles = crawler.fetch_random_articles(self.max_articles)
+                articles = crawler.fetch_random_articles(self.max_articles, deadline=work_deadline)
                 logger.info(f"爬蟲返回結果: {len(articles) if articles else 0} 篇文章")
             except Exception as e:
                 logger.error(f"爬取文章失敗: {str(e)}")
@@ -311,7 +349,7 @@ class NewsBot:
             if summarizer:
                 logger.info("正在生成文章摘要...")
                 try:
-                    summarized_articles = summarizer.summarize_articles(articles)
+                    summarized_articles = summarizer.summarize_articles(articles, deadline=work_deadline)
                     logger.info(f"摘要器返回結果: {len(summarized_articles) if summarized_articles else 0} 篇摘要")
                 except Exception as e:
                     logger.error(f"摘要生成失敗: {str(e)}")
@@ -338,7 +376,7 @@ class NewsBot:
             logger.info(f"準備發送 {len(summarized_articles)} 篇文章給用戶")
             
             # 3. 發送結果
-            line_bot.send_random_results(user_id, summarized_articles)
+            line_bot.send_random_results(user_id, summarized_articles, deadline=deadline)
             logger.info("隨機推送處理完成")
             
         except Exception as e:
@@ -378,24 +416,29 @@ def custom_process_keyword_query(event, keyword: str):
     """自定義關鍵字查詢處理"""
     try:
         user_id = event.source.user_id
+        # 請求期限從收到 webhook 時開始計算
+        deadline = Deadline.from_env()
         
         # 在背景執行處理程序，避免 LINE 超時
         threading.Thread(
             target=news_bot.process_user_query,
-            args=(user_id, keyword),
+            args=(user_id, keyword, deadline),
             daemon=True
         ).start()
         
     except Exception as e:
         logger.error(f"啟動背景處理時發生錯誤: {str(e)}")
 
-def safe_background_random_push(user_id: str):
+def safe_background_random_push(user_id: str, deadline: Deadline = None):
     """
     安全的背景隨機推送處理，包含完整錯誤捕捉
     
     Args:
         user_id: LINE 用戶 ID
+        deadline: 收到 webhook 時建立的請求期限，預設依 REQUEST_DEADLINE 建立
     """
+    deadline = deadline or Deadline.from_env()
+    work_deadline = deadline.reserve(PUSH_RESERVE_SECONDS)
     try:
         logger.info(f"[背景任務] 開始處理隨機推送: user_id={user_id}")
         
@@ -414,7 +457,7 @@ def safe_background_random_push(user_id: str):
         # 1. 爬取隨機文章
         logger.info("[背景任務] 開始爬取隨機文章...")
         try:
-            articles = crawler.fetch_random_articles(3)
+            articles = crawler.fetch_random_articles(3, deadline=work_deadline)
             logger.info(f"[背景任務] 爬蟲返回: {len(articles) if articles else 0} 篇文章")
             
             if not articles:
@@ -435,7 +478,7 @@ def safe_background_random_push(user_id: str):
         logger.info("[背景任務] 開始生成摘要...")
         try:
             if summarizer:
-                summarized_articles = summarizer.summarize_articles(articles)
+                summarized_articles = summarizer.summarize_articles(articles, deadline=work_deadline)
                 logger.info(f"[背景任務] 摘要生成完成: {len(summarized_articles) if summarized_articles else 0} 篇")
             else:
                 logger.warning("[背景任務] Summarizer 未初始化，使用原始內容")
@@ -455,7 +498,7 @@ def safe_background_random_push(user_id: str):
         # 3. 發送結果
         logger.info("[背景任務] 準備發送文章結果...")
         try:
-            line_bot.send_random_results(user_id, summarized_articles)
+            line_bot.send_random_results(user_id, summarized_articles, deadline=deadline)
             logger.info("[背景任務] 隨機推送完成！")
             
         except Exception as e:
@@ -481,11 +524,13 @@ def custom_process_random_push(event):
     try:
         user_id = event.source.user_id
         logger.info(f"啟動隨機推送背景任務: user_id={user_id}")
+        # 請求期限從收到 webhook 時開始計算
+        deadline = Deadline.from_env()
         
         # 在背景執行安全的隨機推送處理
         threading.Thread(
             target=safe_background_random_push,
-            args=(user_id,),
+            args=(user_id, deadline),
             daemon=True
         ).start()
         
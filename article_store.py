@@ -0,0 +1,327 @@
+"""
+文章內容儲存模組
+以 SQLite (WAL 模式) 持久化已擷取的文章內容，依標準化 URL 為鍵
+可在重新啟動後沿用，並由多個 gunicorn worker 共用
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+import time
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+# 預設資料庫位置
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'articles.db')
+
+# 追蹤用查詢參數（標準化時移除）
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'ref', 'ref_src', 'spm',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    標準化文章 URL
+
+    - scheme 與主機名稱轉小寫
+    - 移除追蹤參數 (utm_*, fbclid 等) 與 fragment
+    - 其餘查詢參數依名稱排序
+    - 移除路徑結尾的斜線
+
+    Args:
+        url: 原始 URL
+
+    Returns:
+        標準化後的 URL
+    """
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+    path = parts.path.rstrip('/')
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+class ArticleStore:
+    """
+    磁碟文章儲存
+
+    每個 URL 保存擷取的內文、標題、擷取時間、內容雜湊與頁面中繼資料
+    每個執行緒使用獨立的 SQLite 連線，跨行程以 WAL 模式共用
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, max_age: Optional[float] = None):
+        """
+        初始化文章儲存
+
+        Args:
+            path: SQLite 資料庫路徑
+            max_age: 內容有效秒數，超過視為過期；None 表示永不過期
+        """
+        self.path = path
+        self.max_age = max_age
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                url TEXT PRIMARY KEY,
+                title TEXT,
+                content TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                published TEXT,
+                canonical_url TEXT,
+                image TEXT
+            )
+        """)
+
+        # 舊版資料庫補上新增的中繼資料欄位
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(articles)')}
+        for column in ('published', 'canonical_url', 'image'):
+            if column not in columns:
+                conn.execute(f'ALTER TABLE articles ADD COLUMN {column} TEXT')
+
+        # 背景擷取的 feed 語料（內文存於 articles 表）
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS corpus (
+                guid TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                canonical_url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                summary TEXT,
+                categories TEXT,
+                published_ts REAL,
+                ingested_at REAL NOT NULL
+            )
+        """)
+        conn.execute('CREATE INDEX IF NOT EXISTS corpus_published ON corpus (published_ts)')
+        conn.execute('CREATE INDEX IF NOT EXISTS corpus_ingested ON corpus (ingested_at)')
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        """取得目前執行緒的資料庫連線"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, url: str, allow_stale: bool = False) -> Optional[Dict[str, str]]:
+        """
+        讀取文章
+
+        Args:
+            url: 文章 URL（會先標準化）
+            allow_stale: 是否回傳已過期的文章（網站無法連線時使用）
+
+        Returns:
+            包含 {url, title, content, content_hash, fetched_at, published, canonical_url, image} 的字典，找不到或過期則返回 None
+        """
+        row = self._connect().execute(
+            'SELECT * FROM articles WHERE url = ?', (canonicalize_url(url),)
+        ).fetchone()
+
+        if (row is not None and not allow_stale and self.max_age is not None
+                and time.time() - row['fetched_at'] > self.max_age):
+            row = None
+
+        with self._stats_lock:
+            self._stats['hits' if row is not None else 'misses'] += 1
+
+        return dict(row) if row is not None else None
+
+    def put(self, url: str, content: str, title: Optional[str] = None,
+            published: Optional[str] = None, canonical_url: Optional[str] = None,
+            image: Optional[str] = None) -> str:
+        """
+        寫入或更新文章
+
+        Args:
+            url: 文章 URL（會先標準化）
+            content: 擷取的內文
+            title: 文章標題
+            published: 發布時間
+            canonical_url: 頁面宣告的標準網址
+            image: 代表圖片 (og:image)
+
+        Returns:
+            內容雜湊 (SHA-256)
+        """
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        conn = self._connect()
+        conn.execute(
+            """
+            INSERT INTO articles (url, title, content, content_hash, fetched_at,
+                                  published, canonical_url, image)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                title = COALESCE(excluded.title, articles.title),
+                content = excluded.content,
+                content_hash = excluded.content_hash,
+                fetched_at = excluded.fetched_at,
+                published = COALESCE(excluded.published, articles.published),
+                canonical_url = COALESCE(excluded.canonical_url, articles.canonical_url),
+                image = COALESCE(excluded.image, articles.image)
+            """,
+            (canonicalize_url(url), title, content, content_hash, time.time(),
+             published, canonical_url, image)
+        )
+        conn.commit()
+
+        with self._stats_lock:
+            self._stats['writes'] += 1
+        return content_hash
+
+    def delete(self, url: str):
+        """
+        刪除文章
+
+        Args:
+            url: 文章 URL
+        """
+        conn = self._connect()
+        conn.execute('DELETE FROM articles WHERE url = ?', (canonicalize_url(url),))
+        conn.commit()
+
+    def known_guids(self, guids: Iterable[str]) -> Set[str]:
+        """
+        找出已收錄於語料的 GUID
+
+        Args:
+            guids: 待檢查的 GUID
+
+        Returns:
+            已存在的 GUID 集合
+        """
+        guids = list(guids)
+        if not guids:
+            return set()
+        placeholders = ','.join('?' * len(guids))
+        rows = self._connect().execute(
+            f'SELECT guid FROM corpus WHERE guid IN ({placeholders})', guids
+        ).fetchall()
+        return {row['guid'] for row in rows}
+
+    def add_corpus_entry(self, guid: str, url: str, title: str, summary: Optional[str] = None,
+                         categories: Optional[List[str]] = None, published_ts: Optional[float] = None):
+        """
+        將 feed 項目加入語料（內文需另以 put 寫入）
+
+        Args:
+            guid: feed 項目 GUID
+            url: 文章 URL
+            title: 文章標題
+            summary: RSS 描述
+            categories: 分類標籤
+            published_ts: 發布時間 (Unix timestamp)
+        """
+        conn = self._connect()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO corpus
+                (guid, url, canonical_url, title, summary, categories, published_ts, ingested_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (guid, url, canonicalize_url(url), title, summary,
+             json.dumps(categories or [], ensure_ascii=False), published_ts, time.time())
+        )
+        conn.commit()
+
+    def list_corpus(self, limit: Optional[int] = None, since: Optional[float] = None) -> List[Dict]:
+        """
+        列出語料中已擷取內文的文章
+
+        Args:
+            limit: 最多回傳筆數
+            since: 只列出此時間之後寫入的文章（依寫入時間由舊到新排列）
+
+        Returns:
+            List of Dict containing {guid, url, title, summary, categories, published_ts, ingested_at, content}，
+            未指定 since 時依發布時間由新到舊
+        """
+        query = """
+            SELECT corpus.guid, corpus.url, corpus.title, corpus.summary, corpus.categories,
+                   corpus.published_ts, corpus.ingested_at, articles.content
+            FROM corpus JOIN articles ON articles.url = corpus.canonical_url
+        """
+        params = []
+        if since is not None:
+            query += ' WHERE corpus.ingested_at > ? ORDER BY corpus.ingested_at ASC'
+            params.append(since)
+        else:
+            query += ' ORDER BY corpus.published_ts DESC, corpus.ingested_at DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+
+        entries = []
+        for row in self._connect().execute(query, params):
+            entry = dict(row)
+            entry['categories'] = json.loads(entry['categories'] or '[]')
+            entries.append(entry)
+        return entries
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        取得儲存統計
+
+        Returns:
+            命中、未命中、寫入次數、文章總數與語料筆數
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        conn = self._connect()
+        stats['articles'] = conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+        stats['corpus'] = conn.execute('SELECT COUNT(*) FROM corpus').fetchone()[0]
+        return stats
+
+
+# 便利函數和全域變數
+_store_instance = None
+_store_lock = threading.Lock()
+
+
+def get_article_store() -> Optional[ArticleStore]:
+    """
+    取得共用文章儲存實例（單例模式）
+
+    路徑由 ARTICLE_STORE_PATH 環境變數決定，設為空字串則停用儲存
+
+    Returns:
+        ArticleStore 實例，停用或初始化失敗時返回 None
+    """
+    global _store_instance
+    with _store_lock:
+        if _store_instance is None:
+            path = os.getenv('ARTICLE_STORE_PATH', DEFAULT_STORE_PATH)
+            if not path:
+                return None
+            max_age = os.getenv('ARTICLE_STORE_MAX_AGE')
+            try:
+                _store_instance = ArticleStore(path, float(max_age) if max_age else None)
+                logger.info(f"文章儲存已啟用: {path}")
+            except Exception as e:
+                logger.warning(f"文章儲存初始化失敗，將不使用快取: {str(e)}")
+                return None
+        return _store_instance
@@ -0,0 +1,828 @@
+"""
+TechOrange 非同步爬蟲模組
+以 aiohttp 在單一事件迴圈上擷取文章，共用連線池的 ClientSession
+提供背景事件迴圈執行緒，讓 Flask 等同步程式也能使用
+"""
+
+import asyncio
+import random
+import threading
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import aiohttp
+
+from article_store import canonicalize_url
+from crawler import (TechOrangeCrawler, ARTICLE_CHUNK_SIZE, ARTICLE_TIMEOUT, SEARCH_API_FIELDS, SEARCH_API_MAX_PAGES,
+                     SEARCH_MAX_TERMS, SEARCH_EXPANSION_MIN_SECONDS)
+from extraction import charset_from_content_type
+from rate_limit import RateLimiter
+from ranking import reciprocal_rank_fusion
+from negative_cache import failure_class_for_status
+from circuit_breaker import CircuitOpenError, RETRY_STATUSES, get_circuit_breakers
+from deadline import Deadline, ensure_deadline
+from http_pool import PooledSession
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+
+class BackgroundEventLoop:
+    """
+    背景事件迴圈
+
+    在獨立的 daemon 執行緒上執行 asyncio 事件迴圈，
+    讓同步程式碼可以提交協程並等待結果
+    """
+
+    def __init__(self, name: str = 'crawler-loop'):
+        """
+        初始化背景事件迴圈
+
+        Args:
+            name: 執行緒名稱
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """取得事件迴圈（必要時啟動）"""
+        self.start()
+        return self._loop
+
+    def start(self):
+        """啟動背景執行緒（重複呼叫不會重複啟動）"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(self._loop)
+                self._loop.call_soon(ready.set)
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            logger.info(f"背景事件迴圈已啟動: {self.name}")
+
+    def submit(self, coro: Awaitable) -> Future:
+        """
+        提交協程到背景事件迴圈
+
+        Args:
+            coro: 要執行的協程
+
+        Returns:
+            concurrent.futures.Future
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """
+        提交協程並等待結果
+
+        Args:
+            coro: 要執行的協程
+            timeout: 等待秒數，逾時則取消協程
+
+        Returns:
+            協程的回傳值
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except Exception:
+            future.cancel()
+            raise
+
+    def stop(self):
+        """停止事件迴圈並等待執行緒結束"""
+        with self._lock:
+            if self._loop is None or self._thread is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+
+class AsyncTechOrangeCrawler:
+    """
+    TechOrange 非同步爬蟲類別
+
+    與 TechOrangeCrawler 提供相同的公開介面（fetch_articles、fetch_random_articles），
+    但所有頁面擷取都在同一個事件迴圈上以 aiohttp 完成；
+    計分、關鍵字生成與 HTML 解析沿用 TechOrangeCrawler 的實作
+    """
+
+    def __init__(self, crawler: Optional[TechOrangeCrawler] = None,
+                 max_connections: Optional[int] = None, per_host: Optional[int] = None):
+        """
+        初始化非同步爬蟲
+
+        Args:
+            crawler: 提供解析與計分邏輯的同步爬蟲，預設建立新實例
+            max_connections: 連線池總上限，預設讀取 ASYNC_CRAWLER_LIMIT
+            per_host: 每個主機的連線上限，預設讀取 ASYNC_CRAWLER_PER_HOST
+        """
+        self.crawler = crawler or TechOrangeCrawler()
+        self.max_connections = max_connections or int(os.getenv('ASYNC_CRAWLER_LIMIT', 100))
+        self.per_host = per_host or int(os.getenv('ASYNC_CRAWLER_PER_HOST', 10))
+        self._session: Optional[aiohttp.ClientSession] = None
+        # 串流解析器（lxml）不可跨執行緒使用，解析固定在同一個執行緒
+        self._parse_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='async-parse')
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """取得共用的 ClientSession（首次呼叫時建立）"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.per_host,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.crawler.headers
+            )
+        return self._session
+
+    async def close(self):
+        """關閉 ClientSession 與連線池"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _rate_limit(self, url: str):
+        """依主機的速率限制等待（額度足夠時不等待，也不佔用執行緒）"""
+        wait = self.crawler.rate_limiter.reserve(RateLimiter.key_for_url(url))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    @asynccontextmanager
+    async def _get(self, url: str, timeout: float, deadline: Optional[Deadline] = None, **kwargs):
+        """
+        以共用的斷路器與重試策略送出 GET 請求（規則與同步爬蟲的連線池相同）
+
+        每次嘗試的逾時不超過期限的剩餘時間，剩餘時間不足以退避後再等一次完整逾時時不再重試；
+        逾時因剩餘時間而縮短時發生的逾時不計入主機的斷路器失敗
+
+        Args:
+            url: 請求 URL
+            timeout: 時間充裕時每次嘗試的逾時秒數（含讀取回應內容）
+            deadline: 請求期限，None 表示不限制
+            **kwargs: 傳給 ClientSession.get 的參數
+
+        Yields:
+            aiohttp.ClientResponse（離開時釋放連線）
+
+        Raises:
+            CircuitOpenError: 主機的斷路器斷開中
+        """
+        deadline = ensure_deadline(deadline)
+        session = await self._get_session()
+        breakers = get_circuit_breakers()
+        breaker = breakers.for_url(url)
+        attempt = 0
+        while True:
+            breaker.before_request()
+            limited = deadline.limits(timeout)
+            attempt_timeout = deadline.timeout(timeout)
+            delay = breakers.retry.backoff(attempt)
+            last_attempt = attempt + 1 >= breakers.retry.max_attempts
+            start = time.monotonic()
+            try:
+                response = await session.get(url, timeout=aiohttp.ClientTimeout(total=attempt_timeout), **kwargs)
+            except asyncio.CancelledError:
+                # 取消的請求沒有結果，半開時需釋放探測名額，否則主機會一直被拒絕
+                breaker.release_probe()
+                raise
+            except asyncio.TimeoutError:
+                if limited:
+                    breaker.release_probe()
+                else:
+                    breaker.record_failure()
+                # 已等滿整個逾時的主機重試也只會再等一次
+                if (PooledSession._give_up(last_attempt, breaker, deadline, delay, timeout)
+                        or time.monotonic() - start >= attempt_timeout):
+                    raise
+            except aiohttp.ClientConnectionError:
+                breaker.record_failure()
+                # 已是最後一次、斷路器因此斷開或剩餘時間不足時不再重試
+                if PooledSession._give_up(last_attempt, breaker, deadline, delay, timeout):
+                    raise
+            except Exception:
+                breaker.record_failure()
+                raise
+            else:
+                if response.status not in RETRY_STATUSES:
+                    breaker.record_success(time.monotonic() - start)
+                    break
+                breaker.record_failure()
+                if PooledSession._give_up(last_attempt, breaker, deadline, delay, timeout):
+                    break
+                response.release()
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        try:
+            yield response
+        finally:
+            response.release()
+
+    async def _run_blocking(self, func: Callable, *args) -> Any:
+        """在預設執行緒池執行阻塞函數（例如 Gemini SDK 或共用 feed 快照）"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    async def _run_parse(self, func: Callable, *args) -> Any:
+        """在解析專用執行緒執行串流解析器的呼叫"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._parse_executor, func, *args)
+
+    async def _stored_article(self, url: str, allow_stale: bool = False) -> Optional[Dict[str, str]]:
+        """在執行緒池讀取文章儲存（SQLite 查詢不佔用事件迴圈）"""
+        return await self._run_blocking(self.crawler._get_stored_article, url, allow_stale)
+
+    async def fetch_articles(self, keyword: str, n: int = 3,
+                             deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
+        """
+        從 TechOrange 擷取包含關鍵字的最新文章
+
+        Args:
+            keyword: 搜尋關鍵字
+            n: 返回文章數量，預設 3 篇
+            deadline: 請求期限，時間不足時略過 Gemini 關鍵字擴展與網站搜尋
+
+        Returns:
+            List of Dict containing {title, url, content}
+        """
+        deadline = ensure_deadline(deadline)
+        try:
+            logger.info(f"[async] 開始爬取 TechOrange 文章，關鍵字: {keyword}, 數量: {n}")
+
+            expand = self.crawler._keyword_expander(keyword, deadline)
+
+            # 首先查詢背景預先擷取的語料
+            articles = await self._run_blocking(self.crawler._fetch_from_corpus, keyword, n, expand)
+
+            # 語料結果不足時，使用 RSS feed
+            if len(articles) < n:
+                fuzzy_keywords = await self._run_blocking(expand)
+                rss_articles = await self._fetch_from_rss(keyword, n, fuzzy_keywords, deadline)
+                articles = self.crawler._merge_unique(articles, rss_articles)
+
+            # 如果 RSS 結果不足，嘗試網頁搜尋
+            if len(articles) < n:
+                if deadline.expired():
+                    deadline.degrade("略過網站搜尋")
+                else:
+                    fuzzy_keywords = await self._run_blocking(expand)
+                    additional_articles = await self._fetch_from_search(
+                        keyword, n - len(articles), fuzzy_keywords, deadline
+                    )
+                    articles = self.crawler._merge_unique(articles, additional_articles)
+
+            articles = articles[:n]
+            logger.info(f"[async] 成功擷取 {len(articles)} 篇文章")
+            return articles
+
+        except Exception as e:
+            logger.error(f"[async] 擷取文章時發生錯誤: {str(e)}")
+            return []
+
+    async def fetch_random_articles(self, n: int = 3,
+                                    deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
+        """
+        隨機擷取最新文章（不需要關鍵字）
+
+        Args:
+            n: 返回文章數量，預設 3 篇
+            deadline: 請求期限，用於縮短 feed 與文章請求的逾時
+
+        Returns:
+            List of Dict containing {title, url, content, description}
+        """
+        try:
+            logger.info(f"[async] 開始隨機擷取 TechOrange 文章，數量: {n}")
+
+            entries = await self._run_blocking(self.crawler._get_feed_entries, deadline)
+            all_articles = []
+            for entry in entries:
+                title = entry.get('title', '').strip()
+                link = entry.get('link', '').strip()
+                if title and link:
+                    all_articles.append({'title': title, 'url': link, 'entry': entry})
+
+            random.shuffle(all_articles)
+
+            fetched = await self._gather_ordered(
+                lambda info: self._extract_entry_content(info['entry'], deadline), all_articles, n, window=n
+            )
+            final_articles = [
+                {'title': info['title'], 'url': info['url'], 'content': content,
+                 'description': self.crawler._entry_description(info['entry'])}
+                for info, content in fetched
+            ]
+
+            logger.info(f"[async] 成功隨機擷取 {len(final_articles)} 篇文章")
+            return final_articles
+
+        except Exception as e:
+            logger.error(f"[async] 隨機擷取文章時發生錯誤: {str(e)}")
+            return []
+
+    async def _fetch_from_rss(self, keyword: str, n: int, fuzzy_keywords: List[str],
+                              deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
+        """
+        從 RSS feed 擷取文章，計分規則與同步爬蟲相同
+
+        Args:
+            keyword: 搜尋關鍵字
+            n: 最大文章數量
+            fuzzy_keywords: 模糊搜尋關鍵字
+            deadline: 請求期限，用於縮短 feed 與文章請求的逾時
+
+        Returns:
+            List of Dict containing {title, url, content, description}
+        """
+        try:
+            entries = await self._run_blocking(self.crawler._get_feed_entries, deadline)
+            # 先以 feed 資料排序候選文章，再只擷取前 n 篇（失敗時遞補）
+            candidates = await self._run_blocking(
+                self.crawler._rank_feed_candidates, entries, keyword.lower(), fuzzy_keywords
+            )
+            fetched = await self._gather_ordered(
+                lambda candidate: self._extract_entry_content(candidate['entry'], deadline),
+                candidates, n, window=n
+            )
+            articles = [
+                {'title': candidate['title'], 'url': candidate['url'], 'content': content,
+                 'description': self.crawler._entry_description(candidate['entry'])}
+                for candidate, content in fetched
+            ]
+
+            logger.info(f"[async] 從 RSS 找到 {len(articles)} 篇相關文章")
+            return articles
+
+        except Exception as e:
+            logger.error(f"[async] 從 RSS 擷取文章時發生錯誤: {str(e)}")
+            return []
+
+    async def _fetch_from_search(self, keyword: str, n: int, fuzzy_keywords: List[str],
+                                 deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
+        """
+        從網站搜尋功能擷取文章（優先使用 WordPress REST API，無法使用時改用搜尋頁面）
+
+        各搜尋詞同時查詢，結果依標準化 URL 去重後以倒數排名融合排序，
+        確認 n 篇不重複文章即取消其餘搜尋詞
+
+        Args:
+            keyword: 搜尋關鍵字
+            n: 最大文章數量
+            fuzzy_keywords: 模糊搜尋關鍵字
+            deadline: 請求期限，時間不足時只搜尋原始關鍵字，到期即取消其餘搜尋詞
+
+        Returns:
+            List of Dict containing {title, url, content}
+        """
+        deadline = ensure_deadline(deadline)
+        if not deadline.allows(SEARCH_EXPANSION_MIN_SECONDS):
+            deadline.degrade("網站搜尋只查詢原始關鍵字")
+            search_terms = [keyword]
+        else:
+            search_terms = ([keyword] + fuzzy_keywords)[:SEARCH_MAX_TERMS]
+        api_state = {'available': self.crawler.search_backend == 'api'}
+        tasks = {
+            asyncio.ensure_future(self._search_term(term, n, api_state, deadline)): index
+            for index, term in enumerate(search_terms)
+        }
+        ranked_lists = [[] for _ in search_terms]
+        confirmed = set()
+
+        try:
+            pending = set(tasks)
+            while pending and len(confirmed) < n:
+                timeout = deadline.remaining() if deadline.expires_at is not None else None
+                done, pending = await asyncio.wait(pending, timeout=timeout,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    deadline.degrade("網站搜尋逾時，只使用已完成的搜尋詞結果")
+                    break
+                for task in done:
+                    index = tasks[task]
+                    try:
+                        ranked_lists[index] = task.result()
+                    except Exception as search_error:
+                        logger.warning(f"[async] 搜尋詞 '{search_terms[index]}' 失敗: {str(search_error)}")
+                        continue
+                    confirmed.update(canonicalize_url(article['url']) for article in ranked_lists[index])
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        articles = reciprocal_rank_fusion(
+            ranked_lists, key=lambda article: canonicalize_url(article['url'])
+        )[:n]
+        logger.info(f"[async] 從搜尋找到 {len(articles)} 篇相關文章")
+        return articles
+
+    async def _search_term(self, search_term: str, n: int, api_state: Dict[str, bool],
+                           deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
+        """
+        查詢單一搜尋詞，API 無法使用時本次查詢的其餘搜尋詞都改用網頁搜尋
+
+        Args:
+            search_term: 搜尋詞
+            n: 最大文章數量
+            api_state: 同一次查詢共用的 API 狀態
+            deadline: 請求期限，用於縮短請求逾時
+
+        Returns:
+            依網站搜尋排名排列的文章列表
+        """
+        results = None
+        if api_state['available']:
+            results = await self._search_via_api(search_term, n, set(), deadline)
+            if results is None:
+                api_state['available'] = False
+        if results is None:
+            results = await self._search_via_html(search_term, n, set(), deadline)
+        return results
+
+    async def _search_via_api(self, search_term: str, n: int, processed_urls: set,
+                              deadline: Optional[Deadline] = None) -> Optional[List[Dict[str, str]]]:
+        """
+        以 WordPress REST API 搜尋文章，規則與同步爬蟲相同
+
+        Args:
+            search_term: 搜尋詞
+            n: 最大文章數量
+            processed_urls: 已處理的文章 URL
+            deadline: 請求期限，用於縮短請求逾時，到期後不再取下一頁
+
+        Returns:
+            List of Dict containing {title, url, content}，API 無法使用則返回 None
+        """
+        deadline = ensure_deadline(deadline)
+        articles = []
+        per_page = min(100, max(n, 5))
+        page = 1
+
+        while len(articles) < n and page <= SEARCH_API_MAX_PAGES:
+            if page > 1 and deadline.expired():
+                break
+            params = {'search': search_term, '_fields': SEARCH_API_FIELDS, 'per_page': per_page, 'page': page}
+            await self._rate_limit(self.crawler.search_api_url)
+            try:
+                async with self._get(self.crawler.search_api_url, 10, deadline, params=params) as response:
+                    if page > 1 and response.status == 400:
+                        break
+                    response.raise_for_status()
+                    posts = await response.json(content_type=None)
+                    total_pages = response.headers.get('X-WP-TotalPages', '')
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                if page == 1:
+                    logger.warning(f"[async] WordPress REST API 無法使用，改用網頁搜尋: {str(e)}")
+                    return None
+                break
+
+            if not isinstance(posts, list):
+                if page == 1:
+                    return None
+                break
+
+            for post in posts:
+                article = await self._run_blocking(self.crawler._article_from_post, post)
+                if article and article['url'] not in processed_urls:
+                    processed_urls.add(article['url'])
+                    articles.append({'title': article['title'], 'url': article['url'],
+                                     'content': article['content']})
+                    if len(articles) >= n:
+                        break
+
+            if len(posts) < per_page or (total_pages.isdigit() and page >= int(total_pages)):
+                break
+            page += 1
+
+        return articles
+
+    async def _search_via_html(self, search_term: str, n: int, processed_urls: set,
+                               deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
+        """
+        以網站搜尋結果頁面搜尋文章，再並行擷取內容
+
+        Args:
+            search_term: 搜尋詞
+            n: 最大文章數量
+            processed_urls: 已處理的文章 URL
+            deadline: 請求期限，用於縮短請求逾時
+
+        Returns:
+            List of Dict containing {title, url, content}
+        """
+        deadline = ensure_deadline(deadline)
+        await self._rate_limit(self.crawler.search_url)
+        async with self._get(
+            self.crawler.search_url, 10, deadline,
+            params={'s': search_term, 'post_type': 'post'}
+        ) as response:
+            response.raise_for_status()
+            html = await response.read()
+
+        links = await self._run_blocking(self.crawler.extractor.search_links, html)
+        article_links = [link for link in links if link not in processed_urls]
+        processed_urls.update(article_links)
+
+        fetched = await self._gather_ordered(
+            lambda link: self._extract_search_article(link, deadline), article_links, n
+        )
+        return [article for _, article in fetched]
+
+    async def _extract_search_article(self, link: str,
+                                      deadline: Optional[Deadline] = None) -> Optional[Dict[str, str]]:
+        """
+        擷取搜尋結果中單篇文章的內容與標題
+
+        Args:
+            link: 文章 URL
+            deadline: 請求期限，用於縮短請求逾時
+
+        Returns:
+            Dict containing {title, url, content}，失敗則返回 None
+        """
+        article = await self._extract_article(link, deadline)
+        if not article:
+            return None
+        return {
+            'title': article.get('title') or self.crawler._title_from_slug(link),
+            'url': link,
+            'content': article['content']
+        }
+
+    async def _extract_entry_content(self, entry, deadline: Optional[Deadline] = None) -> Optional[str]:
+        """
+        取得 feed 項目的文章內容，優先使用 RSS 內嵌全文，缺少或被截斷時才擷取頁面
+
+        Args:
+            entry: feedparser entry
+            deadline: 請求期限，用於縮短請求逾時
+
+        Returns:
+            文章內容文字，失敗則返回 None
+        """
+        url = entry.get('link', '').strip()
+        cached = await self._stored_article(url)
+        if cached:
+            return cached['content']
+
+        article = await self._run_blocking(self.crawler._article_from_entry, entry)
+        if article:
+            await self._run_blocking(self.crawler._store_article, url, article)
+            return article['content']
+        return await self._extract_article_content(url, deadline)
+
+    async def _extract_article_content(self, url: str, deadline: Optional[Deadline] = None) -> Optional[str]:
+        """
+        從文章 URL 擷取完整內容
+
+        Args:
+            url: 文章 URL
+            deadline: 請求期限，用於縮短請求逾時
+
+        Returns:
+            文章內容文字，失敗則返回 None
+        """
+        article = await self._extract_article(url, deadline)
+        return article['content'] if article else None
+
+    async def _extract_article(self, url: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, str]]:
+        """
+        擷取並解析文章頁面，優先使用文章儲存
+
+        Args:
+            url: 文章 URL
+            deadline: 請求期限，已到期時只使用文章儲存（含過期內容）
+
+        Returns:
+            Dict containing {url, title, content, published, canonical_url, image}，失敗則返回 None
+        """
+        cached = await self._stored_article(url)
+        if cached:
+            return cached
+
+        failure_class = self.crawler.negative_cache.check(url)
+        if failure_class:
+            logger.debug(f"[async] 略過近期擷取失敗的文章 ({url}, {failure_class})")
+            return None
+
+        deadline = ensure_deadline(deadline)
+        if deadline.expired():
+            return await self._stored_article(url, allow_stale=True)
+
+        # 逾時因剩餘時間縮短時，逾時失敗不計入失敗 URL 快取與斷路器
+        limited = deadline.limits(ARTICLE_TIMEOUT)
+        try:
+            # 超過主機延遲 p90 仍未完成時送出對沖請求，落後的請求會被取消
+            article = await self.crawler.hedger.run_async(
+                lambda target: self._download_article(target, deadline), url
+            )
+            if article:
+                article['url'] = url
+                await self._run_blocking(self.crawler._store_article, url, article)
+            else:
+                self.crawler.negative_cache.record(url, 'too_short')
+            return article
+
+        except CircuitOpenError as e:
+            logger.warning(f"[async] 略過文章擷取 ({url}): {str(e)}")
+            return await self._stored_article(url, allow_stale=True)
+        except Exception as e:
+            logger.warning(f"[async] 擷取文章內容失敗 ({url}): {str(e)}")
+            failure_class = self._classify_fetch_error(e)
+            if failure_class and not (limited and failure_class == 'timeout'):
+                self.crawler.negative_cache.record(url, failure_class)
+            return await self._stored_article(url, allow_stale=True)
+
+    async def _download_article(self, url: str,
+                                deadline: Optional[Deadline] = None) -> Optional[Dict[str, str]]:
+        """
+        下載並解析文章頁面（串流讀取，內文足夠或超過位元組上限即停止）
+
+        Args:
+            url: 文章 URL
+            deadline: 請求期限，用於縮短請求逾時與限制重試
+
+        Returns:
+            Dict containing {title, content, published, canonical_url, image}，內容不足則返回 None
+        """
+        async with self._get(url, ARTICLE_TIMEOUT, deadline) as response:
+            response.raise_for_status()
+            parser = await self._run_parse(
+                self.crawler.extractor.stream_parser,
+                charset_from_content_type(response.headers.get('Content-Type'))
+            )
+            # 離開時釋放連線
+            limit = self.crawler.max_article_bytes
+            received = 0
+            async for chunk in response.content.iter_chunked(ARTICLE_CHUNK_SIZE):
+                chunk = chunk[:limit - received]
+                received += len(chunk)
+                if await self._run_parse(parser.feed, chunk) or received >= limit:
+                    break
+
+        return await self._run_parse(parser.close)
+
+    def _classify_fetch_error(self, error: Exception) -> Optional[str]:
+        """
+        判斷 aiohttp 擷取錯誤的失敗類型（規則與同步爬蟲相同）
+
+        Args:
+            error: 擷取時發生的例外
+
+        Returns:
+            失敗類型，非網路錯誤則返回 None
+        """
+        if isinstance(error, asyncio.TimeoutError):
+            return 'timeout'
+        if isinstance(error, aiohttp.ClientResponseError):
+            return failure_class_for_status(error.status)
+        if isinstance(error, aiohttp.ClientError):
+            return 'connection'
+        return None
+
+    async def _gather_ordered(self, func: Callable[[Any], Awaitable], items: Sequence[Any],
+                              n: int, window: Optional[int] = None) -> List[Any]:
+        """
+        並行執行協程，依輸入順序回傳前 n 筆有效結果，並取消其餘工作
+
+        Args:
+            func: 回傳協程的函數，失敗時協程應返回 None
+            items: 待處理項目
+            n: 需要的有效結果數量
+            window: 已取得結果加上進行中工作的上限，預設 max(n, per_host * 2)；
+                    設為 n 時只擷取需要的數量，有擷取失敗才送出下一個項目
+
+        Returns:
+            List of (item, result)
+        """
+        if n <= 0 or not items:
+            return []
+
+        window = window or max(n, self.per_host * 2)
+        pending = []
+        results = []
+        next_index = 0
+
+        try:
+            while len(results) < n:
+                # 已失敗的工作不佔用名額，讓後面的項目立即遞補
+                in_flight = sum(1 for _, task in pending if not self._failed(task))
+                while next_index < len(items) and len(results) + in_flight < window:
+                    item = items[next_index]
+                    pending.append((item, asyncio.ensure_future(func(item))))
+                    next_index += 1
+                    in_flight += 1
+
+                if not pending:
+                    break
+
+                item, task = pending[0]
+                if not task.done():
+                    # 等待任一工作完成，失敗時可提早遞補
+                    await asyncio.wait([t for _, t in pending if not t.done()],
+                                       return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                pending.pop(0)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.warning(f"[async] 並行擷取失敗: {str(e)}")
+                    result = None
+
+                if result:
+                    results.append((item, result))
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+        return results
+
+    @staticmethod
+    def _failed(task: asyncio.Future) -> bool:
+        """工作是否已完成且沒有有效結果"""
+        return task.done() and (task.cancelled() or task.exception() is not None or not task.result())
+
+
+class ThreadedAsyncCrawler:
+    """
+    非同步爬蟲的同步包裝
+
+    所有請求都提交到同一個背景事件迴圈執行，
+    讓 Flask 的工作執行緒可以直接呼叫 fetch_articles / fetch_random_articles
+    """
+
+    def __init__(self, crawler: Optional[AsyncTechOrangeCrawler] = None,
+                 loop: Optional[BackgroundEventLoop] = None, timeout: Optional[float] = None):
+        """
+        初始化同步包裝
+
+        Args:
+            crawler: 非同步爬蟲實例，預設建立新實例
+            loop: 背景事件迴圈，預設使用共用迴圈
+            timeout: 單次呼叫的等待上限（秒）
+        """
+        self.async_crawler = crawler or AsyncTechOrangeCrawler()
+        self.loop = loop or get_background_loop()
+        self.timeout = timeout or float(os.getenv('ASYNC_CRAWLER_TIMEOUT', 60))
+
+    def fetch_articles(self, keyword: str, n: int = 3,
+                       deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
+        """同步呼叫 AsyncTechOrangeCrawler.fetch_articles（等待上限不超過期限）"""
+        try:
+            return self.loop.run(self.async_crawler.fetch_articles(keyword, n, deadline),
+                                 ensure_deadline(deadline).timeout(self.timeout))
+        except Exception as e:
+            logger.error(f"[async] 擷取文章逾時或失敗: {str(e)}")
+            return []
+
+    def fetch_random_articles(self, n: int = 3,
+                              deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
+        """同步呼叫 AsyncTechOrangeCrawler.fetch_random_articles（等待上限不超過期限）"""
+        try:
+            return self.loop.run(self.async_crawler.fetch_random_articles(n, deadline),
+                                 ensure_deadline(deadline).timeout(self.timeout))
+        except Exception as e:
+            logger.error(f"[async] 隨機擷取文章逾時或失敗: {str(e)}")
+            return []
+
+    def close(self):
+        """關閉非同步爬蟲的連線池"""
+        self.loop.run(self.async_crawler.close(), self.timeout)
+
+
+# 便利函數和全域變數
+_loop_instance = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """取得共用背景事件迴圈（單例模式）"""
+    global _loop_instance
+    with _loop_lock:
+        if _loop_instance is None:
+            _loop_instance = BackgroundEventLoop()
+        return _loop_instance
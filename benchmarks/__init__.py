@@ -0,0 +1,4 @@
+"""
+效能基準測試
+以 benchmarks/fixtures 中的 TechOrange 頁面樣本量測各元件的效能
+"""
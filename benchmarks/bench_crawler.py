@@ -0,0 +1,249 @@
+"""
+爬蟲與文章擷取基準測試
+以 benchmarks/fixtures/archive 封存的 TechOrange feed、搜尋結果與文章頁面重播，
+不連線到網站即可量測：
+    feed_parse      feedparser 解析 RSS feed
+    match_score     建立標題比對自動機並以 _calculate_match_score 為 feed 標題計分
+    extract:<後端>   _extract_article_content 擷取文章頁面（每個 HTML 解析後端各一項）
+    fetch_articles  完整的 fetch_articles 關鍵字查詢（feed、搜尋與文章擷取）
+
+每項回報 throughput（ops/sec）、p50/p99 延遲與配置統計，並可輸出 JSON 供不同 commit 比較。
+配置統計另外以 tracemalloc 量測（避免影響計時）：allocations 為單次操作新配置且在
+操作結束時仍存活的記憶體區塊數（含回傳結果，已釋放的暫時配置不會計入），
+peak_kib 為操作期間的記憶體峰值，兩者都只包含 Python 物件配置
+
+為了讓每次呼叫都走完整流程，執行時會停用文章儲存、模糊關鍵字快取、失敗 URL 快取、
+速率限制與 Gemini，feed 快照每次都以條件式請求重新驗證
+
+使用方式：
+    python -m benchmarks.bench_crawler [--iterations 200] [--bench fetch_articles]
+        [--output results.json] [--compare baseline.json] [--latency 0]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 停用會讓重複呼叫命中快取的元件（需在匯入爬蟲模組前設定）
+os.environ.update({
+    'ARTICLE_STORE_PATH': '',
+    'KEYWORD_CACHE_PATH': '',
+    'FEED_CACHE_TTL': '0',
+    'NEGATIVE_CACHE_TTLS': '0',
+    'RATE_LIMIT_BUZZORANGE': '0',
+})
+os.environ.pop('GEMINI_API_KEY', None)
+
+import feedparser  # noqa: E402
+
+from benchmarks.build_archive import ARCHIVE_DIR, SEARCH_TERMS  # noqa: E402
+from crawler import TechOrangeCrawler  # noqa: E402
+from extraction import EXTRACTORS, get_extractor  # noqa: E402
+from http_pool import PooledSession  # noqa: E402
+from replay import HttpArchive, install_transport  # noqa: E402
+from search_index import InvertedIndex  # noqa: E402
+
+# 量測配置統計的取樣次數
+ALLOCATION_SAMPLES = 5
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """最近排名法的百分位數"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def git_commit() -> Optional[str]:
+    """目前的 commit（不在 git 工作目錄時返回 None）"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(operation: Callable[[int], object], iterations: int) -> Dict[str, float]:
+    """
+    量測單一操作
+
+    Args:
+        operation: 以第幾次呼叫為參數的操作（用於輪替輸入）
+        iterations: 計時的呼叫次數
+
+    Returns:
+        ops、ops_per_sec、p50_ms、p99_ms、mean_ms、allocations 與 peak_kib
+    """
+    # 暖身（建立解析器、自動機與連線池）
+    operation(0)
+
+    samples = []
+    start = time.perf_counter()
+    for i in range(iterations):
+        began = time.perf_counter()
+        operation(i)
+        samples.append(time.perf_counter() - began)
+    elapsed = time.perf_counter() - start
+
+    # 配置統計另外量測，避免 tracemalloc 影響計時
+    allocations, peak = [], 0
+    for i in range(ALLOCATION_SAMPLES):
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        result = operation(i)
+        after = tracemalloc.take_snapshot()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        allocations.append(sum(max(0, stat.count_diff) for stat in after.compare_to(before, 'lineno')))
+        del result
+
+    return {
+        'ops': iterations,
+        'ops_per_sec': iterations / elapsed,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'mean_ms': elapsed / iterations * 1000,
+        'allocations': sorted(allocations)[len(allocations) // 2],
+        'peak_kib': peak / 1024,
+    }
+
+
+def build_crawler(latency: float):
+    """建立以封存重播的爬蟲（獨立的連線池與空的語料索引）"""
+    session = PooledSession()
+    adapter = install_transport(session, mode='replay', archive_path=ARCHIVE_DIR, latency=latency)
+    crawler = TechOrangeCrawler()
+    crawler.session = session
+    crawler.index = InvertedIndex()
+    crawler.feed.ttl = 0
+    return crawler, adapter
+
+
+def build_benchmarks(crawler, parsers: List[str]) -> Dict[str, Callable[[int], object]]:
+    """
+    建立各項基準測試的操作
+
+    Args:
+        crawler: 以封存重播的爬蟲
+        parsers: 要量測的 HTML 解析後端
+
+    Returns:
+        {名稱 -> 操作}
+    """
+    feed_body = HttpArchive(ARCHIVE_DIR).get('GET', crawler.rss_url)['content']
+    entries = feedparser.parse(feed_body).entries
+    titles = [entry.get('title', '').lower() for entry in entries]
+    urls = [entry.get('link', '') for entry in entries]
+    queries = [(term.lower(), crawler._generate_fuzzy_keywords(term.lower())) for term in SEARCH_TERMS]
+
+    def match_score(i):
+        keyword, fuzzy_keywords = queries[i % len(queries)]
+        matcher = crawler._build_title_matcher(keyword, fuzzy_keywords)
+        return [crawler._calculate_match_score(title, keyword, fuzzy_keywords, matcher) for title in titles]
+
+    def extract(name):
+        extractor = get_extractor(name)
+
+        def operation(i):
+            crawler.extractor = extractor
+            return crawler._extract_article_content(urls[i % len(urls)])
+        return operation
+
+    def fetch_articles(i):
+        crawler.extractor = default_extractor
+        return crawler.fetch_articles(SEARCH_TERMS[i % len(SEARCH_TERMS)], 3)
+
+    default_extractor = crawler.extractor
+    benchmarks = {
+        'feed_parse': lambda i: feedparser.parse(feed_body),
+        'match_score': match_score,
+    }
+    for name in parsers:
+        benchmarks[f"extract:{name}"] = extract(name)
+    benchmarks['fetch_articles'] = fetch_articles
+    return benchmarks
+
+
+def print_table(results: Dict[str, Dict[str, float]], baseline: Optional[Dict] = None):
+    """輸出結果表格；有比較基準時加上 ops/sec 的變化"""
+    header = f"{'benchmark':<16}{'ops/sec':>12}{'p50 ms':>10}{'p99 ms':>10}{'allocs':>9}{'peak KiB':>11}"
+    print(header + (f"{'vs base':>10}" if baseline else ''))
+    for name, result in results.items():
+        line = (f"{name:<16}{result['ops_per_sec']:>12.1f}{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+                f"{result['allocations']:>9d}{result['peak_kib']:>11.1f}")
+        if baseline:
+            base = baseline.get(name)
+            change = f"{(result['ops_per_sec'] / base['ops_per_sec'] - 1) * 100:+.1f}%" if base else 'n/a'
+            line += f"{change:>10}"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='爬蟲與文章擷取基準測試（以封存重播）')
+    parser.add_argument('--iterations', type=int, default=200, help='每項計時的呼叫次數')
+    parser.add_argument('--bench', action='append', help='只執行指定項目（可重複）')
+    parser.add_argument('--parser', action='append', choices=sorted(EXTRACTORS), help='要量測的擷取後端（可重複）')
+    parser.add_argument('--latency', type=float, default=0.0, help='重播時套用的錄製延遲倍數')
+    parser.add_argument('--output', help='寫入 JSON 結果的檔案（- 表示只輸出 JSON 到標準輸出）')
+    parser.add_argument('--compare', help='比較基準的 JSON 結果檔案')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(os.path.join(ARCHIVE_DIR, 'index.json')):
+        print(f"找不到封存：{ARCHIVE_DIR}（先執行 python -m benchmarks.build_archive）")
+        return 1
+
+    crawler, adapter = build_crawler(args.latency)
+    benchmarks = build_benchmarks(crawler, args.parser or sorted(EXTRACTORS))
+    selected = args.bench or list(benchmarks)
+    unknown = [name for name in selected if name not in benchmarks]
+    if unknown:
+        print(f"未知的項目：{', '.join(unknown)}（可用：{', '.join(benchmarks)}）")
+        return 1
+
+    results = {name: measure(benchmarks[name], args.iterations) for name in selected}
+    report = {
+        'commit': git_commit(),
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'iterations': args.iterations,
+        'latency': args.latency,
+        'replay': adapter.get_stats(),
+        'results': results,
+    }
+
+    if args.output == '-':
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"比較基準：{baseline.get('commit') or args.compare}")
+    print(f"commit {report['commit'] or 'n/a'}，每項 {args.iterations} 次，重播延遲倍數 {args.latency:g}")
+    print_table(results, baseline['results'] if baseline else None)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"已寫入 {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+文章擷取後端基準測試
+比較 BeautifulSoup 與 lxml/XPath 後端解析 TechOrange 文章頁面的速度與記憶體峰值，
+並量測以增量解析（內文足夠即停止）方式處理的差異
+
+記憶體峰值以 tracemalloc 量測，只包含 Python 物件配置（不含 libxml2 的原生配置）
+
+使用方式：
+    python -m benchmarks.bench_extraction [--iterations 50] [--parser lxml --parser bs4]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction import EXTRACTORS, get_extractor  # noqa: E402
+
+CHUNK_SIZE = 16 * 1024
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+
+
+def load_pages(directory: str = FIXTURE_DIR) -> List[bytes]:
+    """讀取頁面樣本（bytes，與 HTTP 回應相同）"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def parse_streamed(extractor, page: bytes):
+    """以 16 KiB 區塊送入增量解析器，內文足夠即停止（模擬串流下載）"""
+    parser = extractor.stream_parser()
+    for i in range(0, len(page), CHUNK_SIZE):
+        if parser.feed(page[i:i + CHUNK_SIZE]):
+            break
+    return parser.close()
+
+
+def bench_parser(name: str, pages: List[bytes], iterations: int, streamed: bool = False) -> Dict[str, float]:
+    """
+    量測單一後端
+
+    Args:
+        name: 後端名稱
+        pages: 頁面樣本
+        iterations: 重複解析全部樣本的次數
+        streamed: 是否以增量解析（提前結束）方式解析
+
+    Returns:
+        pages_per_sec、mean_ms 與 peak_kib（單頁解析的記憶體峰值）
+    """
+    extractor = get_extractor(name)
+    if streamed:
+        parse = lambda page: parse_streamed(extractor, page)  # noqa: E731
+    else:
+        parse = extractor.parse_article
+
+    # 暖身（建立執行緒內的解析器與 XPath）
+    for page in pages:
+        parse(page)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for page in pages:
+            parse(page)
+    elapsed = time.perf_counter() - start
+    total = iterations * len(pages)
+
+    # 記憶體峰值另外量測，避免 tracemalloc 影響計時
+    peak = 0
+    for page in pages:
+        tracemalloc.start()
+        parse(page)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        'pages_per_sec': total / elapsed,
+        'mean_ms': elapsed / total * 1000,
+        'peak_kib': peak / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='文章擷取後端基準測試')
+    parser.add_argument('--iterations', type=int, default=50, help='重複解析全部樣本的次數')
+    parser.add_argument('--parser', action='append', choices=sorted(EXTRACTORS), help='要量測的後端（可重複）')
+    args = parser.parse_args(argv)
+
+    pages = load_pages()
+    if not pages:
+        print(f"找不到頁面樣本：{FIXTURE_DIR}")
+        return 1
+
+    size_kib = sum(len(page) for page in pages) / len(pages) / 1024
+    print(f"樣本 {len(pages)} 頁（平均 {size_kib:.1f} KiB），每個後端解析 {args.iterations} 輪")
+    print(f"{'parser':<14}{'pages/sec':>12}{'mean ms':>10}{'peak KiB':>12}")
+    for name in args.parser or sorted(EXTRACTORS):
+        for streamed in (False, True):
+            result = bench_parser(name, pages, args.iterations, streamed)
+            label = f"{name}+stream" if streamed else name
+            print(f"{label:<14}{result['pages_per_sec']:>12.1f}{result['mean_ms']:>10.2f}{result['peak_kib']:>12.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
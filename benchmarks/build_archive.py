@@ -0,0 +1,196 @@
+"""
+建立離線重播用的 HTTP 封存
+以 benchmarks/fixtures/pages 的文章頁面樣本組出 TechOrange 的 RSS feed、
+WordPress REST API 搜尋結果、搜尋結果頁面與文章頁面，寫入 benchmarks/fixtures/archive
+
+封存中的耗時為依回應大小估算的名目值（固定往返時間加上傳輸時間），並非實際量測；
+需要真實的回應與耗時時，以 HTTP_REPLAY_MODE=record 對線上網站執行爬蟲即可錄製
+
+使用方式：
+    python -m benchmarks.build_archive [--output benchmarks/fixtures/archive]
+"""
+
+import argparse
+import html
+import json
+import os
+import shutil
+import sys
+from email.utils import format_datetime
+from datetime import datetime
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_extraction import FIXTURE_DIR  # noqa: E402
+from crawler import SEARCH_API_FIELDS, SEARCH_MAX_TERMS, TechOrangeCrawler  # noqa: E402
+from extraction import get_extractor  # noqa: E402
+from replay import HttpArchive  # noqa: E402
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'archive')
+
+# 封存的查詢關鍵字（連同傳統模糊擴展的搜尋詞一起封存 REST API 與搜尋結果頁面）
+SEARCH_TERMS = ['AI', '晶片', '半導體', '金融科技', '開放銀行', '淨零', '雲端']
+
+# 名目耗時：固定往返時間加上 2 MB/s 的傳輸時間
+NOMINAL_RTT = 0.08
+NOMINAL_BANDWIDTH = 2 * 1024 * 1024
+
+FEED_ETAG = '"fixture-feed-1"'
+
+
+def nominal_elapsed(body: bytes) -> float:
+    """依回應大小估算名目耗時（秒）"""
+    return NOMINAL_RTT + len(body) / NOMINAL_BANDWIDTH
+
+
+def load_articles():
+    """解析頁面樣本，依發布時間由新到舊排列"""
+    extractor = get_extractor()
+    articles = []
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        if not name.endswith('.html'):
+            continue
+        with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+            page = f.read()
+        article = extractor.parse_article(page)
+        article['page'] = page
+        articles.append(article)
+    return sorted(articles, key=lambda article: article['published'], reverse=True)
+
+
+def build_feed(articles, base_url: str) -> bytes:
+    """組出 RSS 2.0 feed（只有摘要，沒有 content:encoded，爬蟲需擷取文章頁面）"""
+    items = []
+    for article in articles:
+        published = format_datetime(datetime.fromisoformat(article['published']))
+        items.append(
+            "<item>"
+            f"<title>{html.escape(article['title'])}</title>"
+            f"<link>{article['canonical_url']}</link>"
+            f"<guid isPermaLink=\"true\">{article['canonical_url']}</guid>"
+            f"<pubDate>{published}</pubDate>"
+            f"<description>{html.escape(article['content'][:120])}</description>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0"><channel>'
+        f'<title>TechOrange 科技報橘</title><link>{base_url}</link>'
+        + ''.join(items) +
+        '</channel></rss>'
+    ).encode('utf-8')
+
+
+def matches(article, term: str) -> bool:
+    """文章標題或內文是否包含搜尋詞"""
+    term = term.lower()
+    return term in article['title'].lower() or term in article['content'].lower()
+
+
+def build_api_results(articles) -> bytes:
+    """組出 /wp-json/wp/v2/posts 的搜尋結果"""
+    posts = [{
+        'id': index + 1,
+        'link': article['canonical_url'],
+        'title': {'rendered': html.escape(article['title'])},
+        'content': {'rendered': ''.join(
+            f"<p>{html.escape(paragraph)}</p>" for paragraph in article['content'].split('\n') if paragraph
+        )},
+        'date': article['published'][:19],
+    } for index, article in enumerate(articles)]
+    return json.dumps(posts, ensure_ascii=False).encode('utf-8')
+
+
+def build_search_page(articles, term: str) -> bytes:
+    """組出網站搜尋結果頁面"""
+    entries = ''.join(
+        f'<article><h2 class="entry-title"><a href="{article["canonical_url"]}">'
+        f'{html.escape(article["title"])}</a></h2></article>'
+        for article in articles
+    )
+    return (
+        '<!DOCTYPE html><html lang="zh-TW"><head><meta charset="UTF-8">'
+        f'<title>搜尋：{html.escape(term)} | TechOrange 科技報橘</title></head>'
+        f'<body><main>{entries}</main></body></html>'
+    ).encode('utf-8')
+
+
+def expanded_terms(crawler) -> list:
+    """爬蟲查詢 SEARCH_TERMS 時實際送出的搜尋詞（原始關鍵字加上傳統模糊擴展）"""
+    terms = []
+    for keyword in SEARCH_TERMS:
+        fuzzy_keywords = crawler._generate_fuzzy_keywords(keyword.lower())
+        for term in ([keyword] + fuzzy_keywords)[:SEARCH_MAX_TERMS]:
+            if term not in terms:
+                terms.append(term)
+    return terms
+
+
+def prepared_url(url: str, params) -> str:
+    """與 requests 送出請求時相同的 URL（含編碼後的查詢參數）"""
+    return requests.Request('GET', url, params=params).prepare().url
+
+
+def build_archive(output: str = ARCHIVE_DIR) -> HttpArchive:
+    """
+    建立封存目錄（會先清除既有內容）
+
+    Args:
+        output: 封存目錄
+
+    Returns:
+        HttpArchive 實例
+    """
+    shutil.rmtree(output, ignore_errors=True)
+    archive = HttpArchive(output)
+    crawler = TechOrangeCrawler()
+    crawler.gemini_model = None  # 只使用傳統模糊擴展，封存內容不依賴 Gemini
+    articles = load_articles()
+    html_type = {'Content-Type': 'text/html; charset=UTF-8'}
+
+    feed = build_feed(articles, crawler.base_url)
+    archive.add('GET', crawler.rss_url, 200, {
+        'Content-Type': 'application/rss+xml; charset=UTF-8',
+        'ETag': FEED_ETAG,
+        'Last-Modified': format_datetime(datetime.fromisoformat(articles[0]['published'])),
+    }, feed, elapsed=nominal_elapsed(feed), reason='OK')
+
+    for article in articles:
+        archive.add('GET', article['canonical_url'], 200, html_type, article['page'],
+                    elapsed=nominal_elapsed(article['page']), reason='OK')
+
+    for term in expanded_terms(crawler):
+        found = [article for article in articles if matches(article, term)]
+
+        # 爬蟲每次最多取 5 篇以內時 per_page 固定為 5，只封存第一頁
+        body = build_api_results(found)
+        url = prepared_url(crawler.search_api_url, {
+            'search': term, '_fields': SEARCH_API_FIELDS, 'per_page': 5, 'page': 1
+        })
+        archive.add('GET', url, 200, {
+            'Content-Type': 'application/json; charset=UTF-8',
+            'X-WP-Total': str(len(found)),
+            'X-WP-TotalPages': '1',
+        }, body, elapsed=nominal_elapsed(body), reason='OK')
+
+        page = build_search_page(found, term)
+        url = prepared_url(crawler.search_url, {'s': term, 'post_type': 'post'})
+        archive.add('GET', url, 200, html_type, page, elapsed=nominal_elapsed(page), reason='OK')
+
+    return archive
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='建立離線重播用的 HTTP 封存')
+    parser.add_argument('--output', default=ARCHIVE_DIR, help='封存目錄')
+    args = parser.parse_args(argv)
+
+    archive = build_archive(args.output)
+    print(f"已寫入 {len(archive)} 筆回應：{args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+斷路器與重試模組
+為每個主機維護斷路器：連續失敗（含過慢的回應）達到門檻即斷開，
+斷開期間請求立即失敗，冷卻後只放行一個探測請求（半開），成功才恢復；
+可重試的錯誤以有上限、含隨機抖動的指數退避重試
+
+參數由環境變數設定：
+    CIRCUIT_FAILURE_THRESHOLD  連續失敗幾次後斷開（預設 5）
+    CIRCUIT_SLOW_SECONDS       回應超過幾秒視為失敗（預設 5）
+    CIRCUIT_COOLDOWN           斷開後多久進入半開（預設 30 秒）
+    RETRY_MAX_ATTEMPTS         每個請求最多嘗試次數（預設 2，即最多重試一次）
+    RETRY_BASE_DELAY           退避基準秒數（預設 0.25）
+    RETRY_MAX_DELAY            退避上限秒數（預設 2）
+"""
+
+import os
+import random
+import threading
+import time
+import logging
+from typing import Dict
+
+from rate_limit import RateLimiter
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+# 視為主機暫時無法服務、值得重試的 HTTP 狀態碼
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """斷路器斷開時立即拒絕請求"""
+
+    def __init__(self, key: str, retry_after: float):
+        super().__init__(f"{key} 斷路器已斷開，{retry_after:.1f} 秒後重新探測")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    單一主機的斷路器
+
+    狀態：
+    - closed：正常放行，累計連續失敗次數
+    - open：立即拒絕，冷卻時間過後轉為 half_open
+    - half_open：只放行一個探測請求，成功則關閉，失敗則重新斷開
+    """
+
+    def __init__(self, key: str, failure_threshold: int = 5, slow_threshold: float = 5.0,
+                 cooldown: float = 30.0):
+        """
+        初始化斷路器
+
+        Args:
+            key: 主機名稱（記錄與錯誤訊息用）
+            failure_threshold: 連續失敗幾次後斷開
+            slow_threshold: 回應時間超過此秒數視為失敗
+            cooldown: 斷開後等待多久才探測
+        """
+        self.key = key
+        self.failure_threshold = max(1, failure_threshold)
+        self.slow_threshold = slow_threshold
+        self.cooldown = cooldown
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self._stats = {'successes': 0, 'failures': 0, 'slow_calls': 0, 'opened': 0, 'rejected': 0}
+
+    @property
+    def state(self) -> str:
+        """目前狀態（closed、open 或 half_open）"""
+        with self._lock:
+            return self._state
+
+    def before_request(self):
+        """
+        請求前檢查是否放行
+
+        Raises:
+            CircuitOpenError: 斷路器斷開中，或半開狀態已有探測請求
+        """
+        with self._lock:
+            if self._state == OPEN:
+                remaining = self._opened_at + self.cooldown - time.monotonic()
+                if remaining > 0:
+                    self._stats['rejected'] += 1
+                    raise CircuitOpenError(self.key, remaining)
+                self._state = HALF_OPEN
+                self._probing = False
+                logger.info(f"{self.key} 斷路器進入半開狀態，送出探測請求")
+
+            if self._state == HALF_OPEN:
+                if self._probing:
+                    self._stats['rejected'] += 1
+                    raise CircuitOpenError(self.key, 0.0)
+                self._probing = True
+
+    def record_success(self, latency: float = 0.0):
+        """
+        記錄一次成功的請求，過慢的回應視為失敗
+
+        Args:
+            latency: 回應時間（秒）
+        """
+        if latency > self.slow_threshold:
+            with self._lock:
+                self._stats['slow_calls'] += 1
+            self.record_failure()
+            return
+
+        with self._lock:
+            self._stats['successes'] += 1
+            self._consecutive_failures = 0
+            if self._state != CLOSED:
+                logger.info(f"{self.key} 斷路器已恢復")
+            self._state = CLOSED
+            self._probing = False
+
+    def record_failure(self):
+        """記錄一次失敗，達到門檻或探測失敗時斷開"""
+        with self._lock:
+            self._stats['failures'] += 1
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._stats['opened'] += 1
+                    logger.warning(
+                        f"{self.key} 斷路器斷開（連續失敗 {self._consecutive_failures} 次），"
+                        f"{self.cooldown:g} 秒內直接拒絕請求"
+                    )
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def release_probe(self):
+        """放棄沒有結果的探測請求（例如請求被取消），讓下一個請求重新探測"""
+        with self._lock:
+            self._probing = False
+
+    def get_stats(self) -> Dict:
+        """
+        取得統計
+
+        Returns:
+            狀態、連續失敗次數、成功、失敗、過慢、斷開與拒絕次數
+        """
+        with self._lock:
+            return dict(self._stats, state=self._state, consecutive_failures=self._consecutive_failures)
+
+
+class RetryPolicy:
+    """
+    有上限的指數退避重試策略（full jitter）
+    """
+
+    def __init__(self, max_attempts: int = 2, base_delay: float = 0.25, max_delay: float = 2.0):
+        """
+        初始化重試策略
+
+        Args:
+            max_attempts: 最多嘗試次數（含第一次）
+            base_delay: 第一次重試的退避上限秒數
+            max_delay: 退避秒數上限
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """
+        計算第 attempt 次失敗後的等待秒數
+
+        Args:
+            attempt: 已失敗的次數（從 0 起算）
+
+        Returns:
+            介於 0 與 min(max_delay, base_delay * 2^attempt) 之間的隨機秒數
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class HostCircuitBreakers:
+    """
+    依主機管理斷路器，並提供共用的重試策略
+    """
+
+    def __init__(self, failure_threshold: int = 5, slow_threshold: float = 5.0,
+                 cooldown: float = 30.0, retry: RetryPolicy = None):
+        """
+        初始化斷路器集合
+
+        Args:
+            failure_threshold: 連續失敗幾次後斷開
+            slow_threshold: 回應時間超過此秒數視為失敗
+            cooldown: 斷開後等待多久才探測
+            retry: 重試策略，預設 RetryPolicy()
+        """
+        self.failure_threshold = failure_threshold
+        self.slow_threshold = slow_threshold
+        self.cooldown = cooldown
+        self.retry = retry or RetryPolicy()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        """
+        取得 URL 主機對應的斷路器
+
+        Args:
+            url: 請求 URL
+
+        Returns:
+            CircuitBreaker 實例
+        """
+        key = RateLimiter.key_for_url(url)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(key, self.failure_threshold, self.slow_threshold, self.cooldown)
+                self._breakers[key] = breaker
+            return breaker
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        取得所有主機的統計
+
+        Returns:
+            {主機名稱 -> 統計}
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {key: breaker.get_stats() for key, breaker in breakers.items()}
+
+
+# 便利函數和全域變數
+_breakers_instance = None
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breakers() -> HostCircuitBreakers:
+    """取得行程內共用的斷路器集合（單例模式），參數讀取環境變數"""
+    global _breakers_instance
+    with _breakers_lock:
+        if _breakers_instance is None:
+            _breakers_instance = HostCircuitBreakers(
+                failure_threshold=int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5)),
+                slow_threshold=float(os.getenv('CIRCUIT_SLOW_SECONDS', 5)),
+                cooldown=float(os.getenv('CIRCUIT_COOLDOWN', 30)),
+                retry=RetryPolicy(
+                    max_attempts=int(os.getenv('RETRY_MAX_ATTEMPTS', 2)),
+                    base_delay=float(os.getenv('RETRY_BASE_DELAY', 0.25)),
+                    max_delay=float(os.getenv('RETRY_MAX_DELAY', 2))
+                )
+            )
+        return _breakers_instance
@@ -0,0 +1,186 @@
+"""
+並行擷取模組
+以執行緒池並行擷取文章頁面，限制每個主機的同時連線數
+結果依輸入順序回傳，取得足夠數量後立即取消其餘工作
+"""
+
+import os
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+
+class ConcurrentFetcher:
+    """
+    有界並行擷取器
+
+    功能：
+    - 共用執行緒池，限制總並行數
+    - 每個主機各自的並行上限
+    - 依輸入順序產生結果，取得 n 筆有效結果即停止
+    - 取消已不需要的排隊工作
+    """
+
+    def __init__(self, max_workers: int = 8, per_host: int = 4):
+        """
+        初始化並行擷取器
+
+        Args:
+            max_workers: 執行緒池大小
+            per_host: 每個主機的同時擷取上限
+        """
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='crawler-fetch')
+        self._host_slots: Dict[str, threading.Semaphore] = {}
+        self._host_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'submitted': 0, 'completed': 0, 'cancelled': 0}
+
+    def _host_slot(self, url: str) -> threading.Semaphore:
+        """取得主機對應的並行限制號誌"""
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.Semaphore(self.per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _run(self, func: Callable[[Any], Any], item: Any, url: str, stop: threading.Event) -> Any:
+        """在主機限制下執行單一擷取，已停止時直接略過"""
+        if stop.is_set():
+            return None
+        with self._host_slot(url):
+            if stop.is_set():
+                return None
+            result = func(item)
+        with self._stats_lock:
+            self._stats['completed'] += 1
+        return result
+
+    def fetch_ordered(self, func: Callable[[Any], Any], items: Sequence[Any], n: int,
+                      url_of: Optional[Callable[[Any], str]] = None,
+                      window: Optional[int] = None, timeout: Optional[float] = None) -> List[Tuple[Any, Any]]:
+        """
+        並行執行擷取，依輸入順序回傳前 n 筆有效結果
+
+        Args:
+            func: 擷取函數，輸入 item，失敗時返回 None 或空值
+            items: 待擷取項目（順序決定結果順序）
+            n: 需要的有效結果數量
+            url_of: 從 item 取得 URL 的函數（用於主機限制），預設 item 本身即為 URL
+            window: 已取得結果加上進行中擷取的上限，預設 max(n, max_workers)；
+                    設為 n 時只擷取需要的數量，有擷取失敗才送出下一個項目
+            timeout: 等待結果的總秒數上限，逾時後回傳已取得的結果並取消其餘工作；None 表示不限制
+
+        Returns:
+            List of (item, result)，依輸入順序排列，最多 n 筆
+        """
+        if n <= 0 or not items:
+            return []
+
+        url_of = url_of or (lambda item: item)
+        stop = threading.Event()
+        pending = deque()
+        results = []
+        next_index = 0
+        # 預先送出的工作數量，避免一次排入過多不需要的請求
+        window = window or max(n, self.max_workers)
+        expires_at = time.monotonic() + timeout if timeout is not None else None
+
+        try:
+            while len(results) < n:
+                # 已失敗的工作不佔用名額，讓後面的項目立即遞補
+                in_flight = sum(1 for _, future in pending if not self._failed(future))
+                while next_index < len(items) and len(results) + in_flight < window:
+                    item = items[next_index]
+                    future = self._executor.submit(self._run, func, item, url_of(item), stop)
+                    pending.append((item, future))
+                    next_index += 1
+                    in_flight += 1
+                    with self._stats_lock:
+                        self._stats['submitted'] += 1
+
+                if not pending:
+                    break
+
+                item, future = pending[0]
+                if not future.done():
+                    remaining = expires_at - time.monotonic() if expires_at is not None else None
+                    if remaining is not None and remaining <= 0:
+                        logger.warning(f"並行擷取逾時，只取得 {len(results)}/{n} 筆結果")
+                        break
+                    # 等待任一工作完成，失敗時可提早遞補
+                    wait([f for _, f in pending if not f.done()], timeout=remaining,
+                         return_when=FIRST_COMPLETED)
+                    continue
+
+                pending.popleft()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"並行擷取失敗 ({url_of(item)}): {str(e)}")
+                    result = None
+
+                if result:
+                    results.append((item, result))
+        finally:
+            # 已取得足夠結果，取消剩餘工作
+            stop.set()
+            cancelled = sum(1 for _, future in pending if future.cancel())
+            if cancelled:
+                with self._stats_lock:
+                    self._stats['cancelled'] += cancelled
+
+        return results
+
+    @staticmethod
+    def _failed(future: Future) -> bool:
+        """工作是否已完成且沒有有效結果"""
+        return future.done() and (future.exception() is not None or not future.result())
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        取得擷取統計
+
+        Returns:
+            送出、完成與取消的工作數
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def shutdown(self):
+        """關閉執行緒池"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 便利函數和全域變數
+_fetcher_instance = None
+_fetcher_lock = threading.Lock()
+
+
+def get_concurrent_fetcher() -> ConcurrentFetcher:
+    """
+    取得共用並行擷取器（單例模式）
+
+    執行緒池大小與主機上限由 CRAWLER_MAX_WORKERS、CRAWLER_PER_HOST 環境變數決定
+
+    Returns:
+        ConcurrentFetcher 實例
+    """
+    global _fetcher_instance
+    with _fetcher_lock:
+        if _fetcher_instance is None:
+            _fetcher_instance = ConcurrentFetcher(
+                max_workers=int(os.getenv('CRAWLER_MAX_WORKERS', 8)),
+                per_host=int(os.getenv('CRAWLER_PER_HOST', 4))
+            )
+        return _fetcher_instance
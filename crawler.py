@@ -5,19 +5,88 @@ TechOrange 爬蟲模組
 """
 
 import requests
-import feedparser
-from bs4 import BeautifulSoup
+from urllib3.exceptions import ReadTimeoutError
 import logging
-from typing import List, Dict, Optional
-import time
+from typing import Callable, List, Dict, Optional
 import re
 import os
 import google.generativeai as genai
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from html import unescape
+
+from feed_cache import get_feed_snapshot
+from article_store import get_article_store, canonicalize_url
+from concurrent_fetch import get_concurrent_fetcher
+from http_pool import get_http_session
+from search_index import get_search_index, sync_index_from_store
+from ranking import BM25Ranker, reciprocal_rank_fusion
+from keyword_cache import get_keyword_cache
+from keyword_matcher import AhoCorasickMatcher
+from extraction import get_extractor, charset_from_content_type
+from rate_limit import RateLimiter, get_rate_limiter
+from negative_cache import get_negative_cache, failure_class_for_status
+from circuit_breaker import CircuitOpenError, get_circuit_breakers
+from hedging import get_request_hedger
+from deadline import Deadline, ensure_deadline
 
 # 設置日誌
 logger = logging.getLogger(__name__)
 
+# 模糊關鍵字在 BM25 排名中的權重（原始關鍵字為 1）
+FUZZY_TERM_WEIGHT = 0.4
+
+# WordPress REST API 搜尋只取回的欄位與最多翻頁數
+SEARCH_API_FIELDS = 'id,link,title,content,date'
+SEARCH_API_MAX_PAGES = 3
+
+# 網站搜尋同時送出的搜尋詞數量（原始關鍵字 + 前三個模糊關鍵字）
+SEARCH_MAX_TERMS = 4
+
+# 剩餘時間低於此秒數時不呼叫 Gemini 擴展關鍵字、網站搜尋只查原始關鍵字
+GEMINI_MIN_SECONDS = 8
+SEARCH_EXPANSION_MIN_SECONDS = 6
+
+# feed 描述作為替代摘要時的字數上限
+DESCRIPTION_MAX_CHARS = 150
+
+# 串流下載文章頁面的區塊大小與請求逾時秒數
+ARTICLE_CHUNK_SIZE = 16 * 1024
+ARTICLE_TIMEOUT = 15
+
+# RSS 內嵌全文被截斷（只有摘要）時常見的結尾字樣
+TRUNCATION_MARKERS = ('[…]', '[...]', '閱讀全文', '繼續閱讀', '閱讀更多', 'read more', 'continue reading')
+
+# 只在內容結尾（允許其後的標點或箭頭）比對，內文中或句尾的刪節號不視為截斷
+TRUNCATION_PATTERN = re.compile(
+    '(?:' + '|'.join(re.escape(marker) for marker in TRUNCATION_MARKERS) + r')[\W_]*$'
+)
+
+# 行程內共用的搜尋詞查詢執行緒池
+_search_executor = None
+_search_executor_lock = threading.Lock()
+
+
+def get_search_executor() -> ThreadPoolExecutor:
+    """
+    取得搜尋詞並行查詢的共用執行緒池（單例模式，與文章擷取的執行緒池分開，避免互相等待）
+
+    執行緒數由 SEARCH_WORKERS 環境變數決定（預設 SEARCH_MAX_TERMS 的兩倍，讓兩個查詢可同時進行）
+
+    Returns:
+        ThreadPoolExecutor 實例
+    """
+    global _search_executor
+    with _search_executor_lock:
+        if _search_executor is None:
+            _search_executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv('SEARCH_WORKERS', SEARCH_MAX_TERMS * 2)),
+                thread_name_prefix='crawler-search'
+            )
+        return _search_executor
+
+
 class TechOrangeCrawler:
     """
     TechOrange 網站爬蟲類別
@@ -34,12 +103,52 @@ class TechOrangeCrawler:
         self.base_url = "https://buzzorange.com/techorange"
         self.rss_url = "https://buzzorange.com/techorange/feed/"
         self.search_url = "https://buzzorange.com/techorange/"
+        self.search_api_url = "https://buzzorange.com/techorange/wp-json/wp/v2/posts"
+        
+        # 搜尋後端：api（WordPress REST API，失敗時改用網頁）或 html
+        self.search_backend = os.getenv('SEARCH_BACKEND', 'api').lower()
         
         # 設置 User-Agent 避免被封鎖
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
+        # 共用的 keep-alive 連線池（所有 RSS、搜尋與文章請求）
+        self.session = get_http_session()
+        
+        # 行程內共用的 RSS feed 快照
+        self.feed = get_feed_snapshot(self.rss_url)
+        
+        # 磁碟文章儲存（停用時為 None）
+        self.store = get_article_store()
+        
+        # 語料倒排索引（行程內共用）
+        self.index = get_search_index()
+        
+        # 共用的並行擷取器（限制每個主機的並行數）
+        self.fetcher = get_concurrent_fetcher()
+        
+        # 共用的速率限制器（搜尋請求與 Gemini 呼叫）
+        self.rate_limiter = get_rate_limiter()
+        
+        # 搜尋詞並行查詢的共用執行緒池
+        self.search_executor = get_search_executor()
+        
+        # 文章頁面擷取後端（HTML_PARSER：lxml 或 bs4）
+        self.extractor = get_extractor()
+        
+        # 近期擷取失敗的文章 URL（依失敗類型設定有效時間）
+        self.negative_cache = get_negative_cache()
+        
+        # 文章頁面擷取的請求對沖（HEDGE_REQUESTS 啟用）
+        self.hedger = get_request_hedger()
+        
+        # 單篇文章頁面的下載上限（位元組）
+        self.max_article_bytes = int(os.getenv('ARTICLE_MAX_BYTES', 1024 * 1024))
+        
+        # Gemini 模糊關鍵字快取（跨請求與 worker 共用）
+        self.keyword_cache = get_keyword_cache()
+        
         # 初始化 Gemini AI (如果有 API Key)
         self.gemini_model = None
         try:
@@ -54,27 +163,42 @@ class TechOrangeCrawler:
             logger.warning(f"Gemini AI 初始化失敗，將使用傳統模糊搜尋: {str(e)}")
             self.gemini_model = None
     
-    def fetch_articles(self, keyword: str, n: int = 3) -> List[Dict[str, str]]:
+    def fetch_articles(self, keyword: str, n: int = 3,
+                       deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
         """
         從 TechOrange 擷取包含關鍵字的最新文章
         
         Args:
             keyword: 搜尋關鍵字
             n: 返回文章數量，預設 3 篇
+            deadline: 請求期限，時間不足時略過 Gemini 關鍵字擴展與網站搜尋
             
         Returns:
             List of Dict containing {title, url, content}
         """
+        deadline = ensure_deadline(deadline)
         try:
             logger.info(f"開始爬取 TechOrange 文章，關鍵字: {keyword}, 數量: {n}")
             
-            # 首先嘗試使用 RSS feed
-            articles = self._fetch_from_rss(keyword, n)
+            expand = self._keyword_expander(keyword, deadline)
+            
+            # 首先查詢背景預先擷取的語料
+            articles = self._fetch_from_corpus(keyword, n, expand=expand)
+            
+            # 語料結果不足時，使用 RSS feed
+            if len(articles) < n:
+                rss_articles = self._fetch_from_rss(keyword, n, fuzzy_keywords=expand(), deadline=deadline)
+                articles = self._merge_unique(articles, rss_articles)
             
             # 如果 RSS 結果不足，嘗試網頁搜尋
             if len(articles) < n:
-                additional_articles = self._fetch_from_search(keyword, n - len(articles))
-                articles.extend(additional_articles)
+                if deadline.expired():
+                    deadline.degrade("略過網站搜尋")
+                else:
+                    additional_articles = self._fetch_from_search(
+                        keyword, n - len(articles), fuzzy_keywords=expand(), deadline=deadline
+                    )
+                    articles = self._merge_unique(articles, additional_articles)
             
             # 確保不超過請求數量
             articles = articles[:n]
@@ -86,29 +210,52 @@ class TechOrangeCrawler:
             logger.error(f"擷取文章時發生錯誤: {str(e)}")
             return []
     
-    def fetch_random_articles(self, n: int = 3) -> List[Dict[str, str]]:
+    def _keyword_expander(self, keyword: str, deadline: Deadline) -> Callable[[], List[str]]:
+        """
+        建立同一次請求共用的模糊關鍵字函數（只產生一次，需要時才呼叫）
+        
+        Args:
+            keyword: 搜尋關鍵字
+            deadline: 請求期限，時間不足時改用傳統模糊關鍵字
+            
+        Returns:
+            返回模糊關鍵字列表的函數
+        """
+        expansion = []
+        
+        def expand() -> List[str]:
+            if not expansion:
+                if self.gemini_model and not deadline.allows(GEMINI_MIN_SECONDS):
+                    deadline.degrade("略過 Gemini 關鍵字擴展，改用傳統模糊關鍵字")
+                    expansion.append(self._generate_traditional_fuzzy_keywords(keyword.lower()))
+                else:
+                    expansion.append(self._generate_fuzzy_keywords(keyword.lower()))
+            return expansion[0]
+        
+        return expand
+    
+    def fetch_random_articles(self, n: int = 3,
+                              deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
         """
         隨機擷取最新文章（不需要關鍵字）
         
         Args:
             n: 返回文章數量，預設 3 篇
+            deadline: 請求期限，用於縮短 feed 與文章請求的逾時
             
         Returns:
-            List of Dict containing {title, url, content}
+            List of Dict containing {title, url, content, description}
         """
+        deadline = ensure_deadline(deadline)
         try:
             logger.info(f"開始隨機擷取 TechOrange 文章，數量: {n}")
             
-            # 從 RSS feed 獲取最新文章
-            response = requests.get(self.rss_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            # 解析 RSS
-            feed = feedparser.parse(response.content)
+            # 從共用 RSS 快照獲取最新文章
+            entries = self._get_feed_entries(deadline)
             
             # 先收集所有可用的文章
             all_articles = []
-            for entry in feed.entries:
+            for entry in entries:
                 title = entry.get('title', '').strip()
                 link = entry.get('link', '').strip()
                 
@@ -119,27 +266,28 @@ class TechOrangeCrawler:
                         'entry': entry
                     })
             
-            # 隨機選擇文章
+            # 隨機排列文章，擷取失敗時由下一篇遞補
             import random
-            if len(all_articles) > n:
-                selected_articles = random.sample(all_articles, n)
-            else:
-                selected_articles = all_articles
+            random.shuffle(all_articles)
             
-            # 擷取選中文章的內容
-            final_articles = []
-            for article_info in selected_articles:
-                content = self._extract_article_content(article_info['url'])
-                
-                if content:
-                    final_articles.append({
-                        'title': article_info['title'],
-                        'url': article_info['url'],
-                        'content': content
-                    })
-                    
-                    if len(final_articles) >= n:
-                        break
+            # 並行擷取文章內容，只同時擷取 n 篇，失敗時才送出下一篇
+            fetched = self.fetcher.fetch_ordered(
+                lambda info: self._extract_entry_content(info['entry'], deadline),
+                all_articles, n,
+                url_of=lambda info: info['url'],
+                window=n,
+                timeout=deadline.wait_timeout()
+            )
+            
+            final_articles = [
+                {
+                    'title': article_info['title'],
+                    'url': article_info['url'],
+                    'content': content,
+                    'description': self._entry_description(article_info['entry'])
+                }
+                for article_info, content in fetched
+            ]
             
             logger.info(f"成功隨機擷取 {len(final_articles)} 篇文章")
             return final_articles
@@ -148,155 +296,367 @@ class TechOrangeCrawler:
             logger.error(f"隨機擷取文章時發生錯誤: {str(e)}")
             return []
 
-    def _fetch_from_rss(self, keyword: str, n: int) -> List[Dict[str, str]]:
+    def _get_feed_entries(self, deadline: Optional[Deadline] = None) -> List:
         """
-        從 RSS feed 擷取文章 - 支援模糊搜尋和精確匹配優先
+        從共用快照取得 RSS entries（TTL 內不重新下載）
+        
+        Args:
+            deadline: 請求期限，用於縮短下載逾時
+            
+        Returns:
+            feedparser entries 列表
+        """
+        return self.feed.get_entries(session=self.session, headers=self.headers, timeout=10,
+                                     deadline=ensure_deadline(deadline))
+
+    def get_feed_stats(self) -> Dict[str, float]:
+        """
+        取得 RSS 快照的命中統計
+        
+        Returns:
+            快取統計字典
+        """
+        return self.feed.get_stats()
+
+    def get_connection_stats(self) -> Dict[str, int]:
+        """
+        取得 HTTP 連線重複使用統計
+        
+        Returns:
+            連線池統計字典
+        """
+        return self.session.get_stats()
+
+    def get_keyword_cache_stats(self) -> Dict[str, float]:
+        """
+        取得模糊關鍵字快取統計
+        
+        Returns:
+            命中率與節省的 Gemini 呼叫次數
+        """
+        return self.keyword_cache.get_stats()
+
+    def get_negative_cache_stats(self) -> Dict:
+        """
+        取得失敗 URL 快取統計
+        
+        Returns:
+            目前記錄的 URL 數、各失敗類型的失敗與略過次數
+        """
+        return self.negative_cache.get_stats()
+
+    def get_hedge_stats(self) -> Dict[str, float]:
+        """
+        取得文章擷取的請求對沖統計
+        
+        Returns:
+            請求數、對沖數、因比例上限略過的次數、對沖勝出次數與勝率
+        """
+        return self.hedger.get_stats()
+
+    def get_circuit_breaker_stats(self) -> Dict[str, Dict]:
+        """
+        取得各主機的斷路器統計
+        
+        Returns:
+            {主機名稱 -> 狀態、連續失敗、斷開與拒絕次數}
+        """
+        return get_circuit_breakers().get_stats()
+
+    def get_rate_limit_stats(self) -> Dict[str, Dict]:
+        """
+        取得各主機與 API 的速率限制統計
+        
+        Returns:
+            {鍵 -> 取得次數、等待時間與等待時間分布}
+        """
+        return self.rate_limiter.get_stats()
+
+    def _fetch_from_corpus(self, keyword: str, n: int,
+                           expand: Optional[Callable[[], List[str]]] = None) -> List[Dict[str, str]]:
+        """
+        以倒排索引與 BM25 排名查詢背景擷取的本地語料（不進行網路請求）
+        
+        先只用原始關鍵字查詢，結果不足時才加入模糊關鍵字（降低權重）
         
         Args:
             keyword: 搜尋關鍵字
             n: 最大文章數量
+            expand: 取得模糊關鍵字的函數（同一請求共用），預設直接生成
             
         Returns:
-            List of Dict containing {title, url, content, match_score}
+            List of Dict containing {title, url, content}
         """
+        if not self.store or n <= 0:
+            return []
+        
         try:
-            logger.info("從 RSS feed 擷取文章...")
+            # 將新寫入語料的文章增量加入索引
+            sync_index_from_store(self.index, self.store)
+            if not len(self.index):
+                return []
             
-            # 發送 RSS 請求
-            response = requests.get(self.rss_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
+            ranker = BM25Ranker(self.index)
+            hits = ranker.rank([keyword], limit=n)
+            if len(hits) < n:
+                fuzzy_keywords = expand() if expand else self._generate_fuzzy_keywords(keyword.lower())
+                hits = ranker.rank(
+                    [keyword] + fuzzy_keywords, limit=n,
+                    weights=[1.0] + [FUZZY_TERM_WEIGHT] * len(fuzzy_keywords)
+                )
+            
+            articles = []
+            for doc_id, _ in hits:
+                doc = self.index.get(doc_id)
+                if doc:
+                    articles.append({
+                        'title': doc['title'],
+                        'url': doc['url'],
+                        'content': doc['content']
+                    })
+            
+            logger.info(f"從語料索引找到 {len(articles)} 篇相關文章")
+            return articles
+            
+        except Exception as e:
+            logger.error(f"從語料擷取文章時發生錯誤: {str(e)}")
+            return []
+
+    def _merge_unique(self, articles: List[Dict[str, str]],
+                      additional: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        合併文章列表並依標準化 URL 去除重複
+        
+        Args:
+            articles: 既有文章
+            additional: 新增文章
+            
+        Returns:
+            合併後的文章列表（保留原順序）
+        """
+        seen = {canonicalize_url(article['url']) for article in articles}
+        merged = list(articles)
+        for article in additional:
+            key = canonicalize_url(article['url'])
+            if key not in seen:
+                seen.add(key)
+                merged.append(article)
+        return merged
+
+    def _fetch_from_rss(self, keyword: str, n: int,
+                        fuzzy_keywords: Optional[List[str]] = None,
+                        deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
+        """
+        從 RSS feed 擷取文章 - 支援模糊搜尋和精確匹配優先
+        
+        分兩階段進行：先以 feed 中的標題、摘要與分類排序候選文章（不需網路請求），
+        再依序只擷取前 n 篇的內文，擷取失敗時由下一篇候選遞補
+        
+        Args:
+            keyword: 搜尋關鍵字
+            n: 最大文章數量
+            fuzzy_keywords: 已產生的模糊關鍵字，預設重新生成
+            deadline: 請求期限，用於縮短 feed 與文章請求的逾時
             
-            # 解析 RSS
-            feed = feedparser.parse(response.content)
+        Returns:
+            List of Dict containing {title, url, content, description}
+        """
+        try:
+            logger.info("從 RSS feed 擷取文章...")
             
-            exact_matches = []  # 精確匹配
-            fuzzy_matches = []  # 模糊匹配
+            # 從共用 RSS 快照取得 entries
+            entries = self._get_feed_entries(deadline)
             keyword_lower = keyword.lower()
             
             # 準備模糊搜尋的關鍵字變體
-            fuzzy_keywords = self._generate_fuzzy_keywords(keyword_lower)
+            if fuzzy_keywords is None:
+                fuzzy_keywords = self._generate_fuzzy_keywords(keyword_lower)
             
-            for entry in feed.entries:
-                title = entry.get('title', '').strip()
-                link = entry.get('link', '').strip()
-                title_lower = title.lower()
-                
-                match_score = self._calculate_match_score(title_lower, keyword_lower, fuzzy_keywords)
-                
-                if match_score > 0:
-                    # 擷取文章內容
-                    content = self._extract_article_content(link)
-                    
-                    if content:
-                        article_data = {
-                            'title': title,
-                            'url': link,
-                            'content': content,
-                            'match_score': match_score
-                        }
-                        
-                        # 根據匹配分數分類
-                        if match_score >= 100:  # 精確匹配
-                            exact_matches.append(article_data)
-                        else:  # 模糊匹配
-                            fuzzy_matches.append(article_data)
-                        
-                        # 如果已經找到足夠的文章，停止搜尋
-                        if len(exact_matches) + len(fuzzy_matches) >= n * 2:
-                            break
-            
-            # 排序：精確匹配優先，然後按分數排序
-            exact_matches.sort(key=lambda x: x['match_score'], reverse=True)
-            fuzzy_matches.sort(key=lambda x: x['match_score'], reverse=True)
-            
-            # 合併結果，優先返回精確匹配
-            final_articles = exact_matches + fuzzy_matches
-            final_articles = final_articles[:n]
-            
-            # 移除 match_score，只保留必要欄位
-            for article in final_articles:
-                article.pop('match_score', None)
-            
-            exact_count = len([a for a in final_articles if a in exact_matches])
+            # 第一階段：以 feed 資料排序候選文章
+            candidates = self._rank_feed_candidates(entries, keyword_lower, fuzzy_keywords)
+            
+            # 第二階段：只擷取前 n 篇的內容，失敗時遞補下一篇（結果維持排序）
+            fetched = self.fetcher.fetch_ordered(
+                lambda candidate: self._extract_entry_content(candidate['entry'], deadline),
+                candidates, n,
+                url_of=lambda candidate: candidate['url'],
+                window=n,
+                timeout=ensure_deadline(deadline).wait_timeout()
+            )
+            
+            final_articles = [
+                {
+                    'title': candidate['title'],
+                    'url': candidate['url'],
+                    'content': content,
+                    'description': self._entry_description(candidate['entry'])
+                }
+                for candidate, content in fetched
+            ]
+            
+            exact_count = sum(1 for candidate, _ in fetched if candidate['match_score'] >= 100)
             fuzzy_count = len(final_articles) - exact_count
             
-            logger.info(f"從 RSS 找到 {len(final_articles)} 篇相關文章 (精確匹配: {exact_count}, 模糊匹配: {fuzzy_count})")
+            logger.info(f"從 RSS 找到 {len(final_articles)} 篇相關文章 (精確匹配: {exact_count}, 模糊匹配: {fuzzy_count}，"
+                        f"候選 {len(candidates)} 篇)")
             return final_articles
             
         except Exception as e:
             logger.error(f"從 RSS 擷取文章時發生錯誤: {str(e)}")
             return []
 
-    def _fetch_from_search(self, keyword: str, n: int) -> List[Dict[str, str]]:
+    def _rank_feed_candidates(self, entries: List, keyword: str,
+                              fuzzy_keywords: List[str]) -> List[Dict]:
+        """
+        只用 feed 資料（標題、description/content:encoded、分類）為文章計分並排序
+        
+        標題分數沿用 _calculate_match_score；標題未命中時依摘要與分類給較低分數：
+        主要關鍵字在分類 40、在摘要 30，模糊關鍵字在分類 20、在摘要 10
+        
+        Args:
+            entries: feedparser entries
+            keyword: 主要關鍵字（小寫）
+            fuzzy_keywords: 模糊關鍵字列表
+            
+        Returns:
+            依分數由高到低排序的候選列表 [{title, url, match_score, entry}]
+        """
+        matcher = self._build_title_matcher(keyword, fuzzy_keywords)
+        fuzzy_range = range(1, len(fuzzy_keywords) + 1)
+        
+        scored = []
+        for entry in entries:
+            title = entry.get('title', '').strip()
+            link = entry.get('link', '').strip()
+            if not title or not link:
+                continue
+            
+            categories_text, summary_text = self._entry_metadata_text(entry)
+            category_hits = matcher.search(categories_text)
+            summary_hits = matcher.search(summary_text)
+            
+            meta_score = 0
+            if 0 in category_hits:
+                meta_score = 40
+            elif 0 in summary_hits:
+                meta_score = 30
+            elif any(i in fuzzy_range for i in category_hits):
+                meta_score = 20
+            elif any(i in fuzzy_range for i in summary_hits):
+                meta_score = 10
+            
+            title_score = self._calculate_match_score(title.lower(), keyword, fuzzy_keywords, matcher)
+            match_score = title_score or meta_score
+            if match_score > 0:
+                scored.append(({
+                    'title': title,
+                    'url': link,
+                    'match_score': match_score,
+                    'entry': entry
+                }, meta_score))
+        
+        # 先比標題分數（精確匹配優先），同分再比 feed 資料分數；穩定排序保留 feed 順序
+        scored.sort(key=lambda item: (item[0]['match_score'], item[1]), reverse=True)
+        return [candidate for candidate, _ in scored]
+
+    def _entry_metadata_text(self, entry) -> tuple:
+        """
+        取得 feed 項目的分類與摘要純文字（小寫）
+        
+        Args:
+            entry: feedparser entry
+            
+        Returns:
+            (分類文字, description 與 content:encoded 的純文字)
+        """
+        categories = ' '.join(tag.get('term') or '' for tag in entry.get('tags', []))
+        parts = [entry.get('summary') or '']
+        parts.extend(item.get('value') or '' for item in entry.get('content', []))
+        summary = unescape(re.sub(r'<[^>]+>', ' ', ' '.join(parts)))
+        return categories.lower(), summary.lower()
+
+    def _entry_description(self, entry) -> str:
+        """
+        取得 feed 項目 description 的純文字（時間不足時作為替代摘要）
+        
+        Args:
+            entry: feedparser entry
+            
+        Returns:
+            最多 DESCRIPTION_MAX_CHARS 字的描述，沒有描述則返回空字串
+        """
+        description = self._html_to_text(entry.get('summary') or '')
+        if len(description) > DESCRIPTION_MAX_CHARS:
+            return description[:DESCRIPTION_MAX_CHARS] + "..."
+        return description
+
+    def _fetch_from_search(self, keyword: str, n: int,
+                           fuzzy_keywords: Optional[List[str]] = None,
+                           deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
         """
         從網站搜尋功能擷取文章
         
+        優先使用 WordPress REST API（一次取得標題與內文），
+        API 無法使用時改用搜尋結果頁面。各搜尋詞並行查詢，
+        結果依標準化 URL 去重後以倒數排名融合排序，確認 n 篇不重複文章即停止等待
+        
         Args:
             keyword: 搜尋關鍵字
             n: 最大文章數量
+            fuzzy_keywords: 已產生的模糊關鍵字，預設重新生成
+            deadline: 請求期限，時間不足時只搜尋原始關鍵字，到期即停止等待
             
         Returns:
             List of Dict containing {title, url, content}
         """
+        deadline = ensure_deadline(deadline)
         try:
             logger.info("從網站搜尋擷取文章...")
             
             # 生成搜尋關鍵字
-            fuzzy_keywords = self._generate_fuzzy_keywords(keyword.lower())
-            search_terms = [keyword] + fuzzy_keywords[:3]  # 限制搜尋詞數量
+            if not deadline.allows(SEARCH_EXPANSION_MIN_SECONDS):
+                deadline.degrade("網站搜尋只查詢原始關鍵字")
+                search_terms = [keyword]
+            else:
+                if fuzzy_keywords is None:
+                    fuzzy_keywords = self._generate_fuzzy_keywords(keyword.lower())
+                search_terms = ([keyword] + fuzzy_keywords)[:SEARCH_MAX_TERMS]  # 限制搜尋詞數量
             
-            articles = []
-            processed_urls = set()
+            # 所有搜尋詞同時查詢（請求速率仍受每個主機的速率限制器約束）
+            api_state = {'available': self.search_backend == 'api'}
+            stop = threading.Event()
+            futures = {
+                self.search_executor.submit(self._search_term, term, n, api_state, stop, deadline): index
+                for index, term in enumerate(search_terms)
+            }
+            ranked_lists = [[] for _ in search_terms]
+            confirmed = set()
             
-            for search_term in search_terms:
-                if len(articles) >= n:
-                    break
-                    
-                # 構建搜尋 URL
-                search_params = {
-                    's': search_term,
-                    'post_type': 'post'
-                }
-                
-                try:
-                    response = requests.get(
-                        self.search_url,
-                        params=search_params,
-                        headers=self.headers,
-                        timeout=10
-                    )
-                    response.raise_for_status()
-                    
-                    # 解析搜尋結果頁面
-                    soup = BeautifulSoup(response.content, 'lxml')
-                    
-                    # 尋找文章連結
-                    article_links = self._extract_article_links_from_search(soup)
+            timeout = deadline.remaining() if deadline.expires_at is not None else None
+            try:
+                for future in as_completed(futures, timeout=timeout):
+                    index = futures[future]
+                    try:
+                        ranked_lists[index] = future.result()
+                    except Exception as search_error:
+                        logger.warning(f"搜尋詞 '{search_terms[index]}' 失敗: {str(search_error)}")
+                        continue
                     
-                    for link in article_links:
-                        if len(articles) >= n or link in processed_urls:
-                            break
-                            
-                        processed_urls.add(link)
-                        
-                        # 擷取文章內容
-                        content = self._extract_article_content(link)
-                        if content:
-                            # 從連結擷取標題
-                            title = self._extract_title_from_url(link)
-                            
-                            articles.append({
-                                'title': title,
-                                'url': link,
-                                'content': content
-                            })
-                
-                except Exception as search_error:
-                    logger.warning(f"搜尋詞 '{search_term}' 失敗: {str(search_error)}")
-                    continue
-                
-                # 避免過於頻繁的請求
-                time.sleep(1)
+                    confirmed.update(canonicalize_url(article['url']) for article in ranked_lists[index])
+                    # 已確認足夠的不重複文章，不再等待其餘搜尋詞
+                    if len(confirmed) >= n:
+                        break
+            except FuturesTimeoutError:
+                deadline.degrade("網站搜尋逾時，只使用已完成的搜尋詞結果")
+            finally:
+                stop.set()
+                for future in futures:
+                    future.cancel()
+            
+            # 依標準化 URL 去除重複並以倒數排名融合合併各搜尋詞的結果
+            articles = reciprocal_rank_fusion(
+                ranked_lists, key=lambda article: canonicalize_url(article['url'])
+            )[:n]
             
             logger.info(f"從搜尋找到 {len(articles)} 篇相關文章")
             return articles
@@ -305,6 +665,199 @@ class TechOrangeCrawler:
             logger.error(f"從搜尋擷取文章時發生錯誤: {str(e)}")
             return []
 
+    def _search_term(self, search_term: str, n: int, api_state: Dict[str, bool],
+                     stop: threading.Event, deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
+        """
+        查詢單一搜尋詞（於搜尋執行緒池執行）
+        
+        Args:
+            search_term: 搜尋詞
+            n: 最大文章數量
+            api_state: 同一次查詢共用的 API 狀態，API 無法使用時其餘搜尋詞直接改用網頁搜尋
+            stop: 已取得足夠文章時設定，尚未開始的搜尋詞直接略過
+            deadline: 請求期限，用於縮短請求逾時
+            
+        Returns:
+            依網站搜尋排名排列的文章列表
+        """
+        if stop.is_set():
+            return []
+        
+        results = None
+        if api_state['available']:
+            results = self._search_via_api(search_term, n, set(), deadline)
+            if results is None:
+                api_state['available'] = False
+        if results is None and not stop.is_set():
+            results = self._search_via_html(search_term, n, set(), deadline)
+        return results or []
+
+    def _search_via_api(self, search_term: str, n: int, processed_urls: set,
+                        deadline: Optional[Deadline] = None) -> Optional[List[Dict[str, str]]]:
+        """
+        以 WordPress REST API 搜尋文章（只取回必要欄位，支援分頁）
+        
+        Args:
+            search_term: 搜尋詞
+            n: 最大文章數量
+            processed_urls: 已處理的文章 URL（會加入本次取得的 URL）
+            deadline: 請求期限，用於縮短請求逾時，到期後不再取下一頁
+            
+        Returns:
+            List of Dict containing {title, url, content}，API 無法使用則返回 None
+        """
+        deadline = ensure_deadline(deadline)
+        articles = []
+        per_page = min(100, max(n, 5))
+        page = 1
+        
+        while len(articles) < n and page <= SEARCH_API_MAX_PAGES:
+            if page > 1 and deadline.expired():
+                break
+            try:
+                # 避免過於頻繁的請求（額度足夠時不等待）
+                self.rate_limiter.acquire(RateLimiter.key_for_url(self.search_api_url))
+                response = self.session.get(
+                    self.search_api_url,
+                    params={
+                        'search': search_term,
+                        '_fields': SEARCH_API_FIELDS,
+                        'per_page': per_page,
+                        'page': page
+                    },
+                    headers=self.headers,
+                    timeout=10,
+                    deadline=deadline
+                )
+                # 超過最後一頁時 WordPress 回傳 400
+                if page > 1 and response.status_code == 400:
+                    break
+                response.raise_for_status()
+                posts = response.json()
+            except (requests.RequestException, ValueError) as e:
+                if page == 1:
+                    logger.warning(f"WordPress REST API 無法使用，改用網頁搜尋: {str(e)}")
+                    return None
+                break
+            
+            if not isinstance(posts, list):
+                if page == 1:
+                    logger.warning("WordPress REST API 回應格式不符，改用網頁搜尋")
+                    return None
+                break
+            
+            for post in posts:
+                article = self._article_from_post(post)
+                if article and article['url'] not in processed_urls:
+                    processed_urls.add(article['url'])
+                    articles.append({
+                        'title': article['title'],
+                        'url': article['url'],
+                        'content': article['content']
+                    })
+                    if len(articles) >= n:
+                        break
+            
+            total_pages = str(response.headers.get('X-WP-TotalPages', ''))
+            if len(posts) < per_page or (total_pages.isdigit() and page >= int(total_pages)):
+                break
+            page += 1
+        
+        return articles
+
+    def _article_from_post(self, post: Dict) -> Optional[Dict[str, str]]:
+        """
+        將 REST API 回傳的文章轉為文章資料並寫入文章儲存
+        
+        Args:
+            post: /wp-json/wp/v2/posts 的單筆結果
+            
+        Returns:
+            Dict containing {url, title, content, published, canonical_url, image}，內容不足則返回 None
+        """
+        url = (post.get('link') or '').strip()
+        rendered_title = (post.get('title') or {}).get('rendered') or ''
+        rendered_content = (post.get('content') or {}).get('rendered') or ''
+        if not url:
+            return None
+        
+        content = self._html_to_text(rendered_content)
+        if len(content) <= 100:
+            return None
+        
+        article = {
+            'url': url,
+            'title': self._html_to_text(rendered_title) or self._title_from_slug(url),
+            'content': content[:2000],
+            'published': post.get('date'),
+            'canonical_url': None,
+            'image': None
+        }
+        self._store_article(url, article)
+        return article
+
+    def _search_via_html(self, search_term: str, n: int, processed_urls: set,
+                         deadline: Optional[Deadline] = None) -> List[Dict[str, str]]:
+        """
+        以網站搜尋結果頁面搜尋文章，再逐篇擷取內容
+        
+        Args:
+            search_term: 搜尋詞
+            n: 最大文章數量
+            processed_urls: 已處理的文章 URL（會加入本次找到的 URL）
+            deadline: 請求期限，用於縮短請求逾時
+            
+        Returns:
+            List of Dict containing {title, url, content}
+        """
+        deadline = ensure_deadline(deadline)
+        self.rate_limiter.acquire(RateLimiter.key_for_url(self.search_url))
+        response = self.session.get(
+            self.search_url,
+            params={'s': search_term, 'post_type': 'post'},
+            headers=self.headers,
+            timeout=10,
+            deadline=deadline
+        )
+        response.raise_for_status()
+        
+        # 解析搜尋結果頁面，尋找文章連結
+        article_links = [
+            link for link in self.extractor.search_links(response.content)
+            if link not in processed_urls
+        ]
+        processed_urls.update(article_links)
+        
+        # 並行擷取文章內容與標題
+        fetched = self.fetcher.fetch_ordered(
+            lambda link: self._extract_search_article(link, deadline), article_links, n,
+            timeout=deadline.wait_timeout()
+        )
+        return [article for _, article in fetched]
+
+    def _extract_search_article(self, link: str,
+                                deadline: Optional[Deadline] = None) -> Optional[Dict[str, str]]:
+        """
+        擷取搜尋結果中單篇文章的內容與標題
+        
+        Args:
+            link: 文章 URL
+            deadline: 請求期限，用於縮短請求逾時
+            
+        Returns:
+            Dict containing {title, url, content}，失敗則返回 None
+        """
+        # 同一次請求取得內容與標題
+        article = self._fetch_article(link, deadline)
+        if not article:
+            return None
+        
+        return {
+            'title': article.get('title') or self._title_from_slug(link),
+            'url': link,
+            'content': article['content']
+        }
+
     def _generate_fuzzy_keywords(self, keyword: str) -> List[str]:
         """
         使用 Gemini AI 生成模糊搜尋關鍵字，如果失敗則使用傳統方法
@@ -315,8 +868,13 @@ class TechOrangeCrawler:
         Returns:
             List of fuzzy keywords
         """
-        # 嘗試使用 Gemini AI
+        # 嘗試使用 Gemini AI（先查詢快取）
         if self.gemini_model:
+            cached = self.keyword_cache.get(keyword)
+            if cached is not None:
+                logger.info(f"模糊關鍵字快取命中: {keyword}")
+                return cached
+            
             try:
                 prompt = f"""
 針對科技新聞網站搜尋，為關鍵字「{keyword}」生成相關的搜尋詞。
@@ -332,6 +890,8 @@ class TechOrangeCrawler:
 只回答 JSON 陣列，不要其他說明。
 """
                 
+                self.keyword_cache.record_gemini_call()
+                self.rate_limiter.acquire('gemini')
                 response = self.gemini_model.generate_content(prompt)
                 result_text = response.text.strip()
                 
@@ -340,6 +900,7 @@ class TechOrangeCrawler:
                     fuzzy_keywords = json.loads(result_text)
                     if isinstance(fuzzy_keywords, list):
                         logger.info(f"Gemini AI 生成關鍵字: {fuzzy_keywords}")
+                        self.keyword_cache.put(keyword, fuzzy_keywords)
                         return fuzzy_keywords
                 
             except Exception as e:
@@ -406,7 +967,24 @@ class TechOrangeCrawler:
         logger.info(f"傳統方法生成關鍵字: {fuzzy_keywords}")
         return fuzzy_keywords
 
-    def _calculate_match_score(self, title: str, keyword: str, fuzzy_keywords: List[str]) -> int:
+    def _build_title_matcher(self, keyword: str, fuzzy_keywords: List[str]) -> AhoCorasickMatcher:
+        """
+        建立標題比對用的多關鍵字自動機（每次查詢建立一次）
+        
+        模式順序：主要關鍵字、模糊關鍵字、主要關鍵字的片段（供部分匹配）
+        
+        Args:
+            keyword: 主要關鍵字（小寫）
+            fuzzy_keywords: 模糊關鍵字列表
+            
+        Returns:
+            AhoCorasickMatcher 實例
+        """
+        parts = [part for part in keyword.split() if len(part) > 2] if len(keyword) > 3 else []
+        return AhoCorasickMatcher([keyword] + list(fuzzy_keywords) + parts)
+
+    def _calculate_match_score(self, title: str, keyword: str, fuzzy_keywords: List[str],
+                               matcher: Optional[AhoCorasickMatcher] = None) -> int:
         """
         計算標題與關鍵字的匹配分數
         
@@ -414,48 +992,39 @@ class TechOrangeCrawler:
             title: 文章標題（小寫）
             keyword: 主要關鍵字（小寫）
             fuzzy_keywords: 模糊關鍵字列表
+            matcher: 由 _build_title_matcher 建立的自動機，預設即時建立
             
         Returns:
             匹配分數 (0-100)
         """
-        score = 0
+        if matcher is None:
+            matcher = self._build_title_matcher(keyword, fuzzy_keywords)
         
-        # 精確匹配主要關鍵字
-        if keyword in title:
-            score = 100
-            return score
-        
-        # AI 生成的第一個關鍵字優先級較高
-        for i, fuzzy_keyword in enumerate(fuzzy_keywords[:3]):
-            if fuzzy_keyword.lower() in title:
-                if i == 0:  # 第一個 AI 關鍵字
-                    score = 95
-                elif i <= 2:  # 前三個關鍵字
-                    score = 85
-                else:
-                    score = 70
-                break
+        # 一次掃描取得所有命中的模式索引
+        hits = matcher.search(title)
+        fuzzy_count = len(fuzzy_keywords)
+        fuzzy_hits = sorted(i - 1 for i in hits if 1 <= i <= fuzzy_count)
         
-        # 其他模糊關鍵字匹配
-        if score == 0:
-            for fuzzy_keyword in fuzzy_keywords[3:]:
-                if fuzzy_keyword.lower() in title:
-                    score = 70
-                    break
+        # 精確匹配主要關鍵字
+        if 0 in hits:
+            return 100
         
-        # 部分匹配檢查
-        if score == 0:
-            # 檢查關鍵字的部分匹配
-            if len(keyword) > 3:
-                keyword_parts = keyword.split()
-                for part in keyword_parts:
-                    if len(part) > 2 and part in title:
-                        score = max(score, 50)
+        score = 0
+        if fuzzy_hits:
+            first = fuzzy_hits[0]
+            if first == 0:  # 第一個 AI 關鍵字
+                score = 95
+            elif first <= 2:  # 前三個關鍵字
+                score = 85
+            else:  # 其他模糊關鍵字匹配
+                score = 70
+        elif any(i > fuzzy_count for i in hits):
+            # 關鍵字的部分匹配
+            score = 50
         
         # 多個關鍵字匹配，額外加分
-        matched_count = sum(1 for kw in [keyword] + fuzzy_keywords if kw.lower() in title)
-        if matched_count > 1:
-            score = min(100, score + matched_count * 2)
+        if len(fuzzy_hits) > 1:
+            score = min(100, score + len(fuzzy_hits) * 2)
         
         return score
 
@@ -469,128 +1038,316 @@ class TechOrangeCrawler:
         Returns:
             文章內容文字，失敗則返回 None
         """
-        try:
-            response = requests.get(url, headers=self.headers, timeout=15)
-            response.raise_for_status()
+        article = self._fetch_article(url)
+        return article['content'] if article else None
+
+    def _extract_entry_content(self, entry, deadline: Optional[Deadline] = None) -> Optional[str]:
+        """
+        取得 feed 項目的文章內容，優先使用 RSS 內嵌全文
+        
+        Args:
+            entry: feedparser entry
+            deadline: 請求期限，用於縮短請求逾時
             
-            # 解析文章頁面
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            # 移除不需要的元素
-            for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
-                element.decompose()
-            
-            # 尋找文章內容區域
-            content_selectors = [
-                'div.entry-content',
-                'article .content',
-                'div.post-content',
-                'div.article-content',
-                'main article',
-                'div.single-content'
-            ]
+        Returns:
+            文章內容文字，失敗則返回 None
+        """
+        article = self._fetch_entry_article(entry, deadline)
+        return article['content'] if article else None
+
+    def _fetch_entry_article(self, entry, deadline: Optional[Deadline] = None) -> Optional[Dict[str, str]]:
+        """
+        取得 feed 項目的文章資料：先查文章儲存，再使用 content:encoded，
+        內嵌全文缺少或被截斷時才擷取文章頁面
+        
+        Args:
+            entry: feedparser entry
+            deadline: 請求期限，用於縮短請求逾時
             
-            content = None
-            for selector in content_selectors:
-                content_div = soup.select_one(selector)
-                if content_div:
-                    content = content_div.get_text(strip=True)
-                    break
+        Returns:
+            Dict containing {url, title, content, published, canonical_url, image}，失敗則返回 None
+        """
+        url = entry.get('link', '').strip()
+        cached = self._get_stored_article(url)
+        if cached:
+            return cached
+        
+        article = self._article_from_entry(entry)
+        if article:
+            self._store_article(url, article)
+            return article
+        
+        return self._fetch_article(url, deadline)
+
+    def _article_from_entry(self, entry) -> Optional[Dict[str, str]]:
+        """
+        以 feed 項目內嵌的 content:encoded 建立文章資料（不進行網路請求）
+        
+        Args:
+            entry: feedparser entry
             
-            # 如果找不到特定選擇器，嘗試一般方法
-            if not content:
-                article_tag = soup.find('article')
-                if article_tag:
-                    content = article_tag.get_text(strip=True)
-                else:
-                    # 最後手段：取得 body 內容
-                    body_tag = soup.find('body')
-                    if body_tag:
-                        content = body_tag.get_text(strip=True)
+        Returns:
+            Dict containing {url, title, content, published, canonical_url, image}，
+            沒有內嵌全文或全文被截斷則返回 None
+        """
+        html_parts = [
+            item.get('value') for item in entry.get('content', [])
+            if item.get('value') and 'html' in (item.get('type') or 'text/html')
+        ]
+        if not html_parts:
+            return None
+        
+        content = self._parse_feed_body(''.join(html_parts))
+        if not content:
+            return None
+        
+        return {
+            'url': entry.get('link', '').strip(),
+            'title': entry.get('title', '').strip() or None,
+            'content': content,
+            'published': entry.get('published'),
+            'canonical_url': None,
+            'image': None
+        }
+
+    def _html_to_text(self, html: str) -> str:
+        """
+        將 HTML 片段轉為純文字（移除 script、style 等非內文元素）
+        
+        Args:
+            html: HTML 片段
             
-            if content and len(content) > 100:
-                return content[:2000]  # 限制內容長度
+        Returns:
+            純文字
+        """
+        return self.extractor.fragment_text(html)
+
+    def _parse_feed_body(self, html) -> Optional[str]:
+        """
+        將 RSS 內嵌的文章 HTML 轉為純文字（與頁面解析相同的 2000 字上限）
+        
+        Args:
+            html: content:encoded 的 HTML
             
+        Returns:
+            文章內容文字，內容不足或被截斷則返回 None
+        """
+        content = self._html_to_text(html)
+        if len(content) <= 100:
             return None
-            
-        except Exception as e:
-            logger.warning(f"擷取文章內容失敗 ({url}): {str(e)}")
+        
+        # WordPress「只輸出摘要」時會以 […] 或「閱讀全文」結尾
+        if TRUNCATION_PATTERN.search(content[-40:].lower()):
             return None
+        
+        return content[:2000]
 
-    def _extract_article_links_from_search(self, soup: BeautifulSoup) -> List[str]:
+    def _fetch_article(self, url: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, str]]:
         """
-        從搜尋結果頁面擷取文章連結
+        擷取並解析單篇文章（一次請求、一次解析），優先使用文章儲存
         
         Args:
-            soup: BeautifulSoup 物件
+            url: 文章 URL
+            deadline: 請求期限，已到期時只使用文章儲存（含過期內容）
             
         Returns:
-            文章連結列表
+            Dict containing {url, title, content, published, canonical_url, image}，失敗則返回 None
         """
-        links = []
+        # 先查詢文章儲存
+        cached = self._get_stored_article(url)
+        if cached:
+            return cached
         
-        # 常見的文章連結選擇器
-        link_selectors = [
-            'h2.entry-title a',
-            'h3.entry-title a',
-            'h1.entry-title a',
-            '.post-title a',
-            '.entry-title a',
-            'article h2 a',
-            'article h3 a'
-        ]
+        # 近期失敗過的 URL 不再重新擷取
+        failure_class = self.negative_cache.check(url)
+        if failure_class:
+            logger.debug(f"略過近期擷取失敗的文章 ({url}, {failure_class})")
+            return None
         
-        for selector in link_selectors:
-            link_elements = soup.select(selector)
-            for link_element in link_elements:
-                href = link_element.get('href')
-                if href and href.startswith('http'):
-                    links.append(href)
-                    if len(links) >= 10:  # 限制連結數量
-                        break
-            if links:
-                break
+        deadline = ensure_deadline(deadline)
+        if deadline.expired():
+            return self._get_stored_article(url, allow_stale=True)
         
-        return links
+        # 逾時因剩餘時間縮短時，逾時失敗不代表文章頁面緩慢
+        limited = deadline.limits(ARTICLE_TIMEOUT)
+        try:
+            # 超過主機延遲 p90 仍未完成時，以另一條連線送出對沖請求
+            article = self.hedger.run(
+                lambda target: self._download_article(target, ARTICLE_TIMEOUT, deadline), url
+            )
+            if article:
+                article['url'] = url
+                self._store_article(url, article)
+            else:
+                self.negative_cache.record(url, 'too_short')
+            return article
+            
+        except CircuitOpenError as e:
+            # 網站暫時無法使用，改用已過期的儲存內容（沒有則立即失敗）
+            logger.warning(f"略過文章擷取 ({url}): {str(e)}")
+            return self._get_stored_article(url, allow_stale=True)
+        except Exception as e:
+            logger.warning(f"擷取文章內容失敗 ({url}): {str(e)}")
+            failure_class = self._classify_fetch_error(e)
+            if failure_class and not (limited and failure_class == 'timeout'):
+                self.negative_cache.record(url, failure_class)
+            return self._get_stored_article(url, allow_stale=True)
 
-    def _extract_title_from_url(self, url: str) -> str:
+    def _download_article(self, url: str, timeout: float = ARTICLE_TIMEOUT,
+                          deadline: Optional[Deadline] = None) -> Optional[Dict[str, str]]:
         """
-        從 URL 中擷取文章標題
+        下載並解析文章頁面（串流下載，內文足夠或超過位元組上限即停止）
         
         Args:
             url: 文章 URL
+            timeout: 時間充裕時的請求逾時秒數
+            deadline: 請求期限，用於縮短逾時與限制重試
             
         Returns:
-            文章標題
+            Dict containing {title, content, published, canonical_url, image}，內容不足則返回 None
+            
+        Raises:
+            requests.RequestException: 請求失敗時
         """
+        response = self.session.get(url, headers=self.headers, timeout=timeout, stream=True, deadline=deadline)
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
+            parser = self.extractor.stream_parser(
+                charset_from_content_type(response.headers.get('Content-Type'))
+            )
+            self._feed_article_chunks(parser, response.iter_content(ARTICLE_CHUNK_SIZE), url)
+        finally:
+            response.close()
+        
+        return parser.close()
+
+    def _classify_fetch_error(self, error: Exception) -> Optional[str]:
+        """
+        判斷文章擷取錯誤的失敗類型（用於失敗 URL 快取）
+        
+        Args:
+            error: 擷取時發生的例外
             
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            # 尋找標題
-            title_selectors = [
-                'h1.entry-title',
-                'h1.post-title',
-                'h1.article-title',
-                'title',
-                'h1'
-            ]
+        Returns:
+            失敗類型，非網路錯誤（例如解析錯誤）則返回 None
+        """
+        if isinstance(error, requests.Timeout):
+            return 'timeout'
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return failure_class_for_status(error.response.status_code)
+        if isinstance(error, requests.ConnectionError):
+            # 讀取內文時的逾時由 iter_content 包成 ConnectionError
+            reason = error.args[0] if error.args else None
+            if isinstance(reason, ReadTimeoutError) or isinstance(error.__cause__, ReadTimeoutError):
+                return 'timeout'
+            return 'connection'
+        return None
+
+    def _feed_article_chunks(self, parser, chunks, url: str) -> int:
+        """
+        將下載的區塊送入增量解析器，直到內文足夠或達到位元組上限
+        
+        Args:
+            parser: extractor.stream_parser() 建立的解析器
+            chunks: bytes 區塊的迭代器
+            url: 文章 URL（記錄用）
             
-            for selector in title_selectors:
-                title_element = soup.select_one(selector)
-                if title_element:
-                    title = title_element.get_text(strip=True)
-                    if title and len(title) > 5:
-                        return title
+        Returns:
+            實際讀取的位元組數
+        """
+        received = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            chunk = chunk[:self.max_article_bytes - received]
+            received += len(chunk)
+            if parser.feed(chunk):
+                logger.debug(f"內文已足夠，提前結束下載 ({url}, {received} bytes)")
+                break
+            if received >= self.max_article_bytes:
+                logger.warning(f"文章頁面超過 {self.max_article_bytes} bytes，只解析前段 ({url})")
+                break
+        return received
+
+    def _parse_article_page(self, html) -> Optional[Dict[str, str]]:
+        """
+        解析文章頁面 HTML，取得標題、內文與中繼資料（不進行網路請求）
+        
+        Args:
+            html: 文章頁面 HTML（bytes 或 str）
             
-            # 如果找不到標題，從 URL 推測
-            return url.split('/')[-1].replace('-', ' ').replace('.html', '').title()
+        Returns:
+            Dict containing {title, content, published, canonical_url, image}，內容不足則返回 None
+        """
+        return self.extractor.parse_article(html)
+
+    def _get_stored_article(self, url: str, allow_stale: bool = False) -> Optional[Dict[str, str]]:
+        """
+        從文章儲存讀取已擷取的文章
+        
+        Args:
+            url: 文章 URL
+            allow_stale: 是否接受已過期的文章（擷取失敗時使用）
             
+        Returns:
+            儲存的文章資料，未啟用或找不到則返回 None
+        """
+        if not self.store:
+            return None
+        try:
+            return self.store.get(url, allow_stale=allow_stale)
         except Exception as e:
-            logger.warning(f"擷取標題失敗 ({url}): {str(e)}")
-            return "標題擷取失敗"
+            logger.warning(f"讀取文章儲存失敗 ({url}): {str(e)}")
+            return None
+
+    def _store_article(self, url: str, article: Dict[str, str]):
+        """
+        將擷取的文章寫入文章儲存
+        
+        Args:
+            url: 文章 URL
+            article: _parse_article_page 回傳的文章資料
+        """
+        if not self.store:
+            return
+        try:
+            self.store.put(
+                url, article['content'], article.get('title'),
+                published=article.get('published'),
+                canonical_url=article.get('canonical_url'),
+                image=article.get('image')
+            )
+        except Exception as e:
+            logger.warning(f"寫入文章儲存失敗 ({url}): {str(e)}")
+
+    def _extract_title_from_url(self, url: str) -> str:
+        """
+        從 URL 中擷取文章標題
+        
+        Args:
+            url: 文章 URL
+            
+        Returns:
+            文章標題
+        """
+        article = self._fetch_article(url)
+        if article and article.get('title'):
+            return article['title']
+        
+        # 如果找不到標題，從 URL 推測
+        return self._title_from_slug(url)
+
+    def _title_from_slug(self, url: str) -> str:
+        """
+        從 URL 路徑推測文章標題
+        
+        Args:
+            url: 文章 URL
+            
+        Returns:
+            推測的標題
+        """
+        return url.rstrip('/').split('/')[-1].replace('-', ' ').replace('.html', '').title()
 
 # 便利函數
 def fetch_articles(keyword: str, n: int = 3) -> List[Dict[str, str]]:
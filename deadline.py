@@ -0,0 +1,148 @@
+"""
+請求期限模組
+在收到 webhook 時建立整個查詢（爬取、摘要、推送）共用的時間預算，
+各階段依剩餘時間決定請求逾時，時間不足時改用較快的降級方案
+
+總預算由 REQUEST_DEADLINE 環境變數設定（秒，預設 25，0 表示不限制）
+"""
+
+import os
+import time
+import logging
+from typing import List, Optional
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+# 任何請求的最短逾時秒數（避免剩餘時間極短時送出必定逾時的請求）
+MIN_TIMEOUT = 1.0
+
+
+class Deadline:
+    """
+    請求期限
+
+    功能：
+    - 查詢剩餘時間與是否已過期
+    - 依剩餘時間縮短各請求的逾時設定
+    - 為後續階段保留時間（例如推送訊息前的爬取與摘要）
+    - 記錄因時間不足而採用的降級方案
+    """
+
+    def __init__(self, budget: Optional[float] = None, expires_at: Optional[float] = None,
+                 degraded: Optional[List[str]] = None):
+        """
+        初始化請求期限
+
+        Args:
+            budget: 從現在起的時間預算（秒），None 表示不限制
+            expires_at: 直接指定到期時間（time.monotonic()），優先於 budget
+            degraded: 共用的降級記錄列表（子期限與父期限共用）
+        """
+        if expires_at is None and budget is not None:
+            expires_at = time.monotonic() + budget
+        self.expires_at = expires_at
+        self.degraded = degraded if degraded is not None else []
+
+    @classmethod
+    def from_env(cls) -> 'Deadline':
+        """
+        依 REQUEST_DEADLINE 環境變數建立期限
+
+        Returns:
+            Deadline 實例（設定為 0 或負數時不限制）
+        """
+        budget = float(os.getenv('REQUEST_DEADLINE', 25))
+        return cls(budget if budget > 0 else None)
+
+    def remaining(self) -> float:
+        """剩餘秒數（不限制時為無限大，過期時為 0）"""
+        if self.expires_at is None:
+            return float('inf')
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """是否已過期"""
+        return self.remaining() <= 0
+
+    def allows(self, seconds: float) -> bool:
+        """
+        剩餘時間是否足夠完成預估需要 seconds 秒的工作
+
+        Args:
+            seconds: 預估需要的秒數
+
+        Returns:
+            剩餘時間大於 seconds 時為 True
+        """
+        return self.remaining() > seconds
+
+    def timeout(self, default: float) -> float:
+        """
+        依剩餘時間計算請求逾時
+
+        Args:
+            default: 時間充裕時使用的逾時秒數
+
+        Returns:
+            不超過 default 與剩餘時間的逾時秒數（至少 MIN_TIMEOUT）
+        """
+        return max(MIN_TIMEOUT, min(default, self.remaining()))
+
+    def limits(self, default: float) -> bool:
+        """
+        請求逾時是否因剩餘時間而短於正常值（此時的逾時不代表主機緩慢）
+
+        Args:
+            default: 時間充裕時使用的逾時秒數
+
+        Returns:
+            timeout(default) 小於 default 時為 True
+        """
+        return self.timeout(default) < default
+
+    def wait_timeout(self) -> Optional[float]:
+        """
+        等待其他執行緒工作時使用的逾時
+
+        Returns:
+            剩餘秒數，不限制時為 None
+        """
+        return None if self.expires_at is None else self.remaining()
+
+    def reserve(self, seconds: float) -> 'Deadline':
+        """
+        建立提早 seconds 秒到期的子期限，為後續階段保留時間
+
+        Args:
+            seconds: 保留給後續階段的秒數
+
+        Returns:
+            共用降級記錄的子期限
+        """
+        if self.expires_at is None:
+            return Deadline(degraded=self.degraded)
+        return Deadline(expires_at=self.expires_at - seconds, degraded=self.degraded)
+
+    def degrade(self, reason: str):
+        """
+        記錄一次因時間不足而採用的降級方案
+
+        Args:
+            reason: 降級說明
+        """
+        self.degraded.append(reason)
+        logger.warning(f"剩餘時間 {self.remaining():.1f} 秒，{reason}")
+
+
+def ensure_deadline(deadline: Optional[Deadline]) -> Deadline:
+    """
+    取得可用的期限（未提供時視為不限制）
+
+    Args:
+        deadline: 呼叫者傳入的期限或 None
+
+    Returns:
+        Deadline 實例
+    """
+    return deadline if deadline is not None else Deadline()
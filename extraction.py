@@ -0,0 +1,559 @@
+"""
+文章頁面擷取模組
+將 HTML 解析為 {title, content, published, canonical_url, image} 的文章資料，
+提供 BeautifulSoup 與 lxml（預先編譯的 XPath）兩種後端，兩者輸出相同
+
+後端由 HTML_PARSER 環境變數選擇（lxml 或 bs4，預設 lxml）
+"""
+
+import os
+import re
+from abc import ABC, abstractmethod
+import threading
+import logging
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+from lxml import etree
+import lxml.html
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+# 內容長度限制（超過截斷，不足視為擷取失敗）
+MAX_CONTENT_CHARS = 2000
+MIN_CONTENT_CHARS = 100
+
+# 取得標題與中繼資料後要移除的頁面元素
+NOISE_TAGS = ('script', 'style', 'nav', 'footer', 'header', 'aside')
+
+# HTML 片段（RSS 內嵌全文、REST API 內容）轉純文字時要移除的元素
+FRAGMENT_NOISE_TAGS = ('script', 'style', 'iframe', 'form')
+
+# 以下選擇器依優先順序排列，CSS 供 BeautifulSoup 使用，XPath 為等價寫法
+TITLE_SELECTORS = ['h1.entry-title', 'h1.post-title', 'h1.article-title', 'title', 'h1']
+
+CONTENT_SELECTORS = [
+    'div.entry-content',
+    'article .content',
+    'div.post-content',
+    'div.article-content',
+    'main article',
+    'div.single-content'
+]
+
+METADATA_SELECTORS = {
+    'published': [
+        'meta[property="article:published_time"]',
+        'meta[itemprop="datePublished"]',
+        'time[datetime]'
+    ],
+    'canonical_url': [
+        'link[rel="canonical"]',
+        'meta[property="og:url"]'
+    ],
+    'image': [
+        'meta[property="og:image"]',
+        'meta[name="twitter:image"]'
+    ]
+}
+
+SEARCH_LINK_SELECTORS = [
+    'h2.entry-title a',
+    'h3.entry-title a',
+    'h1.entry-title a',
+    '.post-title a',
+    '.entry-title a',
+    'article h2 a',
+    'article h3 a'
+]
+
+# 搜尋結果頁面最多取得的連結數
+MAX_SEARCH_LINKS = 10
+
+
+def _has_class(name: str) -> str:
+    """XPath：class 屬性包含指定類別（等同 CSS 的 .name）"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+TITLE_XPATHS = [
+    f"//h1[{_has_class('entry-title')}]",
+    f"//h1[{_has_class('post-title')}]",
+    f"//h1[{_has_class('article-title')}]",
+    "//title",
+    "//h1"
+]
+
+CONTENT_XPATHS = [
+    f"//div[{_has_class('entry-content')}]",
+    f"//article//*[{_has_class('content')}]",
+    f"//div[{_has_class('post-content')}]",
+    f"//div[{_has_class('article-content')}]",
+    "//main//article",
+    f"//div[{_has_class('single-content')}]"
+]
+
+METADATA_XPATHS = {
+    'published': [
+        '//meta[@property="article:published_time"]',
+        '//meta[@itemprop="datePublished"]',
+        '//time[@datetime]'
+    ],
+    'canonical_url': [
+        '//link[@rel="canonical"]',
+        '//meta[@property="og:url"]'
+    ],
+    'image': [
+        '//meta[@property="og:image"]',
+        '//meta[@name="twitter:image"]'
+    ]
+}
+
+SEARCH_LINK_XPATHS = [
+    f"//h2[{_has_class('entry-title')}]//a",
+    f"//h3[{_has_class('entry-title')}]//a",
+    f"//h1[{_has_class('entry-title')}]//a",
+    f"//*[{_has_class('post-title')}]//a",
+    f"//*[{_has_class('entry-title')}]//a",
+    "//article//h2//a",
+    "//article//h3//a"
+]
+
+# 在文件開頭尋找宣告的字元編碼
+CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([a-zA-Z0-9_-]+)', re.IGNORECASE)
+HEADER_CHARSET_RE = re.compile(r'charset=["\']?([a-zA-Z0-9_-]+)', re.IGNORECASE)
+
+# 內文容器中可見文字節點（排除雜訊元素內的文字）
+VISIBLE_TEXT_XPATH = 'descendant-or-self::text()[not({})]'.format(
+    ' or '.join(f'ancestor::{tag}' for tag in NOISE_TAGS)
+)
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """
+    取得 Content-Type 標頭宣告的字元編碼
+
+    Args:
+        content_type: Content-Type 標頭值
+
+    Returns:
+        小寫編碼名稱，沒有宣告則返回 None
+    """
+    match = HEADER_CHARSET_RE.search(content_type or '')
+    return match.group(1).lower() if match else None
+
+
+def detect_charset(data: bytes) -> str:
+    """
+    由文件開頭的 meta 宣告判斷字元編碼
+
+    Args:
+        data: 文件開頭的 bytes
+
+    Returns:
+        小寫編碼名稱，沒有宣告則為 utf-8
+    """
+    match = CHARSET_RE.search(data[:4096])
+    return match.group(1).decode('ascii').lower() if match else 'utf-8'
+
+
+class BaseExtractor(ABC):
+    """
+    文章擷取後端的共用流程
+
+    子類別必須實作 _load、_title、_metadata、_strip_noise、_content 與片段/連結擷取
+    （抽象方法，缺少任何一個時無法建立實例）
+    """
+
+    name = 'base'
+
+    def parse_article(self, html) -> Optional[Dict[str, Optional[str]]]:
+        """
+        解析文章頁面 HTML（不進行網路請求）
+
+        Args:
+            html: 文章頁面 HTML（bytes 或 str）
+
+        Returns:
+            Dict containing {title, content, published, canonical_url, image}，內容不足則返回 None
+        """
+        doc = self._load(html)
+        if doc is None:
+            return None
+        return self._extract(doc)
+
+    def _extract(self, doc) -> Optional[Dict[str, Optional[str]]]:
+        """由已解析的文件取得文章資料"""
+        # 在移除頁首前先取得標題與中繼資料
+        title = self._title(doc)
+        metadata = self._metadata(doc)
+
+        self._strip_noise(doc, NOISE_TAGS)
+        content = self._content(doc)
+
+        if content and len(content) > MIN_CONTENT_CHARS:
+            return {
+                'title': title,
+                'content': content[:MAX_CONTENT_CHARS],
+                **metadata
+            }
+        return None
+
+    def stream_parser(self, encoding: Optional[str] = None) -> 'BufferedArticleParser':
+        """
+        建立逐段接收 HTML 的文章解析器
+
+        Args:
+            encoding: HTTP 標頭宣告的字元編碼
+
+        Returns:
+            具有 feed(chunk) 與 close() 的解析器
+        """
+        return BufferedArticleParser(self)
+
+    @abstractmethod
+    def _load(self, html):
+        """解析 HTML，無法解析時返回 None"""
+
+    @abstractmethod
+    def _title(self, doc) -> Optional[str]:
+        """取得文章標題"""
+
+    @abstractmethod
+    def _metadata(self, doc) -> Dict[str, Optional[str]]:
+        """取得發布時間、正規網址與代表圖片"""
+
+    @abstractmethod
+    def _strip_noise(self, doc, tags):
+        """移除非內文元素"""
+
+    @abstractmethod
+    def _content(self, doc) -> Optional[str]:
+        """取得文章內文"""
+
+    @abstractmethod
+    def fragment_text(self, html: str) -> str:
+        """
+        將 HTML 片段轉為純文字（移除 script、style 等非內文元素）
+
+        Args:
+            html: HTML 片段
+
+        Returns:
+            純文字
+        """
+
+    @abstractmethod
+    def search_links(self, html) -> List[str]:
+        """
+        從搜尋結果頁面擷取文章連結
+
+        Args:
+            html: 搜尋結果頁面 HTML
+
+        Returns:
+            文章連結列表（最多 MAX_SEARCH_LINKS 個）
+        """
+
+
+class SoupExtractor(BaseExtractor):
+    """以 BeautifulSoup（lxml 解析器）與 CSS 選擇器擷取"""
+
+    name = 'bs4'
+
+    def _load(self, html):
+        return BeautifulSoup(html, 'lxml')
+
+    def _title(self, soup) -> Optional[str]:
+        for selector in TITLE_SELECTORS:
+            element = soup.select_one(selector)
+            if element:
+                title = element.get_text(strip=True)
+                if title and len(title) > 5:
+                    return title
+        return None
+
+    def _metadata(self, soup) -> Dict[str, Optional[str]]:
+        def meta_content(selectors):
+            for selector in selectors:
+                element = soup.select_one(selector)
+                if element:
+                    value = element.get('content') or element.get('href') or element.get('datetime')
+                    if value:
+                        return value.strip()
+            return None
+
+        return {field: meta_content(selectors) for field, selectors in METADATA_SELECTORS.items()}
+
+    def _strip_noise(self, soup, tags):
+        for element in soup(list(tags)):
+            element.decompose()
+
+    def _content(self, soup) -> Optional[str]:
+        for selector in CONTENT_SELECTORS:
+            element = soup.select_one(selector)
+            if element:
+                return element.get_text(strip=True)
+
+        # 找不到特定選擇器時，依序嘗試 article 與 body
+        for tag in ('article', 'body'):
+            element = soup.find(tag)
+            if element:
+                return element.get_text(strip=True)
+        return None
+
+    def fragment_text(self, html: str) -> str:
+        soup = BeautifulSoup(html, 'lxml')
+        self._strip_noise(soup, FRAGMENT_NOISE_TAGS)
+        return soup.get_text(strip=True)
+
+    def search_links(self, html) -> List[str]:
+        soup = BeautifulSoup(html, 'lxml')
+        links = []
+        for selector in SEARCH_LINK_SELECTORS:
+            for element in soup.select(selector):
+                href = element.get('href')
+                if href and href.startswith('http'):
+                    links.append(href)
+                    if len(links) >= MAX_SEARCH_LINKS:
+                        break
+            if links:
+                break
+        return links
+
+
+class LxmlExtractor(BaseExtractor):
+    """
+    以 lxml.html 與預先編譯的 XPath 擷取
+
+    解析時直接捨棄註解；XPath 與解析器不可跨執行緒共用，因此每個執行緒各自編譯
+    """
+
+    name = 'lxml'
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _compiled(self):
+        """取得目前執行緒的已編譯 XPath"""
+        compiled = getattr(self._local, 'xpaths', None)
+        if compiled is None:
+            compiled = {
+                'title': [etree.XPath(xpath) for xpath in TITLE_XPATHS],
+                'content': [etree.XPath(xpath) for xpath in CONTENT_XPATHS],
+                'metadata': {
+                    field: [etree.XPath(xpath) for xpath in xpaths]
+                    for field, xpaths in METADATA_XPATHS.items()
+                },
+                'search_links': [etree.XPath(xpath) for xpath in SEARCH_LINK_XPATHS],
+                'fallback': [etree.XPath('//article'), etree.XPath('//body')],
+            }
+            self._local.xpaths = compiled
+        return compiled
+
+    def stream_parser(self, encoding: Optional[str] = None) -> 'IncrementalArticleParser':
+        return IncrementalArticleParser(self, encoding)
+
+    def _parser(self, encoding: str):
+        """取得目前執行緒指定編碼的 HTML 解析器"""
+        parsers = getattr(self._local, 'parsers', None)
+        if parsers is None:
+            parsers = self._local.parsers = {}
+        parser = parsers.get(encoding)
+        if parser is None:
+            parser = parsers[encoding] = etree.HTMLParser(encoding=encoding, remove_comments=True)
+        return parser
+
+    def _load(self, html):
+        if isinstance(html, str):
+            data, encoding = html.encode('utf-8'), 'utf-8'
+        else:
+            data = bytes(html)
+            encoding = detect_charset(data)
+
+        try:
+            return lxml.html.document_fromstring(data, parser=self._parser(encoding))
+        except LookupError:
+            # 宣告了不支援的編碼，改以 UTF-8 解析
+            return lxml.html.document_fromstring(data, parser=self._parser('utf-8'))
+        except etree.ParserError:
+            # 空白文件
+            return None
+
+    @staticmethod
+    def _text(element) -> str:
+        """等同 BeautifulSoup 的 get_text(strip=True)"""
+        return ''.join(text.strip() for text in element.itertext() if text.strip())
+
+    def _title(self, doc) -> Optional[str]:
+        for xpath in self._compiled()['title']:
+            found = xpath(doc)
+            if found:
+                title = self._text(found[0])
+                if title and len(title) > 5:
+                    return title
+        return None
+
+    def _metadata(self, doc) -> Dict[str, Optional[str]]:
+        def meta_content(xpaths):
+            for xpath in xpaths:
+                found = xpath(doc)
+                if found:
+                    element = found[0]
+                    value = element.get('content') or element.get('href') or element.get('datetime')
+                    if value:
+                        return value.strip()
+            return None
+
+        return {field: meta_content(xpaths) for field, xpaths in self._compiled()['metadata'].items()}
+
+    def _strip_noise(self, doc, tags):
+        etree.strip_elements(doc, *tags, with_tail=False)
+
+    def _content(self, doc) -> Optional[str]:
+        compiled = self._compiled()
+        for xpath in compiled['content'] + compiled['fallback']:
+            found = xpath(doc)
+            if found:
+                return self._text(found[0])
+        return None
+
+    def fragment_text(self, html: str) -> str:
+        if not html or not html.strip():
+            return ''
+        fragment = self._load(f"<html><body>{html}</body></html>")
+        if fragment is None:
+            return ''
+        self._strip_noise(fragment, FRAGMENT_NOISE_TAGS)
+        return self._text(fragment)
+
+    def search_links(self, html) -> List[str]:
+        doc = self._load(html)
+        if doc is None:
+            return []
+        links = []
+        for xpath in self._compiled()['search_links']:
+            for element in xpath(doc):
+                href = element.get('href')
+                if href and href.startswith('http'):
+                    links.append(href)
+                    if len(links) >= MAX_SEARCH_LINKS:
+                        break
+            if links:
+                break
+        return links
+
+
+class BufferedArticleParser:
+    """
+    逐段接收 HTML，結束時一次解析（供不支援增量解析的後端使用）
+    """
+
+    def __init__(self, extractor: BaseExtractor):
+        self.extractor = extractor
+        self._chunks: List[bytes] = []
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        接收一段 HTML
+
+        Returns:
+            是否已取得足夠內容（此解析器永遠為 False）
+        """
+        self._chunks.append(chunk)
+        return False
+
+    def close(self) -> Optional[Dict[str, Optional[str]]]:
+        """解析已接收的 HTML 並返回文章資料"""
+        if not self._chunks:
+            return None
+        return self.extractor.parse_article(b''.join(self._chunks))
+
+
+class IncrementalArticleParser:
+    """
+    以 lxml HTMLPullParser 增量解析文章頁面
+
+    一旦 div.entry-content 已累積 MAX_CONTENT_CHARS 個可見字元即回報完成，
+    呼叫端可停止下載；close() 以目前已解析的部分文件擷取文章，
+    結果與解析完整頁面相同（內文只取前 MAX_CONTENT_CHARS 字）
+    """
+
+    def __init__(self, extractor: LxmlExtractor, encoding: Optional[str] = None,
+                 target_chars: int = MAX_CONTENT_CHARS):
+        self.extractor = extractor
+        self.encoding = encoding
+        self.target_chars = target_chars
+        self.done = False
+        self._parser = None
+        self._container = None
+        self._visible_text = etree.XPath(VISIBLE_TEXT_XPATH)
+
+    def _create_parser(self, first_chunk: bytes):
+        encoding = self.encoding or detect_charset(first_chunk)
+        try:
+            return etree.HTMLPullParser(events=('start',), encoding=encoding, remove_comments=True)
+        except LookupError:
+            return etree.HTMLPullParser(events=('start',), encoding='utf-8', remove_comments=True)
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        接收一段 HTML
+
+        Args:
+            chunk: HTML bytes
+
+        Returns:
+            內文容器是否已累積足夠的文字
+        """
+        if self.done:
+            return True
+        if self._parser is None:
+            self._parser = self._create_parser(chunk)
+        self._parser.feed(chunk)
+
+        for _, element in self._parser.read_events():
+            if (self._container is None and element.tag == 'div'
+                    and 'entry-content' in (element.get('class') or '').split()):
+                self._container = element
+
+        if self._container is not None:
+            visible = sum(len(text.strip()) for text in self._visible_text(self._container))
+            self.done = visible >= self.target_chars
+        return self.done
+
+    def close(self) -> Optional[Dict[str, Optional[str]]]:
+        """以已接收的部分擷取文章資料"""
+        if self._parser is None:
+            return None
+        try:
+            root = self._parser.close()
+        except etree.XMLSyntaxError:
+            return None
+        if root is None:
+            return None
+        return self.extractor._extract(root)
+
+
+EXTRACTORS = {
+    SoupExtractor.name: SoupExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+}
+
+
+def get_extractor(name: Optional[str] = None) -> BaseExtractor:
+    """
+    建立文章擷取後端
+
+    Args:
+        name: 後端名稱（lxml 或 bs4），預設讀取 HTML_PARSER 環境變數
+
+    Returns:
+        擷取後端實例，名稱不明時使用 lxml
+    """
+    name = (name or os.getenv('HTML_PARSER', LxmlExtractor.name)).lower()
+    if name not in EXTRACTORS:
+        logger.warning(f"未知的 HTML_PARSER: {name}，改用 lxml")
+        name = LxmlExtractor.name
+    return EXTRACTORS[name]()
@@ -0,0 +1,232 @@
+"""
+RSS Feed 快取模組
+提供行程內共用的 RSS feed 快照，支援 TTL、條件式請求 (ETag / If-Modified-Since)
+以及單一飛行 (single-flight) 刷新，避免同時間重複下載同一份 feed
+"""
+
+import os
+import threading
+import time
+import logging
+from typing import Dict, List, Optional
+
+import feedparser
+import requests
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+# 預設快取存活時間（秒）
+DEFAULT_FEED_TTL = float(os.getenv('FEED_CACHE_TTL', 300))
+
+
+class FeedSnapshot:
+    """
+    RSS feed 快照
+
+    功能：
+    - 在 TTL 內直接回傳已解析的 entries
+    - 過期後以 ETag / Last-Modified 進行條件式請求
+    - 同一時間只允許一個刷新請求，其餘呼叫者等待結果
+    - 統計命中、未命中與重新驗證次數
+    """
+
+    def __init__(self, url: str, ttl: Optional[float] = None):
+        """
+        初始化 feed 快照
+
+        Args:
+            url: RSS feed 網址
+            ttl: 快取存活時間（秒），不提供則使用 FEED_CACHE_TTL 環境變數
+        """
+        self.url = url
+        self.ttl = DEFAULT_FEED_TTL if ttl is None else ttl
+
+        self._entries: Optional[List] = None
+        self._fetched_at = 0.0
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+
+        # 單一飛行刷新狀態
+        self._cond = threading.Condition()
+        self._refreshing = False
+        self._generation = 0
+        self._last_error: Optional[Exception] = None
+
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'revalidations': 0,
+            'not_modified': 0,
+            'refreshes': 0,
+            'coalesced': 0,
+            'errors': 0,
+            'stale': 0,
+        }
+
+    def get_entries(self, session=None, headers: Optional[Dict[str, str]] = None,
+                    timeout: float = 10, deadline=None) -> List:
+        """
+        取得 feed entries，必要時刷新快照；刷新失敗但已有快照時沿用過期的快照
+
+        Args:
+            session: 用於發送請求的 requests Session，預設使用 requests 模組
+            headers: 額外的 HTTP 標頭
+            timeout: 請求逾時秒數
+            deadline: 請求期限（傳給支援 deadline 的 PooledSession，依剩餘時間縮短逾時與重試）
+
+        Returns:
+            feedparser entries 列表（呼叫者不應修改）
+
+        Raises:
+            requests.RequestException: 刷新失敗且沒有可用的快照時
+        """
+        with self._cond:
+            if self._is_fresh():
+                self._stats['hits'] += 1
+                return self._entries
+
+            if self._refreshing:
+                # 已有其他執行緒在刷新，等待其結果
+                self._stats['coalesced'] += 1
+                generation = self._generation
+                while self._refreshing and self._generation == generation:
+                    self._cond.wait()
+                if self._last_error is not None and self._entries is None:
+                    raise self._last_error
+                return self._entries
+
+            self._stats['misses'] += 1
+            self._refreshing = True
+
+        error = None
+        try:
+            self._refresh(session, headers, timeout, deadline)
+        except Exception as e:
+            error = e
+        finally:
+            with self._cond:
+                self._refreshing = False
+                self._generation += 1
+                self._last_error = error
+                if error is not None:
+                    self._stats['errors'] += 1
+                    if self._entries is not None:
+                        self._stats['stale'] += 1
+                self._cond.notify_all()
+
+        if error is not None:
+            if self._entries is None:
+                raise error
+            # 網站無法連線（或斷路器斷開）時沿用過期的快照
+            logger.warning(f"RSS feed 刷新失敗，沿用過期的快照: {str(error)}")
+        return self._entries
+
+    def invalidate(self):
+        """使快照立即過期（保留驗證資訊以便條件式請求）"""
+        with self._cond:
+            self._fetched_at = 0.0
+
+    def clear(self):
+        """清除快照與所有統計"""
+        with self._cond:
+            self._entries = None
+            self._fetched_at = 0.0
+            self._etag = None
+            self._last_modified = None
+            self._last_error = None
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        取得快取統計
+
+        Returns:
+            包含命中、未命中、重新驗證次數與快照年齡的字典
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries) if self._entries is not None else 0
+            stats['age'] = time.time() - self._fetched_at if self._fetched_at else None
+        return stats
+
+    def _is_fresh(self) -> bool:
+        """檢查快照是否仍在 TTL 內"""
+        return self._entries is not None and (time.time() - self._fetched_at) < self.ttl
+
+    def _refresh(self, session, headers: Optional[Dict[str, str]], timeout: float, deadline=None):
+        """
+        下載並解析 feed，有驗證資訊時使用條件式請求
+
+        Args:
+            session: requests Session 或 requests 模組
+            headers: 額外的 HTTP 標頭
+            timeout: 請求逾時秒數
+            deadline: 請求期限，None 表示不傳給 Session
+        """
+        request_headers = dict(headers or {})
+        conditional = self._entries is not None and (self._etag or self._last_modified)
+        if conditional:
+            if self._etag:
+                request_headers['If-None-Match'] = self._etag
+            if self._last_modified:
+                request_headers['If-Modified-Since'] = self._last_modified
+            with self._cond:
+                self._stats['revalidations'] += 1
+
+        client = session if session is not None else requests
+        options = {'deadline': deadline} if deadline is not None else {}
+        response = client.get(self.url, headers=request_headers, timeout=timeout, **options)
+
+        if conditional and response.status_code == 304:
+            logger.info("RSS feed 未變更 (304)，沿用既有快照")
+            with self._cond:
+                self._stats['not_modified'] += 1
+                self._fetched_at = time.time()
+            return
+
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        with self._cond:
+            self._entries = list(feed.entries)
+            self._fetched_at = time.time()
+            self._etag = etag if isinstance(etag, str) else None
+            self._last_modified = last_modified if isinstance(last_modified, str) else None
+            self._stats['refreshes'] += 1
+
+        logger.info(f"RSS feed 快照已更新，共 {len(self._entries)} 篇")
+
+
+# 行程內共用的快照
+_snapshots: Dict[str, FeedSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_feed_snapshot(url: str, ttl: Optional[float] = None) -> FeedSnapshot:
+    """
+    取得指定 feed 網址的共用快照（單例）
+
+    Args:
+        url: RSS feed 網址
+        ttl: 首次建立時使用的快取存活時間（秒）
+
+    Returns:
+        FeedSnapshot 實例
+    """
+    with _snapshots_lock:
+        snapshot = _snapshots.get(url)
+        if snapshot is None:
+            snapshot = FeedSnapshot(url, ttl)
+            _snapshots[url] = snapshot
+        return snapshot
+
+
+def reset_feed_snapshots():
+    """清除所有共用快照（主要用於測試）"""
+    with _snapshots_lock:
+        _snapshots.clear()
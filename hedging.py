@@ -0,0 +1,250 @@
+"""
+請求對沖模組
+文章頁面擷取若超過該主機近期延遲的 p90 仍未完成，另外送出一個相同的請求，
+取先完成者的結果；以全域比例上限控制對沖請求的數量，並統計對沖勝出的次數
+
+設定由環境變數決定：
+    HEDGE_REQUESTS     是否啟用（預設 0，停用）
+    HEDGE_MAX_RATE     對沖請求佔全部請求的比例上限（預設 0.1）
+    HEDGE_PERCENTILE   觸發對沖的延遲百分位數（預設 90）
+    HEDGE_MIN_SAMPLES  主機累積多少筆延遲後才開始對沖（預設 20）
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from rate_limit import RateLimiter
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+# 每個主機保留的延遲樣本數
+LATENCY_WINDOW = 200
+
+
+class RequestHedger:
+    """
+    請求對沖器
+
+    功能：
+    - 依主機記錄成功請求的延遲，計算觸發對沖的百分位數
+    - 主要請求逾時未完成時送出對沖請求，取先成功完成者
+    - 對沖請求數不超過全部請求的固定比例
+    - 統計對沖次數、因比例上限略過的次數與對沖勝出次數
+    """
+
+    def __init__(self, enabled: bool = True, max_rate: float = 0.1, percentile: float = 90,
+                 min_samples: int = 20, max_workers: int = 16):
+        """
+        初始化請求對沖器
+
+        Args:
+            enabled: 是否啟用對沖（停用時只記錄延遲）
+            max_rate: 對沖請求佔全部請求的比例上限
+            percentile: 觸發對沖的延遲百分位數
+            min_samples: 主機累積多少筆延遲樣本後才開始對沖
+            max_workers: 同步請求使用的執行緒池大小
+        """
+        self.enabled = enabled
+        self.max_rate = max_rate
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'hedged': 0, 'suppressed': 0, 'hedge_wins': 0, 'primary_wins': 0}
+
+    def hedge_delay(self, url: str) -> Optional[float]:
+        """
+        取得 URL 主機的對沖等待秒數
+
+        Args:
+            url: 請求 URL
+
+        Returns:
+            近期延遲的百分位數，樣本不足則返回 None
+        """
+        return self._threshold(RateLimiter.key_for_url(url))
+
+    def _threshold(self, key: str) -> Optional[float]:
+        """計算主機延遲樣本的百分位數，樣本不足則返回 None"""
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, math.ceil(len(samples) * self.percentile / 100) - 1)
+        return samples[index]
+
+    def record_latency(self, url: str, latency: float):
+        """
+        記錄一次成功請求的延遲
+
+        Args:
+            url: 請求 URL
+            latency: 延遲秒數
+        """
+        key = RateLimiter.key_for_url(url)
+        with self._lock:
+            samples = self._latencies.get(key)
+            if samples is None:
+                samples = self._latencies[key] = deque(maxlen=LATENCY_WINDOW)
+            samples.append(latency)
+
+    def _start_request(self):
+        """記錄一次請求"""
+        with self._lock:
+            self._stats['requests'] += 1
+
+    def _allow_hedge(self) -> bool:
+        """檢查全域比例上限，允許時計入一次對沖"""
+        with self._lock:
+            if self._stats['hedged'] + 1 > self.max_rate * self._stats['requests']:
+                self._stats['suppressed'] += 1
+                return False
+            self._stats['hedged'] += 1
+            return True
+
+    def _record_winner(self, hedge_won: bool):
+        """記錄對沖請求與主要請求何者先完成"""
+        with self._lock:
+            self._stats['hedge_wins' if hedge_won else 'primary_wins'] += 1
+
+    def _timed(self, func: Callable[[str], Any], url: str) -> Any:
+        """執行請求並記錄成功的延遲"""
+        start = time.monotonic()
+        result = func(url)
+        self.record_latency(url, time.monotonic() - start)
+        return result
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """取得同步請求的執行緒池（首次使用時建立）"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='crawler-hedge')
+            return self._executor
+
+    def run(self, func: Callable[[str], Any], url: str) -> Any:
+        """
+        執行可能被對沖的同步請求
+
+        Args:
+            func: 以 URL 為參數的請求函數，失敗時拋出例外
+            url: 請求 URL
+
+        Returns:
+            先成功完成的請求結果
+
+        Raises:
+            Exception: 所有請求都失敗時，拋出主要請求的例外
+        """
+        self._start_request()
+        delay = self.hedge_delay(url) if self.enabled else None
+        if delay is None:
+            return self._timed(func, url)
+
+        executor = self._get_executor()
+        primary = executor.submit(self._timed, func, url)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._allow_hedge():
+            return primary.result()
+
+        logger.debug(f"請求超過 {delay:.2f} 秒未完成，送出對沖請求 ({url})")
+        hedge = executor.submit(self._timed, func, url)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self._record_winner(future is hedge)
+                    # 另一個請求若尚未開始則取消，已開始者完成後結果直接捨棄
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+        return primary.result()
+
+    async def run_async(self, func: Callable[[str], Awaitable], url: str) -> Any:
+        """
+        執行可能被對沖的非同步請求（規則與 run 相同，落後的請求會被取消）
+
+        Args:
+            func: 以 URL 為參數、回傳協程的請求函數，失敗時拋出例外
+            url: 請求 URL
+
+        Returns:
+            先成功完成的請求結果
+        """
+        async def timed():
+            start = time.monotonic()
+            result = await func(url)
+            self.record_latency(url, time.monotonic() - start)
+            return result
+
+        self._start_request()
+        delay = self.hedge_delay(url) if self.enabled else None
+        if delay is None:
+            return await timed()
+
+        primary = asyncio.ensure_future(timed())
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self._allow_hedge():
+            return await primary
+
+        logger.debug(f"[async] 請求超過 {delay:.2f} 秒未完成，送出對沖請求 ({url})")
+        hedge = asyncio.ensure_future(timed())
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._record_winner(task is hedge)
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        取得對沖統計
+
+        Returns:
+            請求數、對沖數、略過數、勝出次數、對沖比例、對沖勝率與各主機的目前對沖門檻
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            hosts = list(self._latencies)
+        stats['hedge_rate'] = stats['hedged'] / stats['requests'] if stats['requests'] else 0.0
+        decided = stats['hedge_wins'] + stats['primary_wins']
+        stats['hedge_win_rate'] = stats['hedge_wins'] / decided if decided else 0.0
+        stats['thresholds'] = {host: self._threshold(host) for host in hosts}
+        return stats
+
+
+# 便利函數和全域變數
+_hedger_instance = None
+_hedger_lock = threading.Lock()
+
+
+def get_request_hedger() -> RequestHedger:
+    """取得行程內共用的請求對沖器（單例模式），設定讀取環境變數"""
+    global _hedger_instance
+    with _hedger_lock:
+        if _hedger_instance is None:
+            _hedger_instance = RequestHedger(
+                enabled=os.getenv('HEDGE_REQUESTS', '0').lower() in ('1', 'true', 'yes'),
+                max_rate=float(os.getenv('HEDGE_MAX_RATE', 0.1)),
+                percentile=float(os.getenv('HEDGE_PERCENTILE', 90)),
+                min_samples=int(os.getenv('HEDGE_MIN_SAMPLES', 20)),
+                max_workers=int(os.getenv('CRAWLER_MAX_WORKERS', 8)) * 2
+            )
+        return _hedger_instance
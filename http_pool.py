@@ -0,0 +1,223 @@
+"""
+HTTP 連線池模組
+提供行程內共用、支援 keep-alive 的 requests Session，
+限制每個主機的連線數，並自動解碼 gzip / brotli 回應；
+可選擇以每個主機的斷路器保護請求，並重試暫時性錯誤
+"""
+
+import os
+import threading
+import time
+import logging
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from circuit_breaker import OPEN, HostCircuitBreakers, RETRY_STATUSES, get_circuit_breakers
+from replay import install_transport
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+
+def _timeout_seconds(timeout) -> float:
+    """
+    取得 requests 逾時設定中最短的秒數
+
+    Args:
+        timeout: 秒數、(連線, 讀取) tuple 或 None
+
+    Returns:
+        最短的逾時秒數，未設定時為無限大
+    """
+    if isinstance(timeout, tuple):
+        values = [value for value in timeout if value is not None]
+        return min(values) if values else float('inf')
+    return timeout if timeout is not None else float('inf')
+
+
+class PooledSession(requests.Session):
+    """
+    共用連線池的 requests Session
+
+    功能：
+    - HTTP/HTTPS 共用 keep-alive 連線池
+    - 每個主機的連線數上限（超過時等待可用連線，而非建立臨時連線）
+    - Accept-Encoding 宣告 urllib3 可解碼的所有格式（安裝 brotli 時包含 br）
+    - 統計新建連線與重複使用連線的次數
+    - 提供斷路器時：主機斷開期間立即失敗，GET 的連線錯誤、逾時與 5xx 以退避重試
+      （已等滿逾時秒數的逾時不重試，避免慢速主機讓每個 URL 等待數倍逾時）
+    """
+
+    def __init__(self, per_host: int = 4, max_hosts: int = 16,
+                 breakers: Optional[HostCircuitBreakers] = None):
+        """
+        初始化連線池 Session
+
+        Args:
+            per_host: 每個主機保留的最大連線數
+            max_hosts: 快取的主機連線池數量
+            breakers: 每個主機的斷路器與重試策略，None 表示不使用
+        """
+        super().__init__()
+        self.per_host = per_host
+        self.max_hosts = max_hosts
+        self.breakers = breakers
+
+        adapter = HTTPAdapter(
+            pool_connections=max_hosts,
+            pool_maxsize=per_host,
+            pool_block=True
+        )
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+        self.headers.update({
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive'
+        })
+
+    def request(self, method, url, *args, deadline=None, **kwargs):
+        """
+        送出請求；設定斷路器時先檢查主機狀態，並依重試策略重試 GET 的暫時性錯誤
+
+        提供 deadline 時，timeout 視為時間充裕時的逾時：每次嘗試的逾時不超過剩餘時間，
+        剩餘時間不足以再等一次完整逾時加上退避時不再重試；
+        逾時因剩餘時間而縮短時發生的逾時不計入主機的斷路器失敗
+
+        Raises:
+            CircuitOpenError: 主機的斷路器斷開中
+            requests.RequestException: 重試後仍失敗
+        """
+        full_timeout = kwargs.get('timeout')
+        bounded = deadline is not None and isinstance(full_timeout, (int, float))
+        if self.breakers is None:
+            if bounded:
+                kwargs['timeout'] = deadline.timeout(full_timeout)
+            return super().request(method, url, *args, **kwargs)
+
+        breaker = self.breakers.for_url(url)
+        retry = self.breakers.retry
+        retryable = method.upper() in ('GET', 'HEAD')
+        attempt = 0
+        while True:
+            breaker.before_request()
+            limited = bounded and deadline.limits(full_timeout)
+            if bounded:
+                kwargs['timeout'] = deadline.timeout(full_timeout)
+            delay = retry.backoff(attempt)
+            last_attempt = not retryable or attempt + 1 >= retry.max_attempts
+            start = time.monotonic()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except requests.Timeout:
+                if limited:
+                    breaker.release_probe()
+                else:
+                    breaker.record_failure()
+                # 已等滿整個逾時的主機重試也只會再等一次
+                if (self._give_up(last_attempt, breaker, deadline, delay, full_timeout)
+                        or time.monotonic() - start >= _timeout_seconds(kwargs.get('timeout'))):
+                    raise
+            except requests.ConnectionError:
+                breaker.record_failure()
+                # 已是最後一次、斷路器因此斷開或剩餘時間不足時不再重試
+                if self._give_up(last_attempt, breaker, deadline, delay, full_timeout):
+                    raise
+            except Exception:
+                breaker.record_failure()
+                raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success(time.monotonic() - start)
+                    return response
+                breaker.record_failure()
+                if self._give_up(last_attempt, breaker, deadline, delay, full_timeout):
+                    return response
+                response.close()
+
+            logger.info(f"請求失敗，{delay:.2f} 秒後重試 ({url})")
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _give_up(last_attempt: bool, breaker, deadline, delay: float, timeout) -> bool:
+        """是否停止重試：已是最後一次、斷路器斷開，或剩餘時間不足以退避後再等一次逾時"""
+        if last_attempt or breaker.state == OPEN:
+            return True
+        return deadline is not None and not deadline.allows(delay + _timeout_seconds(timeout))
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        取得連線重複使用統計
+
+        Returns:
+            包含 requests（請求數）、connections（新建連線數）、reused（重用次數）與 hosts 的字典
+        """
+        stats = {'requests': 0, 'connections': 0, 'reused': 0, 'hosts': 0}
+        seen = set()
+        for adapter in self.adapters.values():
+            # 重播模式的介面卡沒有連線池
+            if id(adapter) in seen or not hasattr(adapter, 'poolmanager'):
+                continue
+            seen.add(id(adapter))
+
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats['hosts'] += 1
+                stats['requests'] += pool.num_requests
+                stats['connections'] += pool.num_connections
+
+        stats['reused'] = max(0, stats['requests'] - stats['connections'])
+        return stats
+
+
+# 便利函數和全域變數
+_session_instance = None
+_session_lock = threading.Lock()
+_line_session_instance = None
+_line_session_lock = threading.Lock()
+
+
+def get_http_session() -> PooledSession:
+    """
+    取得共用 HTTP Session（單例模式）
+
+    每個主機的連線上限由 CRAWLER_PER_HOST 環境變數決定，
+    請求受共用的斷路器與重試策略保護；設定 HTTP_REPLAY_MODE 時改為錄製或重播
+
+    Returns:
+        PooledSession 實例
+    """
+    global _session_instance
+    with _session_lock:
+        if _session_instance is None:
+            _session_instance = PooledSession(
+                per_host=int(os.getenv('CRAWLER_PER_HOST', 4)),
+                breakers=get_circuit_breakers()
+            )
+            install_transport(_session_instance)
+            logger.info(f"HTTP 連線池已建立 (每主機 {_session_instance.per_host} 條連線)")
+        return _session_instance
+
+
+def get_line_session() -> PooledSession:
+    """
+    取得 LINE API 專用的 HTTP Session（單例模式）
+
+    與爬蟲的連線池分開：不套用爬蟲的斷路器與重試策略，也不受 HTTP_REPLAY_MODE 影響
+
+    Returns:
+        PooledSession 實例
+    """
+    global _line_session_instance
+    with _line_session_lock:
+        if _line_session_instance is None:
+            _line_session_instance = PooledSession()
+            logger.info(f"LINE API 連線池已建立 (每主機 {_line_session_instance.per_host} 條連線)")
+        return _line_session_instance
@@ -0,0 +1,177 @@
+"""
+背景擷取模組
+定期輪詢 TechOrange RSS feed，依 GUID 找出新文章並預先擷取內文寫入本地語料，
+讓使用者查詢時可直接由語料回答
+
+可在應用程式內以背景執行緒啟動，或單獨執行：
+    python ingest.py
+"""
+
+import os
+import calendar
+import threading
+import logging
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+from crawler import TechOrangeCrawler
+from search_index import sync_index_from_store
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+
+def entry_guid(entry) -> str:
+    """
+    取得 feed 項目的 GUID（沒有 GUID 時退回使用連結）
+
+    Args:
+        entry: feedparser entry
+
+    Returns:
+        GUID 字串
+    """
+    return (entry.get('id') or entry.get('guid') or entry.get('link') or '').strip()
+
+
+def entry_timestamp(entry) -> Optional[float]:
+    """
+    取得 feed 項目的發布時間
+
+    Args:
+        entry: feedparser entry
+
+    Returns:
+        Unix timestamp，無法解析則返回 None
+    """
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    return float(calendar.timegm(parsed)) if parsed else None
+
+
+class FeedIngestor:
+    """
+    RSS feed 背景擷取器
+
+    功能：
+    - 依排程輪詢 feed（使用共用快照的條件式請求）
+    - 以 GUID 比對，只處理新出現的項目
+    - 並行擷取新文章內文（優先使用 RSS 內嵌全文）並寫入語料，同時更新倒排索引
+    """
+
+    def __init__(self, crawler: Optional[TechOrangeCrawler] = None, interval: Optional[float] = None):
+        """
+        初始化背景擷取器
+
+        Args:
+            crawler: 用於擷取的爬蟲實例，預設建立新實例
+            interval: 輪詢間隔秒數，預設讀取 INGEST_INTERVAL（預設 600）
+        """
+        self.crawler = crawler or TechOrangeCrawler()
+        self.interval = interval if interval is not None else float(os.getenv('INGEST_INTERVAL', 600))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'polls': 0, 'new_entries': 0, 'ingested': 0, 'failed': 0, 'errors': 0}
+
+    @property
+    def store(self):
+        """語料儲存（即爬蟲的文章儲存）"""
+        return self.crawler.store
+
+    def poll_once(self) -> int:
+        """
+        輪詢一次 feed 並擷取新文章
+
+        Returns:
+            本次成功寫入語料的文章數
+        """
+        if not self.store:
+            logger.warning("文章儲存未啟用，無法建立語料")
+            return 0
+
+        self._stats['polls'] += 1
+
+        # 讓快照過期，以條件式請求確認 feed 是否有更新
+        self.crawler.feed.invalidate()
+        entries = self.crawler._get_feed_entries()
+
+        by_guid: Dict[str, object] = {}
+        for entry in entries:
+            guid = entry_guid(entry)
+            if guid and entry.get('link') and entry.get('title'):
+                by_guid[guid] = entry
+
+        known = self.store.known_guids(by_guid.keys())
+        new_entries = [(guid, entry) for guid, entry in by_guid.items() if guid not in known]
+        self._stats['new_entries'] += len(new_entries)
+
+        if not new_entries:
+            logger.info("feed 沒有新文章")
+            return 0
+
+        logger.info(f"發現 {len(new_entries)} 篇新文章，開始擷取內文")
+
+        fetched = self.crawler.fetcher.fetch_ordered(
+            lambda item: self.crawler._fetch_entry_article(item[1]),
+            new_entries, len(new_entries),
+            url_of=lambda item: item[1].get('link', '').strip()
+        )
+
+        for (guid, entry), _ in fetched:
+            self.store.add_corpus_entry(
+                guid=guid,
+                url=entry.get('link', '').strip(),
+                title=entry.get('title', '').strip(),
+                summary=entry.get('summary'),
+                categories=[tag.get('term') for tag in entry.get('tags', []) if tag.get('term')],
+                published_ts=entry_timestamp(entry)
+            )
+
+        # 擷取失敗的項目不寫入語料，下次輪詢會重試
+        self._stats['ingested'] += len(fetched)
+        self._stats['failed'] += len(new_entries) - len(fetched)
+        logger.info(f"語料新增 {len(fetched)} 篇文章")
+
+        # 立即更新本行程的索引，讓下一次查詢不必再同步
+        sync_index_from_store(self.crawler.index, self.store)
+        return len(fetched)
+
+    def run_forever(self):
+        """持續輪詢直到 stop() 被呼叫"""
+        logger.info(f"背景擷取啟動，間隔 {self.interval} 秒")
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                self._stats['errors'] += 1
+                logger.error(f"背景擷取失敗: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """在 daemon 執行緒啟動背景輪詢"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name='feed-ingestor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止背景輪詢"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        取得擷取統計
+
+        Returns:
+            輪詢次數、新項目、成功與失敗筆數
+        """
+        return dict(self._stats)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    FeedIngestor().run_forever()
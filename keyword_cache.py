@@ -0,0 +1,203 @@
+"""
+模糊關鍵字快取模組
+快取 Gemini 生成的關鍵字擴展結果（標準化關鍵字 -> 擴展詞列表），
+記憶體與 SQLite 兩層，具 TTL，可由多個 gunicorn worker 共用
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+import logging
+from typing import Dict, List, Optional
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+# 預設資料庫位置
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'keywords.db')
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    標準化關鍵字（NFKC、小寫、合併空白）
+
+    Args:
+        keyword: 原始關鍵字
+
+    Returns:
+        標準化後的關鍵字
+    """
+    return ' '.join(unicodedata.normalize('NFKC', keyword).lower().split())
+
+
+class KeywordExpansionCache:
+    """
+    關鍵字擴展快取
+
+    功能：
+    - 記憶體快取，未命中時讀取 SQLite（WAL 模式，跨行程共用）
+    - 依 TTL 判斷過期
+    - 統計命中率與節省的 Gemini 呼叫次數
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, ttl: float = 86400):
+        """
+        初始化關鍵字快取
+
+        Args:
+            path: SQLite 資料庫路徑，None 或空字串表示只使用記憶體
+            ttl: 擴展結果有效秒數
+        """
+        self.path = path or None
+        self.ttl = ttl
+        self._memory: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'gemini_calls': 0,
+        }
+
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._connect()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS keyword_expansions (
+                    keyword TEXT PRIMARY KEY,
+                    expansions TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        """取得目前執行緒的資料庫連線"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, keyword: str) -> Optional[List[str]]:
+        """
+        讀取關鍵字的擴展結果
+
+        Args:
+            keyword: 原始關鍵字（會先標準化）
+
+        Returns:
+            擴展詞列表，未命中或過期則返回 None
+        """
+        key = normalize_keyword(keyword)
+        now = time.time()
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and now - cached[1] < self.ttl:
+                self._stats['memory_hits'] += 1
+                return list(cached[0])
+
+        if self.path:
+            try:
+                row = self._connect().execute(
+                    'SELECT expansions, created_at FROM keyword_expansions WHERE keyword = ?', (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"讀取關鍵字快取失敗: {str(e)}")
+                row = None
+
+            if row and now - row[1] < self.ttl:
+                expansions = json.loads(row[0])
+                with self._lock:
+                    self._memory[key] = (expansions, row[1])
+                    self._stats['disk_hits'] += 1
+                return list(expansions)
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def put(self, keyword: str, expansions: List[str]):
+        """
+        寫入關鍵字的擴展結果
+
+        Args:
+            keyword: 原始關鍵字（會先標準化）
+            expansions: 擴展詞列表
+        """
+        key = normalize_keyword(keyword)
+        now = time.time()
+
+        with self._lock:
+            self._memory[key] = (list(expansions), now)
+            self._stats['writes'] += 1
+
+        if self.path:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    'INSERT OR REPLACE INTO keyword_expansions (keyword, expansions, created_at) VALUES (?, ?, ?)',
+                    (key, json.dumps(expansions, ensure_ascii=False), now)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"寫入關鍵字快取失敗: {str(e)}")
+
+    def record_gemini_call(self):
+        """記錄一次實際發出的 Gemini 呼叫"""
+        with self._lock:
+            self._stats['gemini_calls'] += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        取得快取統計
+
+        Returns:
+            命中、未命中次數、命中率、實際 Gemini 呼叫與節省的呼叫次數
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+        stats['hits'] = hits
+        stats['hit_rate'] = hits / lookups if lookups else 0.0
+        stats['gemini_calls_saved'] = hits
+        return stats
+
+
+# 便利函數和全域變數
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_keyword_cache() -> KeywordExpansionCache:
+    """
+    取得共用關鍵字快取（單例模式）
+
+    路徑由 KEYWORD_CACHE_PATH 環境變數決定（空字串表示只使用記憶體），
+    有效秒數由 KEYWORD_CACHE_TTL 決定
+
+    Returns:
+        KeywordExpansionCache 實例
+    """
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            path = os.getenv('KEYWORD_CACHE_PATH', DEFAULT_CACHE_PATH)
+            ttl = float(os.getenv('KEYWORD_CACHE_TTL', 86400))
+            try:
+                _cache_instance = KeywordExpansionCache(path, ttl)
+            except Exception as e:
+                logger.warning(f"關鍵字快取磁碟初始化失敗，改用記憶體快取: {str(e)}")
+                _cache_instance = KeywordExpansionCache(None, ttl)
+        return _cache_instance
@@ -0,0 +1,83 @@
+"""
+多關鍵字比對模組
+以 Aho-Corasick 自動機一次掃描文字即找出所有關鍵字的出現位置，
+取代對每個關鍵字分別進行子字串搜尋
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+class AhoCorasickMatcher:
+    """
+    Aho-Corasick 多模式比對器
+
+    每次查詢建立一次，之後對每段文字只需掃描一次。
+    模式以其在輸入列表中的索引識別（重複的模式各自保留索引）。
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        建立自動機
+
+        Args:
+            patterns: 要比對的關鍵字（比對前會轉為小寫）
+        """
+        self.patterns: List[str] = [str(pattern).lower() for pattern in patterns]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        # 空字串在任何文字中都成立（與 `'' in text` 相同）
+        self._empty = [i for i, pattern in enumerate(self.patterns) if not pattern]
+
+        for index, pattern in enumerate(self.patterns):
+            if pattern:
+                self._insert(pattern, index)
+        self._build_failure_links()
+
+    def _insert(self, pattern: str, index: int):
+        """將模式加入 trie"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(index)
+
+    def _build_failure_links(self):
+        """以廣度優先建立失敗連結，並合併後綴狀態的輸出"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state].extend(self._output[self._fail[next_state]])
+
+    def search(self, text: str) -> Dict[int, List[int]]:
+        """
+        找出文字中所有關鍵字的出現位置
+
+        Args:
+            text: 要掃描的文字（應已轉為小寫）
+
+        Returns:
+            {模式索引 -> 出現的起始位置列表}，只包含有命中的模式
+        """
+        hits: Dict[int, List[int]] = {index: [0] for index in self._empty}
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._output[state]:
+                hits.setdefault(index, []).append(position - len(self.patterns[index]) + 1)
+        return hits
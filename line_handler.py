@@ -6,6 +6,7 @@ LINE Messaging API 處理模組
 import os
 from linebot import LineBotApi, WebhookHandler
 from linebot.exceptions import InvalidSignatureError, LineBotApiError
+from linebot.http_client import RequestsHttpClient, RequestsHttpResponse
 from linebot.models import (
     MessageEvent, TextMessage, TextSendMessage,
     CarouselTemplate, CarouselColumn, TemplateSendMessage,
@@ -14,10 +15,42 @@ from linebot.models import (
 from typing import List, Dict, Optional
 import logging
 
+from rate_limit import get_rate_limiter
+from deadline import Deadline
+from http_pool import get_line_session
+
 # 設置日誌
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 有請求期限時單則推送的逾時秒數，以及預估每則推送需要的秒數
+PUSH_TIMEOUT = 10
+PUSH_MIN_SECONDS = 1.5
+
+class PooledHttpClient(RequestsHttpClient):
+    """
+    經由 LINE 專用連線池送出 LINE API 請求的用戶端
+    （SDK 預設每次請求都建立新連線，改用共用 Session 才能重複使用預熱的 keep-alive 連線）
+    """
+
+    def get(self, url, headers=None, params=None, stream=False, timeout=None):
+        response = get_line_session().get(
+            url, headers=headers, params=params, stream=stream, timeout=timeout or self.timeout
+        )
+        return RequestsHttpResponse(response)
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        response = get_line_session().post(url, headers=headers, data=data, timeout=timeout or self.timeout)
+        return RequestsHttpResponse(response)
+
+    def delete(self, url, headers=None, data=None, timeout=None):
+        response = get_line_session().delete(url, headers=headers, data=data, timeout=timeout or self.timeout)
+        return RequestsHttpResponse(response)
+
+    def put(self, url, headers=None, data=None, timeout=None):
+        response = get_line_session().put(url, headers=headers, data=data, timeout=timeout or self.timeout)
+        return RequestsHttpResponse(response)
+
 class LINENewsBot:
     def __init__(self, channel_access_token: Optional[str] = None, 
                  channel_secret: Optional[str] = None):
@@ -34,10 +67,13 @@ class LINENewsBot:
         if not self.channel_access_token or not self.channel_secret:
             raise ValueError("LINE Channel Access Token 和 Channel Secret 未設置！")
         
-        # 初始化 LINE Bot API
-        self.line_bot_api = LineBotApi(self.channel_access_token)
+        # 初始化 LINE Bot API（使用 LINE 專用連線池，推送時可直接使用預熱的連線）
+        self.line_bot_api = LineBotApi(self.channel_access_token, http_client=PooledHttpClient)
         self.handler = WebhookHandler(self.channel_secret)
         
+        # 共用的速率限制器（LINE push）
+        self.rate_limiter = get_rate_limiter()
+        
         # 註冊訊息處理器
         self._register_handlers()
 
@@ -130,7 +166,38 @@ class LINENewsBot:
         except LineBotApiError as e:
             logger.error(f"回傳隨機推送處理中訊息失敗: {str(e)}")
 
-    def send_article_results(self, user_id: str, articles: List[Dict], keyword: str):
+    def _push_message(self, user_id: str, message, deadline: Optional[Deadline] = None):
+        """
+        推送訊息給用戶，超出 LINE push 速率額度時才等待
+        
+        Args:
+            user_id: LINE 用戶 ID
+            message: LINE 訊息物件
+            deadline: 請求期限，依剩餘時間設定推送逾時
+        """
+        self.rate_limiter.acquire('line_push')
+        if deadline is not None:
+            self.line_bot_api.push_message(user_id, message, timeout=deadline.timeout(PUSH_TIMEOUT))
+        else:
+            self.line_bot_api.push_message(user_id, message)
+
+    @staticmethod
+    def _should_combine(deadline: Optional[Deadline], remaining: int) -> bool:
+        """
+        剩餘時間是否不足以逐篇推送其餘文章
+        
+        Args:
+            deadline: 請求期限
+            remaining: 尚未推送的文章數
+            
+        Returns:
+            需要將其餘文章合併為一則訊息時為 True
+        """
+        return (deadline is not None and remaining > 1
+                and not deadline.allows(PUSH_MIN_SECONDS * remaining))
+
+    def send_article_results(self, user_id: str, articles: List[Dict], keyword: str,
+                             deadline: Optional[Deadline] = None):
         """
         發送文章搜尋結果給用戶
         
@@ -138,6 +205,7 @@ class LINENewsBot:
             user_id: LINE 用戶 ID
             articles: 包含摘要的文章列表
             keyword: 搜尋關鍵字
+            deadline: 請求期限，剩餘時間不足時其餘文章合併為一則訊息
         """
         try:
             if not articles:
@@ -151,18 +219,22 @@ class LINENewsBot:
             summary_message = TextSendMessage(
                 text=f"📰 找到 {len(articles)} 篇與「{keyword}」相關的 TechOrange 文章："
             )
-            self.line_bot_api.push_message(user_id, summary_message)
+            self._push_message(user_id, summary_message, deadline)
             
             # 分別發送每篇文章，避免內容被截斷
             for i, article in enumerate(articles, 1):
+                # 剩餘時間不足以逐篇推送時，其餘文章合併為一則文字訊息
+                if self._should_combine(deadline, len(articles) - i + 1):
+                    deadline.degrade(f"其餘 {len(articles) - i + 1} 篇文章合併為一則訊息推送")
+                    remaining_message = self._create_text_message(
+                        articles[i - 1:], keyword, header=f"📰 其餘與「{keyword}」相關的文章：\n\n"
+                    )
+                    self._push_message(user_id, remaining_message, deadline)
+                    break
+                
                 try:
                     article_message = self._create_single_article_message(article, i)
-                    self.line_bot_api.push_message(user_id, article_message)
-                    
-                    # 在多篇文章間稍作延遲，避免發送過快
-                    if i < len(articles):
-                        import time
-                        time.sleep(0.5)
+                    self._push_message(user_id, article_message, deadline)
                         
                 except Exception as e:
                     logger.error(f"發送第 {i} 篇文章失敗: {str(e)}")
@@ -179,13 +251,15 @@ class LINENewsBot:
             except LineBotApiError:
                 pass
 
-    def send_random_results(self, user_id: str, articles: List[Dict]):
+    def send_random_results(self, user_id: str, articles: List[Dict],
+                            deadline: Optional[Deadline] = None):
         """
         發送隨機推送文章結果給用戶
         
         Args:
             user_id: LINE 用戶 ID
             articles: 包含摘要的文章列表
+            deadline: 請求期限，剩餘時間不足時其餘文章合併為一則訊息
         """
         try:
             if not articles:
@@ -199,18 +273,22 @@ class LINENewsBot:
             summary_message = TextSendMessage(
                 text=f"🎯 為您推薦 {len(articles)} 篇最新的 TechOrange 文章："
             )
-            self.line_bot_api.push_message(user_id, summary_message)
+            self._push_message(user_id, summary_message, deadline)
             
             # 分別發送每篇文章，避免內容被截斷
             for i, article in enumerate(articles, 1):
+                # 剩餘時間不足以逐篇推送時，其餘文章合併為一則文字訊息
+                if self._should_combine(deadline, len(articles) - i + 1):
+                    deadline.degrade(f"其餘 {len(articles) - i + 1} 篇推薦文章合併為一則訊息推送")
+                    remaining_message = self._create_text_message(
+                        articles[i - 1:], '', header="🎯 其餘推薦文章：\n\n"
+                    )
+                    self._push_message(user_id, remaining_message, deadline)
+                    break
+                
                 try:
                     article_message = self._create_single_article_message(article, i)
-                    self.line_bot_api.push_message(user_id, article_message)
-                    
-                    # 在多篇文章間稍作延遲，避免發送過快
-                    if i < len(articles):
-                        import time
-                        time.sleep(0.5)
+                    self._push_message(user_id, article_message, deadline)
                         
                 except Exception as e:
                     logger.error(f"發送第 {i} 篇推薦文章失敗: {str(e)}")
@@ -272,18 +350,19 @@ class LINENewsBot:
             template=carousel_template
         )
 
-    def _create_text_message(self, articles: List[Dict], keyword: str):
+    def _create_text_message(self, articles: List[Dict], keyword: str, header: Optional[str] = None):
         """
         創建文字格式訊息
         
         Args:
             articles: 文章列表
             keyword: 搜尋關鍵字
+            header: 訊息開頭，預設為搜尋結果標題
             
         Returns:
             TextSendMessage 物件
         """
-        message_text = f"📰 找到 {len(articles)} 篇與「{keyword}」相關的 TechOrange 文章：\n\n"
+        message_text = header or f"📰 找到 {len(articles)} 篇與「{keyword}」相關的 TechOrange 文章：\n\n"
         
         for i, article in enumerate(articles, 1):
             title = article.get('title', '無標題')
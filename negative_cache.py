@@ -0,0 +1,187 @@
+"""
+失敗 URL 快取模組
+記住擷取失敗或無法取得內文的文章 URL（負向快取），
+依失敗類型設定不同的有效時間，期間內的查詢直接略過該 URL
+
+有效時間由 NEGATIVE_CACHE_TTLS 環境變數覆寫，格式為「類型=秒數」並以逗號分隔，
+例如 NEGATIVE_CACHE_TTLS=timeout=60,not_found=604800；
+單獨一個數字則套用到所有類型，0 表示停用
+"""
+
+import os
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from article_store import canonicalize_url
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+# 各失敗類型的預設有效秒數：暫時性錯誤短、永久性錯誤長
+DEFAULT_TTLS = {
+    'timeout': 300,            # 連線或讀取逾時
+    'connection': 300,         # DNS、連線被拒等網路錯誤
+    'throttled': 120,          # 429 Too Many Requests
+    'server_error': 600,       # 5xx
+    'client_error': 6 * 3600,  # 其他 4xx（例如 403 付費牆）
+    'not_found': 86400,        # 404、410
+    'too_short': 86400,        # 頁面可取得但內文不足
+}
+
+# 最多記住的 URL 數量
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def failure_class_for_status(status: int) -> str:
+    """
+    依 HTTP 狀態碼判斷失敗類型
+
+    Args:
+        status: HTTP 狀態碼
+
+    Returns:
+        失敗類型名稱
+    """
+    if status in (404, 410):
+        return 'not_found'
+    if status == 429:
+        return 'throttled'
+    if status >= 500:
+        return 'server_error'
+    return 'client_error'
+
+
+def parse_ttls(value: str) -> Dict[str, float]:
+    """
+    解析 NEGATIVE_CACHE_TTLS 設定
+
+    Args:
+        value: 「類型=秒數」以逗號分隔，或套用到所有類型的單一秒數
+
+    Returns:
+        {失敗類型 -> 有效秒數}
+    """
+    ttls = dict(DEFAULT_TTLS)
+    for item in value.split(','):
+        name, separator, seconds = item.strip().rpartition('=')
+        if not seconds:
+            continue
+        if not separator:
+            ttls = {key: float(seconds) for key in ttls}
+        elif name in ttls:
+            ttls[name] = float(seconds)
+        else:
+            logger.warning(f"未知的失敗類型: {name}")
+    return ttls
+
+
+class NegativeCache:
+    """
+    失敗 URL 快取
+
+    功能：
+    - 以標準化 URL 為鍵記錄失敗類型與到期時間
+    - 依失敗類型套用不同 TTL（TTL 為 0 的類型不記錄）
+    - 統計各類型的失敗次數與因快取而略過的擷取次數
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        初始化失敗 URL 快取
+
+        Args:
+            ttls: {失敗類型 -> 有效秒數}，預設使用 DEFAULT_TTLS
+            max_entries: 最多記住的 URL 數量，超過時移除最早記錄的項目
+        """
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._failures = {name: 0 for name in self.ttls}
+        self._skipped = {name: 0 for name in self.ttls}
+
+    def check(self, url: str) -> Optional[str]:
+        """
+        查詢 URL 是否在有效期間內失敗過
+
+        Args:
+            url: 文章 URL
+
+        Returns:
+            失敗類型，未記錄或已過期則返回 None
+        """
+        key = canonicalize_url(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            failure_class, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._skipped[failure_class] += 1
+            return failure_class
+
+    def record(self, url: str, failure_class: str):
+        """
+        記錄一次擷取失敗
+
+        Args:
+            url: 文章 URL
+            failure_class: 失敗類型（DEFAULT_TTLS 的鍵）
+        """
+        ttl = self.ttls.get(failure_class, 0)
+        key = canonicalize_url(url)
+        with self._lock:
+            self._failures[failure_class] = self._failures.get(failure_class, 0) + 1
+            if ttl <= 0:
+                return
+            self._entries.pop(key, None)
+            self._entries[key] = (failure_class, time.time() + ttl)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        """
+        取得統計
+
+        Returns:
+            目前記錄的 URL 數、各失敗類型的失敗次數與略過次數
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'failures': dict(self._failures),
+                'skipped': dict(self._skipped),
+                'skipped_total': sum(self._skipped.values()),
+            }
+
+
+# 便利函數和全域變數
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_negative_cache() -> NegativeCache:
+    """
+    取得行程內共用的失敗 URL 快取（單例模式）
+
+    各失敗類型的有效秒數可由 NEGATIVE_CACHE_TTLS 環境變數覆寫
+
+    Returns:
+        NegativeCache 實例
+    """
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is None:
+            value = os.getenv('NEGATIVE_CACHE_TTLS', '')
+            try:
+                ttls = parse_ttls(value)
+            except ValueError:
+                logger.warning(f"NEGATIVE_CACHE_TTLS 格式錯誤: {value}，使用預設值")
+                ttls = dict(DEFAULT_TTLS)
+            _cache_instance = NegativeCache(ttls)
+        return _cache_instance
@@ -0,0 +1,162 @@
+"""
+BM25 排名模組
+以 BM25F（標題與內文欄位加權）為倒排索引中的候選文章計分，
+並依發布時間套用新近度衰減；計分以 NumPy 對候選 posting list 向量化運算
+"""
+
+import math
+import os
+import time
+import logging
+from operator import methodcaller
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+from search_index import InvertedIndex, tokenize
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# 倒數排名融合的平滑常數（Cormack 等人建議值）
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(ranked_lists: Sequence[Sequence[T]], key: Callable[[T], Hashable],
+                           k: int = RRF_K) -> List[T]:
+    """
+    以倒數排名融合 (RRF) 合併多個排名列表
+
+    每個項目的分數為其在各列表中 1 / (k + 名次) 的總和，
+    同鍵的項目只保留第一次出現的版本；同分時名次較前、列表較前者優先
+
+    Args:
+        ranked_lists: 各自依相關性排序的列表（列表順序代表優先順序）
+        key: 取得項目去重鍵的函數（例如標準化 URL）
+        k: 平滑常數，越大則各列表名次的影響越平均
+
+    Returns:
+        融合後依分數由高到低排列的項目
+    """
+    scores: Dict[Hashable, float] = {}
+    items: Dict[Hashable, T] = {}
+    first_seen: Dict[Hashable, Tuple[int, int]] = {}
+
+    for list_index, ranked in enumerate(ranked_lists):
+        for rank, item in enumerate(ranked, 1):
+            item_key = key(item)
+            scores[item_key] = scores.get(item_key, 0.0) + 1.0 / (k + rank)
+            if item_key not in items:
+                items[item_key] = item
+                first_seen[item_key] = (rank, list_index)
+
+    order = sorted(scores, key=lambda item_key: (-scores[item_key], first_seen[item_key]))
+    return [items[item_key] for item_key in order]
+
+
+class BM25Ranker:
+    """
+    BM25F 排名器
+
+    功能：
+    - 標題、內文欄位各自長度正規化並加權
+    - 查詢詞可設定權重（模糊關鍵字降低權重）
+    - 依發布時間的指數衰減調整分數
+    """
+
+    def __init__(self, index: InvertedIndex, k1: float = 1.2,
+                 field_weights: Optional[Dict[str, float]] = None,
+                 field_b: Optional[Dict[str, float]] = None,
+                 half_life_days: Optional[float] = None, recency_weight: float = 0.3):
+        """
+        初始化排名器
+
+        Args:
+            index: 倒排索引
+            k1: 詞頻飽和參數
+            field_weights: 各欄位權重，預設標題 3、內文 1
+            field_b: 各欄位長度正規化參數，預設標題 0.5、內文 0.75
+            half_life_days: 新近度半衰期（天），預設讀取 RANKING_HALF_LIFE_DAYS（預設 30）
+            recency_weight: 新近度對最終分數的影響比例 (0-1)
+        """
+        self.index = index
+        self.k1 = k1
+        self.field_weights = field_weights or {'title': 3.0, 'body': 1.0}
+        self.field_b = field_b or {'title': 0.5, 'body': 0.75}
+        self.half_life_days = half_life_days or float(os.getenv('RANKING_HALF_LIFE_DAYS', 30))
+        self.recency_weight = recency_weight
+
+    def _idf(self, token: str, total_docs: int) -> float:
+        """BM25 idf（加 1 避免負值）"""
+        df = self.index.document_frequency(token)
+        return math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+
+    def rank(self, terms: Sequence[str], weights: Optional[Sequence[float]] = None,
+             limit: int = 10, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        對符合查詢詞的文章排名
+
+        Args:
+            terms: 查詢詞列表（第一個通常是原始關鍵字）
+            weights: 各查詢詞權重，預設皆為 1
+            limit: 最多回傳筆數
+            now: 計算新近度的基準時間，預設為目前時間
+
+        Returns:
+            List of (doc_id, score)，依分數由高到低
+        """
+        terms = list(terms)
+        weights = list(weights) if weights is not None else [1.0] * len(terms)
+        now = now if now is not None else time.time()
+
+        with self.index._lock:
+            doc_ids = sorted(self.index.candidates(terms))
+            if not doc_ids:
+                return []
+
+            # 合併查詢詞的索引詞權重（同一索引詞取最大權重）
+            token_weights: Dict[str, float] = {}
+            for term, weight in zip(terms, weights):
+                for token in set(tokenize(term)):
+                    token_weights[token] = max(token_weights.get(token, 0.0), weight)
+            tokens = list(token_weights)
+
+            total_docs = len(self.index)
+            docs = [self.index.get(doc_id) for doc_id in doc_ids]
+            position = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+
+            # 只收集候選文章的 posting（posting list 與候選集合取交集，走訪兩者中較小的一方）
+            rows, columns, entries = [], [], []
+            for row, token in enumerate(tokens):
+                postings = self.index.postings(token)
+                matched = list(postings.keys() & position.keys())
+                rows.append(np.full(len(matched), row, dtype=np.intp))
+                columns.append(np.fromiter(map(position.__getitem__, matched), dtype=np.intp, count=len(matched)))
+                entries.extend(map(postings.__getitem__, matched))
+            rows = np.concatenate(rows)
+            columns = np.concatenate(columns)
+
+            # 欄位長度正規化後加權的詞頻矩陣：tokens × candidates（以 NumPy 索引一次寫入稀疏項目）
+            weighted_tf = np.zeros((len(tokens), len(doc_ids)))
+            for field, field_weight in self.field_weights.items():
+                avg_length = self.index.average_length(field) or 1.0
+                lengths = np.array([doc['lengths'][field] for doc in docs], dtype=float)
+                norm = 1 - self.field_b[field] + self.field_b[field] * lengths / avg_length
+
+                counts = np.fromiter(map(methodcaller('get', field, 0), entries), dtype=float, count=len(entries))
+                weighted_tf[rows, columns] += field_weight * counts / norm[columns]
+
+            idf = np.array([self._idf(token, total_docs) * token_weights[token] for token in tokens])
+            saturated = weighted_tf * (self.k1 + 1) / (weighted_tf + self.k1)
+            scores = idf @ saturated
+
+            # 新近度衰減：未知發布時間視為非常舊
+            published = np.array([doc.get('published_ts') or -np.inf for doc in docs], dtype=float)
+            age_days = np.maximum(0.0, (now - published) / 86400)
+            decay = np.exp2(-age_days / self.half_life_days)
+            scores = scores * (1 - self.recency_weight + self.recency_weight * decay)
+
+        order = np.argsort(-scores, kind='stable')[:limit]
+        return [(doc_ids[i], float(scores[i])) for i in order if scores[i] > 0]
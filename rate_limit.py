@@ -0,0 +1,216 @@
+"""
+速率限制模組
+以 token bucket 為每個主機或 API（buzzorange.com、LINE push、Gemini）限制請求速率，
+只有在超出額度時才需要等待，並統計等待時間分布
+
+速率由環境變數設定，格式為「每秒請求數[:突發量]」，例如：
+    RATE_LIMIT_BUZZORANGE=1:3
+    RATE_LIMIT_LINE_PUSH=2:5
+    RATE_LIMIT_GEMINI=0.5:5
+未設定的鍵不限制速率
+"""
+
+import os
+import bisect
+import threading
+import time
+import logging
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+# 內建的鍵與預設速率（每秒請求數, 突發量）
+DEFAULT_LIMITS = {
+    'buzzorange.com': ('RATE_LIMIT_BUZZORANGE', 1.0, 3),
+    'line_push': ('RATE_LIMIT_LINE_PUSH', 2.0, 5),
+    'gemini': ('RATE_LIMIT_GEMINI', 0.5, 5),
+}
+
+# 等待時間分布的上界（秒）
+WAIT_BUCKETS = (0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+
+def parse_rate(value: str) -> Tuple[float, int]:
+    """
+    解析「每秒請求數[:突發量]」格式的設定
+
+    Args:
+        value: 設定字串
+
+    Returns:
+        (每秒請求數, 突發量)，突發量預設為 1
+    """
+    rate, _, burst = value.partition(':')
+    return float(rate), int(burst) if burst else 1
+
+
+class TokenBucket:
+    """
+    執行緒安全的 token bucket
+
+    呼叫者先預約 token，再於鎖外等待，因此多個執行緒會依預約順序排隊，
+    額度足夠時不需等待
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        初始化 token bucket
+
+        Args:
+            rate: 每秒補充的 token 數
+            burst: 桶的容量（可連續發出的請求數）
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._histogram = [0] * (len(WAIT_BUCKETS) + 1)
+        self._stats = {'acquired': 0, 'waited': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        預約 token（不等待）
+
+        Args:
+            tokens: 需要的 token 數
+
+        Returns:
+            呼叫者在送出請求前需要等待的秒數
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+            self._stats['acquired'] += 1
+            self._histogram[bisect.bisect_left(WAIT_BUCKETS, wait)] += 1
+            if wait > 0:
+                self._stats['waited'] += 1
+                self._stats['total_wait'] += wait
+                self._stats['max_wait'] = max(self._stats['max_wait'], wait)
+            return wait
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        取得 token，超出額度時等待
+
+        Args:
+            tokens: 需要的 token 數
+
+        Returns:
+            實際等待的秒數
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict:
+        """
+        取得統計
+
+        Returns:
+            速率設定、取得次數、等待次數、等待時間與等待時間分布
+        """
+        with self._lock:
+            stats = dict(self._stats, rate=self.rate, burst=self.burst)
+            labels = [f"<={bound:g}s" for bound in WAIT_BUCKETS] + [f">{WAIT_BUCKETS[-1]:g}s"]
+            stats['wait_histogram'] = dict(zip(labels, self._histogram))
+        return stats
+
+
+class RateLimiter:
+    """
+    以鍵（主機名稱或 API 名稱）管理多個 token bucket
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None):
+        """
+        初始化速率限制器
+
+        Args:
+            limits: {鍵 -> (每秒請求數, 突發量)}，預設讀取環境變數
+        """
+        if limits is None:
+            limits = {}
+            for key, (env_name, rate, burst) in DEFAULT_LIMITS.items():
+                value = os.getenv(env_name)
+                try:
+                    limits[key] = parse_rate(value) if value else (rate, burst)
+                except ValueError:
+                    logger.warning(f"{env_name} 格式錯誤: {value}，使用預設值")
+                    limits[key] = (rate, burst)
+
+        # 速率為 0 或負數表示不限制
+        self._buckets = {
+            key: TokenBucket(rate, burst) for key, (rate, burst) in limits.items() if rate > 0
+        }
+
+    @staticmethod
+    def key_for_url(url: str) -> str:
+        """
+        取得 URL 對應的鍵（去除 www. 的主機名稱）
+
+        Args:
+            url: 請求 URL
+
+        Returns:
+            主機名稱
+        """
+        host = (urlparse(url).hostname or '').lower()
+        return host[4:] if host.startswith('www.') else host
+
+    def reserve(self, key: str) -> float:
+        """
+        預約一次請求（不等待），供非同步呼叫者自行等待
+
+        Args:
+            key: 主機名稱或 API 名稱
+
+        Returns:
+            需要等待的秒數，未設定限制的鍵為 0
+        """
+        bucket = self._buckets.get(key)
+        return bucket.reserve() if bucket else 0.0
+
+    def acquire(self, key: str) -> float:
+        """
+        取得一次請求的額度，超出時等待
+
+        Args:
+            key: 主機名稱或 API 名稱
+
+        Returns:
+            實際等待的秒數
+        """
+        bucket = self._buckets.get(key)
+        return bucket.acquire() if bucket else 0.0
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        取得所有鍵的統計
+
+        Returns:
+            {鍵 -> 統計}
+        """
+        return {key: bucket.get_stats() for key, bucket in self._buckets.items()}
+
+
+# 便利函數和全域變數
+_limiter_instance = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """取得行程內共用的速率限制器（單例模式）"""
+    global _limiter_instance
+    with _limiter_lock:
+        if _limiter_instance is None:
+            _limiter_instance = RateLimiter()
+        return _limiter_instance
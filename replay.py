@@ -0,0 +1,285 @@
+"""
+HTTP 錄製／重播模組
+以 requests 傳輸介面卡（transport adapter）錄製爬蟲的 feed、搜尋與文章回應
+（狀態碼、標頭、內容與耗時）到封存目錄，或從封存目錄重播，
+讓爬蟲的行為與效能可以在離線環境重現量測
+
+封存目錄格式：
+    index.json         {"METHOD URL": {status, reason, headers, body, elapsed}}
+    bodies/<sha1>.bin  解碼後的回應內容（相同內容只存一份）
+
+設定由環境變數決定（套用到共用 HTTP Session）：
+    HTTP_REPLAY_MODE     record 或 replay（預設不啟用）
+    HTTP_REPLAY_ARCHIVE  封存目錄（預設 data/http_archive）
+    HTTP_REPLAY_LATENCY  重播時套用的錄製延遲倍數（預設 0，不等待；1 表示依錄製耗時等待）
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+import logging
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+# 內容以解碼後的形式保存，重播時不保留這些描述傳輸方式的標頭
+SKIPPED_HEADERS = frozenset({
+    'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive',
+    'set-cookie', 'date'
+})
+
+DEFAULT_ARCHIVE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'http_archive')
+
+
+def request_key(method: str, url: str) -> str:
+    """
+    建立請求在封存中的鍵（查詢參數排序，忽略片段）
+
+    Args:
+        method: HTTP 方法
+        url: 請求 URL
+
+    Returns:
+        "METHOD URL" 格式的鍵
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {urlunsplit((parts.scheme, parts.netloc.lower(), parts.path or '/', query, ''))}"
+
+
+class HttpArchive:
+    """
+    HTTP 回應封存目錄
+
+    功能：
+    - 依請求鍵保存最新一次的回應（狀態碼、標頭、耗時）
+    - 回應內容依 SHA-1 分檔保存，相同內容只存一份
+    - index.json 以排序後的格式寫入，方便檢視差異
+    """
+
+    def __init__(self, path: str):
+        """
+        初始化封存目錄（存在時讀取既有的索引）
+
+        Args:
+            path: 封存目錄路徑
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        index_path = os.path.join(path, 'index.json')
+        if os.path.exists(index_path):
+            with open(index_path, encoding='utf-8') as f:
+                self._entries = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def add(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes,
+            elapsed: float = 0.0, reason: str = ''):
+        """
+        保存一筆回應並寫入索引
+
+        Args:
+            method: HTTP 方法
+            url: 請求 URL
+            status: 狀態碼
+            headers: 回應標頭
+            body: 解碼後的回應內容
+            elapsed: 取得完整回應的耗時（秒）
+            reason: 狀態說明
+        """
+        name = hashlib.sha1(body).hexdigest() + '.bin'
+        bodies = os.path.join(self.path, 'bodies')
+        os.makedirs(bodies, exist_ok=True)
+        body_path = os.path.join(bodies, name)
+        if not os.path.exists(body_path):
+            with open(body_path, 'wb') as f:
+                f.write(body)
+
+        entry = {
+            'status': status,
+            'reason': reason,
+            'headers': {key: value for key, value in sorted(headers.items())
+                        if key.lower() not in SKIPPED_HEADERS},
+            'body': name,
+            'elapsed': round(elapsed, 4),
+        }
+        with self._lock:
+            self._entries[request_key(method, url)] = entry
+            self._save()
+
+    def get(self, method: str, url: str) -> Optional[Dict]:
+        """
+        取得請求對應的回應
+
+        Args:
+            method: HTTP 方法
+            url: 請求 URL
+
+        Returns:
+            包含 status、reason、headers、elapsed 與 content 的字典，沒有錄製則返回 None
+        """
+        with self._lock:
+            entry = self._entries.get(request_key(method, url))
+        if entry is None:
+            return None
+        with open(os.path.join(self.path, 'bodies', entry['body']), 'rb') as f:
+            return dict(entry, content=f.read())
+
+    def _save(self):
+        """寫入索引（先寫暫存檔再取代，避免中斷時損毀）"""
+        os.makedirs(self.path, exist_ok=True)
+        index_path = os.path.join(self.path, 'index.json')
+        temp_path = index_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write('\n')
+        os.replace(temp_path, index_path)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    錄製用的傳輸介面卡：正常送出請求，並把完整回應寫入封存
+    （內容會一次讀完，之後 iter_content 從記憶體讀取）
+    """
+
+    def __init__(self, archive: HttpArchive, **kwargs):
+        """
+        Args:
+            archive: 寫入的封存目錄
+            **kwargs: 傳給 HTTPAdapter 的連線池設定
+        """
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        start = time.monotonic()
+        response = super().send(request, **kwargs)
+        body = response.content
+        elapsed = time.monotonic() - start
+        self.archive.add(request.method, request.url, response.status_code, dict(response.headers),
+                         body, elapsed=elapsed, reason=response.reason or '')
+        logger.debug(f"已錄製 {request.method} {request.url} ({response.status_code}, {elapsed:.3f} 秒)")
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    重播用的傳輸介面卡：從封存建立回應，不進行任何網路連線
+
+    - 條件式請求的 If-None-Match 與錄製的 ETag 相同時回傳 304
+    - latency 大於 0 時依錄製耗時乘以倍數等待
+    - 沒有錄製的請求回傳 404（與網站上不存在的頁面相同，不會觸發斷路器）
+    """
+
+    def __init__(self, archive: HttpArchive, latency: float = 0.0):
+        """
+        Args:
+            archive: 讀取的封存目錄
+            latency: 錄製延遲的倍數（0 表示不等待）
+        """
+        super().__init__()
+        self.archive = archive
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'not_modified': 0}
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        entry = self.archive.get(request.method, request.url)
+        if entry is None:
+            logger.debug(f"封存中沒有 {request.method} {request.url}，回傳 404")
+            entry = {'status': 404, 'reason': 'Not Found', 'headers': {}, 'content': b'', 'elapsed': 0.0}
+            outcome = 'misses'
+        else:
+            outcome = 'hits'
+
+        if self.latency > 0 and entry['elapsed'] > 0:
+            time.sleep(entry['elapsed'] * self.latency)
+
+        headers = CaseInsensitiveDict(entry['headers'])
+        status, reason, content = entry['status'], entry['reason'], entry['content']
+        etag = headers.get('ETag')
+        if etag and request.headers.get('If-None-Match') == etag:
+            status, reason, content = 304, 'Not Modified', b''
+            outcome = 'not_modified'
+        headers['Content-Length'] = str(len(content))
+        with self._lock:
+            self._stats[outcome] += 1
+
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = headers
+        response.raw = io.BytesIO(content)
+        response.encoding = get_encoding_from_headers(headers)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        取得重播統計
+
+        Returns:
+            命中、未命中與回傳 304 的次數
+        """
+        with self._lock:
+            return dict(self._stats)
+
+
+def install_transport(session: requests.Session, mode: Optional[str] = None,
+                      archive_path: Optional[str] = None, latency: Optional[float] = None) -> Optional[BaseAdapter]:
+    """
+    依設定在 Session 掛載錄製或重播介面卡（HTTP 與 HTTPS）
+
+    Args:
+        session: 要掛載的 Session
+        mode: record 或 replay，預設讀取 HTTP_REPLAY_MODE
+        archive_path: 封存目錄，預設讀取 HTTP_REPLAY_ARCHIVE
+        latency: 重播延遲倍數，預設讀取 HTTP_REPLAY_LATENCY
+
+    Returns:
+        掛載的介面卡，未啟用時返回 None
+    """
+    mode = (mode if mode is not None else os.getenv('HTTP_REPLAY_MODE', '')).lower()
+    if not mode:
+        return None
+    archive = HttpArchive(archive_path or os.getenv('HTTP_REPLAY_ARCHIVE') or DEFAULT_ARCHIVE)
+
+    if mode == 'record':
+        # 沿用 Session 原本的連線池設定
+        current = session.get_adapter('https://')
+        adapter = RecordingAdapter(
+            archive,
+            pool_connections=getattr(current, '_pool_connections', 10),
+            pool_maxsize=getattr(current, '_pool_maxsize', 10),
+            pool_block=getattr(current, '_pool_block', False)
+        )
+    elif mode == 'replay':
+        if latency is None:
+            latency = float(os.getenv('HTTP_REPLAY_LATENCY', 0))
+        adapter = ReplayAdapter(archive, latency=latency)
+    else:
+        raise ValueError(f"不支援的 HTTP_REPLAY_MODE: {mode}")
+
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    logger.info(f"HTTP {mode} 模式已啟用，封存目錄: {archive.path}（{len(archive)} 筆）")
+    return adapter
@@ -0,0 +1,249 @@
+"""
+文章倒排索引模組
+以中日韓文字二元組 (bigram) 與拉丁字詞為單位建立記憶體內倒排索引，
+支援文章逐筆新增與移除，讓關鍵字查詢不需掃描或重新擷取文章
+"""
+
+import re
+import threading
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+# 中日韓統一表意文字（含擴充 A 與相容表意文字）
+CJK_PATTERN = r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]'
+TOKEN_RE = re.compile(rf'({CJK_PATTERN}+)|([a-z0-9]+)')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    將文字切分為索引詞
+
+    - 中日韓文字：連續字元切為二元組（單一字元則保留單字）
+    - 拉丁字母與數字：以非英數字元分隔的小寫字詞
+
+    Args:
+        text: 原始文字
+
+    Returns:
+        索引詞列表（保留重複以計算詞頻）
+    """
+    tokens = []
+    for cjk_run, word in TOKEN_RE.findall((text or '').lower()):
+        if cjk_run:
+            if len(cjk_run) == 1:
+                tokens.append(cjk_run)
+            else:
+                tokens.extend(cjk_run[i:i + 2] for i in range(len(cjk_run) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class InvertedIndex:
+    """
+    記憶體內倒排索引
+
+    postings 結構：token -> {doc_id -> {field -> 詞頻}}
+    每篇文章同時保存顯示所需的欄位（標題、網址、內文等）
+    """
+
+    def __init__(self):
+        """初始化空索引"""
+        self._postings: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._docs: Dict[str, Dict] = {}
+        self._doc_tokens: Dict[str, Set[str]] = {}
+        self._total_lengths = {'title': 0, 'body': 0}
+        self._lock = threading.RLock()
+        # 已同步到的語料寫入時間（供 sync_index_from_store 增量同步）
+        self.synced_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._docs
+
+    def add(self, doc_id: str, title: str, body: str, **fields):
+        """
+        新增或取代一篇文章
+
+        Args:
+            doc_id: 文章識別碼（例如 feed GUID）
+            title: 標題
+            body: 內文
+            **fields: 其他需保存的欄位（url、content、published_ts 等）
+        """
+        field_counts = {
+            'title': Counter(tokenize(title)),
+            'body': Counter(tokenize(body)),
+        }
+
+        with self._lock:
+            if doc_id in self._docs:
+                self.remove(doc_id)
+
+            tokens = set()
+            for field, counts in field_counts.items():
+                for token, count in counts.items():
+                    self._postings.setdefault(token, {}).setdefault(doc_id, {})[field] = count
+                    tokens.add(token)
+
+            lengths = {field: sum(counts.values()) for field, counts in field_counts.items()}
+            for field, length in lengths.items():
+                self._total_lengths[field] += length
+
+            self._docs[doc_id] = dict(fields, title=title, lengths=lengths)
+            self._doc_tokens[doc_id] = tokens
+
+    def remove(self, doc_id: str) -> bool:
+        """
+        移除一篇文章
+
+        Args:
+            doc_id: 文章識別碼
+
+        Returns:
+            是否確實移除
+        """
+        with self._lock:
+            if doc_id not in self._docs:
+                return False
+            for token in self._doc_tokens.pop(doc_id):
+                postings = self._postings.get(token)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self._postings[token]
+            for field, length in self._docs.pop(doc_id)['lengths'].items():
+                self._total_lengths[field] -= length
+            return True
+
+    def get(self, doc_id: str) -> Optional[Dict]:
+        """取得文章保存的欄位"""
+        return self._docs.get(doc_id)
+
+    def average_length(self, field: str) -> float:
+        """
+        取得欄位的平均長度（索引詞數）
+
+        Args:
+            field: 欄位名稱（title 或 body）
+
+        Returns:
+            平均長度，空索引時為 0
+        """
+        return self._total_lengths[field] / len(self._docs) if self._docs else 0.0
+
+    def document_frequency(self, token: str) -> int:
+        """取得包含索引詞的文章數"""
+        return len(self._postings.get(token, {}))
+
+    def postings(self, token: str) -> Dict[str, Dict[str, int]]:
+        """
+        取得單一索引詞的 posting list
+
+        Args:
+            token: 索引詞
+
+        Returns:
+            {doc_id -> {field -> 詞頻}}
+        """
+        return self._postings.get(token, {})
+
+    def match(self, term: str) -> Set[str]:
+        """
+        找出包含查詢詞所有索引詞的文章
+
+        Args:
+            term: 查詢詞（會先切分為索引詞）
+
+        Returns:
+            符合的文章識別碼集合
+        """
+        tokens = set(tokenize(term))
+        if not tokens:
+            return set()
+
+        with self._lock:
+            # 由最短的 posting list 開始取交集
+            posting_lists = sorted((self.postings(token) for token in tokens), key=len)
+            matched = set(posting_lists[0])
+            for postings in posting_lists[1:]:
+                matched &= postings.keys()
+                if not matched:
+                    break
+            return matched
+
+    def candidates(self, terms: Iterable[str]) -> Set[str]:
+        """
+        找出符合任一查詢詞的候選文章
+
+        Args:
+            terms: 查詢詞列表
+
+        Returns:
+            候選文章識別碼集合
+        """
+        matched: Set[str] = set()
+        with self._lock:
+            for term in terms:
+                matched |= self.match(term)
+        return matched
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        取得索引統計
+
+        Returns:
+            文章數與索引詞數
+        """
+        with self._lock:
+            return {'documents': len(self._docs), 'tokens': len(self._postings)}
+
+
+def sync_index_from_store(index: InvertedIndex, store) -> int:
+    """
+    將文章儲存語料中新寫入的文章加入索引（增量同步）
+
+    Args:
+        index: 倒排索引
+        store: ArticleStore 實例
+
+    Returns:
+        本次加入索引的文章數
+    """
+    with index._lock:
+        entries = store.list_corpus(since=index.synced_at)
+        for entry in entries:
+            index.add(
+                entry['guid'],
+                entry['title'],
+                ' '.join(filter(None, [entry.get('content'), ' '.join(entry.get('categories') or [])])),
+                url=entry['url'],
+                content=entry['content'],
+                summary=entry.get('summary'),
+                categories=entry.get('categories') or [],
+                published_ts=entry.get('published_ts')
+            )
+            index.synced_at = max(index.synced_at, entry['ingested_at'])
+        if entries:
+            logger.info(f"索引新增 {len(entries)} 篇文章，共 {len(index)} 篇")
+        return len(entries)
+
+
+# 便利函數和全域變數
+_index_instance = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> InvertedIndex:
+    """取得行程內共用的倒排索引（單例模式）"""
+    global _index_instance
+    with _index_lock:
+        if _index_instance is None:
+            _index_instance = InvertedIndex()
+        return _index_instance
@@ -9,10 +9,17 @@ from typing import Optional, List, Dict
 import logging
 import time
 
+from rate_limit import get_rate_limiter
+from deadline import Deadline
+
 # 設置日誌
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 有請求期限時單次生成的逾時秒數，以及剩餘時間低於多少秒即改用文章開頭作為摘要
+GENERATE_TIMEOUT = 20
+SUMMARY_MIN_SECONDS = 4
+
 class GeminiSummarizer:
     def __init__(self, api_key: Optional[str] = None):
         """
@@ -77,6 +84,9 @@ class GeminiSummarizer:
         self.current_model_info = None
         self.failed_models = set()  # 記錄失敗的模型
         
+        # 共用的速率限制器（Gemini 呼叫，與爬蟲的模糊關鍵字共用額度）
+        self.rate_limiter = get_rate_limiter()
+        
         # 初始化模型
         self._initialize_model()
     
@@ -141,6 +151,20 @@ class GeminiSummarizer:
             logger.warning(f"模型測試失敗: {str(e)}")
             return False
     
+    def warm_up(self):
+        """
+        以不計費的 count_tokens 呼叫建立 Gemini SDK 的連線（供連線預熱使用）
+        
+        count_tokens 仍計入 API 的請求配額，因此與摘要生成共用 'gemini' 速率限制
+        
+        Raises:
+            Exception: 模型尚未初始化或請求失敗時
+        """
+        if not self.model:
+            raise RuntimeError("沒有可用的模型")
+        self.rate_limiter.acquire('gemini')
+        self.model.count_tokens("ping")
+    
     def _switch_to_next_model(self) -> bool:
         """
         切換到下一個可用的模型
@@ -161,13 +185,15 @@ class GeminiSummarizer:
             logger.error(f"無法切換到其他模型: {str(e)}")
             return False
     
-    def _generate_content_with_retry(self, prompt: str, max_retries: int = 3) -> Optional[str]:
+    def _generate_content_with_retry(self, prompt: str, max_retries: int = 3,
+                                     deadline: Optional[Deadline] = None) -> Optional[str]:
         """
         智能重試機制，包含模型切換
         
         Args:
             prompt: 輸入提示
             max_retries: 最大重試次數
+            deadline: 請求期限，依剩餘時間設定生成逾時，時間不足時不再重試
             
         Returns:
             生成的內容或 None
@@ -178,9 +204,19 @@ class GeminiSummarizer:
                     logger.error("沒有可用的模型")
                     return None
                 
+                if deadline is not None and attempt > 0 and not deadline.allows(SUMMARY_MIN_SECONDS):
+                    deadline.degrade("不再重試摘要生成")
+                    return None
+                
                 logger.info(f"使用模型 {self.current_model_info['name']} 生成內容 (嘗試 {attempt + 1}/{max_retries})")
                 
-                response = self.model.generate_content(prompt)
+                self.rate_limiter.acquire('gemini')
+                if deadline is not None:
+                    response = self.model.generate_content(
+                        prompt, request_options={'timeout': deadline.timeout(GENERATE_TIMEOUT)}
+                    )
+                else:
+                    response = self.model.generate_content(prompt)
                 
                 if response and response.text:
                     return response.text.strip()
@@ -205,19 +241,24 @@ class GeminiSummarizer:
                 # 其他錯誤，等待後重試
                 if attempt < max_retries - 1:
                     wait_time = (attempt + 1) * 2
+                    if deadline is not None and not deadline.allows(wait_time + SUMMARY_MIN_SECONDS):
+                        deadline.degrade("不再重試摘要生成")
+                        return None
                     logger.info(f"等待 {wait_time} 秒後重試...")
                     time.sleep(wait_time)
         
         logger.error(f"重試 {max_retries} 次後仍然失敗")
         return None
     
-    def summarize_article(self, title: str, content: str) -> str:
+    def summarize_article(self, title: str, content: str,
+                          deadline: Optional[Deadline] = None) -> str:
         """
         生成文章摘要
         
         Args:
             title: 文章標題
             content: 文章內容
+            deadline: 請求期限，依剩餘時間設定生成逾時
             
         Returns:
             摘要文字
@@ -242,7 +283,7 @@ class GeminiSummarizer:
             logger.info(f"開始生成摘要，使用模型: {self.current_model_info['name']}")
             
             # 使用智能重試機制生成摘要
-            summary = self._generate_content_with_retry(prompt)
+            summary = self._generate_content_with_retry(prompt, deadline=deadline)
             
             if summary:
                 logger.info(f"✅ 摘要生成成功，長度: {len(summary)} 字")
@@ -255,12 +296,14 @@ class GeminiSummarizer:
             logger.error(f"摘要生成過程發生錯誤: {str(e)}")
             return "抱歉，摘要生成發生錯誤，請稍後再試。"
     
-    def summarize_articles(self, articles: List[Dict]) -> List[Dict]:
+    def summarize_articles(self, articles: List[Dict],
+                           deadline: Optional[Deadline] = None) -> List[Dict]:
         """
         批量生成多篇文章摘要
         
         Args:
             articles: 文章列表，每個元素為包含 title, content 的字典
+            deadline: 請求期限，剩餘時間不足時改用文章描述或開頭作為摘要
             
         Returns:
             包含摘要的文章列表
@@ -283,10 +326,18 @@ class GeminiSummarizer:
                         summarized_articles.append(article_copy)
                         continue
                     
+                    # 時間不足時不呼叫 Gemini，直接使用文章描述
+                    if deadline is not None and not deadline.allows(SUMMARY_MIN_SECONDS):
+                        deadline.degrade(f"第 {i+1} 篇文章改用描述作為摘要")
+                        article_copy = article.copy()
+                        article_copy['summary'] = self._fallback_summary(article)
+                        summarized_articles.append(article_copy)
+                        continue
+                    
                     logger.info(f"正在處理第 {i+1}/{len(articles)} 篇文章: {title[:50]}...")
                     
                     # 生成摘要
-                    summary = self.summarize_article(title, content)
+                    summary = self.summarize_article(title, content, deadline=deadline)
                     
                     # 創建包含摘要的文章副本
                     article_copy = article.copy()
@@ -294,10 +345,6 @@ class GeminiSummarizer:
                     summarized_articles.append(article_copy)
                     
                     logger.info(f"✅ 第 {i+1} 篇文章摘要完成")
-                    
-                    # 添加小延遲以避免過度頻繁的 API 調用
-                    if i < len(articles) - 1:  # 不是最後一篇
-                        time.sleep(1)
                         
                 except Exception as e:
                     logger.error(f"處理第 {i+1} 篇文章時發生錯誤: {str(e)}")
@@ -320,6 +367,23 @@ class GeminiSummarizer:
                 error_articles.append(article_copy)
             return error_articles
     
+    @staticmethod
+    def _fallback_summary(article: Dict) -> str:
+        """
+        不呼叫 Gemini 的替代摘要：優先使用文章描述，否則取內容開頭
+        
+        Args:
+            article: 包含 content（可選 description）的文章字典
+            
+        Returns:
+            摘要文字
+        """
+        description = (article.get('description') or '').strip()
+        if description:
+            return description
+        content = article.get('content', '').strip()
+        return content[:150] + "..." if len(content) > 150 else content
+    
     def get_model_status(self) -> Dict:
         """
         取得當前模型狀態資訊
@@ -1,3 +1,21 @@
 """
 測試初始化檔案
 """
+
+import os
+
+# 測試時停用磁碟文章儲存，避免不同測試互相影響
+os.environ.setdefault('ARTICLE_STORE_PATH', '')
+
+# 每次呼叫都重新取得 RSS feed，避免共用快照讓測試互相影響
+os.environ.setdefault('FEED_CACHE_TTL', '0')
+
+# 模糊關鍵字快取只使用記憶體，不寫入磁碟
+os.environ.setdefault('KEYWORD_CACHE_PATH', '')
+
+# 測試時不限制請求速率（速率限制器另有專門測試）
+for _name in ('RATE_LIMIT_BUZZORANGE', 'RATE_LIMIT_LINE_PUSH', 'RATE_LIMIT_GEMINI'):
+    os.environ.setdefault(_name, '0')
+
+# 測試時不記錄失敗的 URL，避免模擬的失敗影響其他測試
+os.environ.setdefault('NEGATIVE_CACHE_TTLS', '0')
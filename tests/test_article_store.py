@@ -0,0 +1,99 @@
+"""
+文章內容儲存模組單元測試
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from article_store import ArticleStore, canonicalize_url
+from crawler import TechOrangeCrawler
+
+ARTICLE_HTML = """
+<html>
+    <head><title>網站標題</title></head>
+    <body>
+        <h1 class="entry-title">AI 技術的最新發展</h1>
+        <div class="entry-content"><p>""" + "人工智慧技術持續進步。" * 20 + """</p></div>
+    </body>
+</html>"""
+
+
+class TestCanonicalizeUrl(unittest.TestCase):
+
+    def test_strip_tracking_params(self):
+        """測試移除追蹤參數與結尾斜線"""
+        url = "https://BuzzOrange.com/techorange/2024/01/01/ai/?utm_source=line&fbclid=abc#top"
+        self.assertEqual(canonicalize_url(url), "https://buzzorange.com/techorange/2024/01/01/ai")
+
+    def test_keep_other_params_sorted(self):
+        """測試保留其他參數並排序"""
+        url = "https://buzzorange.com/techorange/?s=ai&post_type=post&utm_medium=x"
+        self.assertEqual(canonicalize_url(url), "https://buzzorange.com/techorange?post_type=post&s=ai")
+
+
+class TestArticleStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'articles.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_put_and_get(self):
+        """測試寫入後可用不同形式的 URL 讀取"""
+        store = ArticleStore(self.path)
+        store.put("https://buzzorange.com/techorange/a/", "內容", "標題")
+
+        article = store.get("https://buzzorange.com/techorange/a?utm_source=fb")
+        self.assertEqual(article['content'], "內容")
+        self.assertEqual(article['title'], "標題")
+        self.assertEqual(len(article['content_hash']), 64)
+
+    def test_survives_reopen(self):
+        """測試重新開啟資料庫後資料仍在"""
+        ArticleStore(self.path).put("https://test.com/a", "內容")
+        self.assertIsNotNone(ArticleStore(self.path).get("https://test.com/a"))
+
+    def test_max_age(self):
+        """測試過期內容視為未命中"""
+        store = ArticleStore(self.path, max_age=-1)
+        store.put("https://test.com/a", "內容")
+        self.assertIsNone(store.get("https://test.com/a"))
+        self.assertEqual(store.get_stats()['misses'], 1)
+
+
+class TestCrawlerStoreIntegration(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.crawler = TechOrangeCrawler()
+        self.crawler.store = ArticleStore(os.path.join(self.temp_dir, 'articles.db'))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch('crawler.requests.Session.get')
+    def test_extract_uses_store(self, mock_get):
+        """測試第二次擷取直接讀取儲存"""
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.headers = {}
+        mock_response.iter_content.return_value = [ARTICLE_HTML.encode('utf-8')]
+        mock_get.return_value = mock_response
+
+        first = self.crawler._extract_article_content("https://test.com/a/")
+        second = self.crawler._extract_article_content("https://test.com/a?utm_source=line")
+        title = self.crawler._extract_title_from_url("https://test.com/a")
+
+        self.assertIn("人工智慧", first)
+        self.assertEqual(first, second)
+        self.assertEqual(title, "AI 技術的最新發展")
+        self.assertEqual(mock_get.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,200 @@
+"""
+TechOrange 非同步爬蟲模組單元測試
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from aiohttp import web
+
+from article_store import ArticleStore
+from async_crawler import AsyncTechOrangeCrawler, BackgroundEventLoop, ThreadedAsyncCrawler
+from circuit_breaker import CLOSED, HALF_OPEN, HostCircuitBreakers
+from crawler import TechOrangeCrawler
+from deadline import Deadline
+from feed_cache import FeedSnapshot
+from search_index import InvertedIndex
+
+ARTICLE_BODY = "人工智慧技術持續進步，在各領域都有重大突破。" * 10
+
+
+def build_app(base_url_holder):
+    """建立模擬 TechOrange 的本地伺服器"""
+    async def feed(request):
+        base = base_url_holder['url']
+        items = "".join(
+            f"<item><title>AI 新聞 {i}</title><link>{base}/article/{i}</link></item>"
+            for i in range(base_url_holder.get('items', 5))
+        )
+        body = f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'
+        return web.Response(body=body, content_type='application/rss+xml')
+
+    async def article(request):
+        article_id = request.match_info['id']
+        base_url_holder.setdefault('requested', []).append(article_id)
+        if article_id == '0':
+            raise web.HTTPNotFound()
+        html = (f"<html><body><h1 class='entry-title'>AI 新聞 {article_id} 標題</h1>"
+                f"<div class='entry-content'>{ARTICLE_BODY}</div></body></html>")
+        return web.Response(text=html, content_type='text/html')
+
+    async def error(request):
+        base_url_holder['errors'] = base_url_holder.get('errors', 0) + 1
+        raise web.HTTPServiceUnavailable()
+
+    async def slow(request):
+        await asyncio.sleep(base_url_holder.get('delay', 1))
+        return web.Response(text='')
+
+    app = web.Application()
+    app.router.add_get('/feed/', feed)
+    app.router.add_get('/article/{id}', article)
+    app.router.add_get('/slow', slow)
+    app.router.add_get('/error', error)
+    return app
+
+
+class TestAsyncTechOrangeCrawler(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = BackgroundEventLoop(name='test-crawler-loop')
+        self.base = {}
+
+        async def start_server():
+            runner = web.AppRunner(build_app(self.base))
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = runner.addresses[0][1]
+            return runner, f"http://127.0.0.1:{port}"
+
+        self.runner, self.base['url'] = self.loop.run(start_server(), 10)
+
+        sync_crawler = TechOrangeCrawler()
+        sync_crawler.store = None
+        sync_crawler.rss_url = f"{self.base['url']}/feed/"
+        sync_crawler.feed = FeedSnapshot(sync_crawler.rss_url, ttl=60)
+        self.async_crawler = AsyncTechOrangeCrawler(crawler=sync_crawler)
+        self.crawler = ThreadedAsyncCrawler(self.async_crawler, loop=self.loop, timeout=30)
+
+    def tearDown(self):
+        self.crawler.close()
+        self.loop.run(self.runner.cleanup(), 10)
+        self.loop.stop()
+
+    def test_fetch_articles_skips_failed_pages(self):
+        """測試關鍵字擷取會跳過失敗頁面並維持 feed 順序"""
+        articles = self.crawler.fetch_articles("AI", 2)
+
+        self.assertEqual([a['title'] for a in articles], ["AI 新聞 1", "AI 新聞 2"])
+        self.assertTrue(all(ARTICLE_BODY[:20] in a['content'] for a in articles))
+
+    def test_fetch_articles_merges_corpus_results(self):
+        """測試先查詢語料，並與 RSS 結果依 URL 去除重複"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        store = ArticleStore(os.path.join(temp_dir, 'articles.db'))
+        url = f"{self.base['url']}/article/2"
+        store.put(url, ARTICLE_BODY, title="AI 新聞 2")
+        store.add_corpus_entry(guid='post-2', url=url, title="AI 新聞 2", published_ts=1.0)
+        self.async_crawler.crawler.store = store
+        self.async_crawler.crawler.index = InvertedIndex()
+
+        articles = self.crawler.fetch_articles("AI", 3)
+
+        self.assertEqual([a['url'] for a in articles],
+                         [url, f"{self.base['url']}/article/1", f"{self.base['url']}/article/3"])
+
+    def test_fetches_only_n_pages(self):
+        """測試 RSS 與隨機擷取只擷取 n 篇頁面，失敗時才遞補"""
+        self.base['items'] = 20
+
+        for fetch in (lambda: self.crawler.fetch_articles("AI", 3),
+                      lambda: self.crawler.fetch_random_articles(3)):
+            self.base['requested'] = []
+            self.assertEqual(len(fetch()), 3)
+            # 第 0 篇回傳 404，擷取到時多送出一個遞補請求
+            requested = self.base['requested']
+            self.assertEqual(len(requested), 3 + ('0' in requested))
+
+    def test_fetch_random_articles(self):
+        """測試隨機擷取回傳指定數量"""
+        articles = self.crawler.fetch_random_articles(3)
+
+        self.assertEqual(len(articles), 3)
+        self.assertEqual(len({a['url'] for a in articles}), 3)
+
+    def test_cancelled_probe_releases_breaker(self):
+        """測試半開探測請求被取消後，下一個請求仍可探測"""
+        breakers = HostCircuitBreakers(failure_threshold=1, cooldown=0.05)
+        url = f"{self.base['url']}/slow"
+        breaker = breakers.for_url(url)
+        breaker.record_failure()
+        time.sleep(0.1)
+
+        async def cancel_probe():
+            async def probe():
+                async with self.async_crawler._get(url, 5):
+                    pass
+
+            task = asyncio.ensure_future(probe())
+            await asyncio.sleep(0.2)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        with patch('async_crawler.get_circuit_breakers', return_value=breakers):
+            self.loop.run(cancel_probe(), 5)
+
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.before_request()
+
+    def test_retry_bounded_by_deadline(self):
+        """測試剩餘時間不足以退避後再等一次完整逾時時不再重試"""
+        url = f"{self.base['url']}/error"
+
+        async def status(deadline):
+            async with self.async_crawler._get(url, 5, deadline) as response:
+                return response.status
+
+        with patch('async_crawler.get_circuit_breakers', return_value=HostCircuitBreakers()):
+            self.assertEqual(self.loop.run(status(None), 10), 503)
+            self.assertEqual(self.base['errors'], 2)
+            self.assertEqual(self.loop.run(status(Deadline(3)), 10), 503)
+            self.assertEqual(self.base['errors'], 3)
+
+    def test_attempt_timeout_capped_by_deadline(self):
+        """測試每次嘗試的逾時不超過剩餘時間，且縮短的逾時不計入斷路器失敗"""
+        breakers = HostCircuitBreakers()
+        url = f"{self.base['url']}/slow"
+        self.base['delay'] = 3
+
+        async def fetch():
+            async with self.async_crawler._get(url, 10, Deadline(1.5)):
+                pass
+
+        start = time.monotonic()
+        with patch('async_crawler.get_circuit_breakers', return_value=breakers):
+            with self.assertRaises(asyncio.TimeoutError):
+                self.loop.run(fetch(), 5)
+
+        self.assertLess(time.monotonic() - start, 2.5)
+        stats = breakers.for_url(url).get_stats()
+        self.assertEqual((stats['state'], stats['failures']), (CLOSED, 0))
+
+    def test_shared_session(self):
+        """測試多次擷取共用同一個 ClientSession"""
+        async def session_id():
+            return id(await self.async_crawler._get_session())
+
+        first = self.loop.run(session_id(), 5)
+        self.crawler.fetch_random_articles(1)
+        self.assertEqual(first, self.loop.run(session_id(), 5))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
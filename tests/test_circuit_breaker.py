@@ -0,0 +1,197 @@
+"""
+斷路器與重試模組單元測試
+"""
+
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import requests
+
+from circuit_breaker import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError,
+                             HostCircuitBreakers, RetryPolicy)
+from deadline import Deadline
+from http_pool import PooledSession
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """依序回應預先設定狀態碼的測試伺服器"""
+    protocol_version = 'HTTP/1.1'
+    statuses = []
+    requests_seen = 0
+    delay = 0.0
+
+    def do_GET(self):
+        type(self).requests_seen += 1
+        time.sleep(self.delay)
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = b"ok"
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_consecutive_failures(self):
+        """測試連續失敗達到門檻後斷開並立即拒絕"""
+        breaker = CircuitBreaker('test', failure_threshold=3, cooldown=30)
+        for _ in range(3):
+            breaker.before_request()
+            breaker.record_failure()
+
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+        self.assertEqual(breaker.get_stats()['rejected'], 1)
+
+    def test_success_resets_failure_count(self):
+        """測試成功後重新計算連續失敗"""
+        breaker = CircuitBreaker('test', failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success(0.1)
+        breaker.record_failure()
+
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_slow_calls_count_as_failures(self):
+        """測試超過延遲門檻的回應視為失敗"""
+        breaker = CircuitBreaker('test', failure_threshold=2, slow_threshold=1.0)
+        breaker.record_success(2.0)
+        breaker.record_success(3.0)
+
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(breaker.get_stats()['slow_calls'], 2)
+
+    @patch('circuit_breaker.time.monotonic')
+    def test_half_open_probe(self, mock_monotonic):
+        """測試冷卻後只放行一個探測請求，成功則關閉、失敗則重新斷開"""
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker('test', failure_threshold=1, cooldown=30)
+        breaker.record_failure()
+
+        mock_monotonic.return_value = 131.0
+        breaker.before_request()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        mock_monotonic.return_value = 162.0
+        breaker.before_request()
+        breaker.record_success(0.1)
+        self.assertEqual(breaker.state, CLOSED)
+
+    @patch('circuit_breaker.time.monotonic')
+    def test_released_probe_allows_next_probe(self, mock_monotonic):
+        """測試探測請求沒有結果而釋放後，下一個請求可以重新探測"""
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker('test', failure_threshold=1, cooldown=30)
+        breaker.record_failure()
+
+        mock_monotonic.return_value = 131.0
+        breaker.before_request()
+        breaker.release_probe()
+        breaker.before_request()
+        self.assertEqual(breaker.state, HALF_OPEN)
+
+    def test_backoff_bounded(self):
+        """測試退避時間有上限且隨嘗試次數增加"""
+        retry = RetryPolicy(base_delay=0.5, max_delay=2.0)
+        for attempt in range(10):
+            delay = retry.backoff(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(2.0, 0.5 * 2 ** attempt))
+
+
+class TestPooledSessionBreaker(unittest.TestCase):
+
+    def setUp(self):
+        FlakyHandler.statuses = []
+        FlakyHandler.requests_seen = 0
+        FlakyHandler.delay = 0.0
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self.breakers = HostCircuitBreakers(
+            failure_threshold=2, cooldown=30,
+            retry=RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.02)
+        )
+        self.session = PooledSession(breakers=self.breakers)
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retries_server_errors(self):
+        """測試 5xx 以退避重試後成功"""
+        FlakyHandler.statuses = [503]
+
+        response = self.session.get(self.url, timeout=5)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(FlakyHandler.requests_seen, 2)
+        self.assertEqual(self.breakers.for_url(self.url).state, CLOSED)
+
+    def test_fails_fast_while_open(self):
+        """測試斷路器斷開後不再送出請求"""
+        FlakyHandler.statuses = [503, 503, 503]
+
+        response = self.session.get(self.url, timeout=5)
+        self.assertEqual(response.status_code, 503)
+        with self.assertRaises(CircuitOpenError):
+            self.session.get(self.url, timeout=5)
+
+        self.assertEqual(FlakyHandler.requests_seen, 2)
+
+    def test_full_timeout_is_not_retried(self):
+        """測試等滿逾時秒數的逾時不重試"""
+        FlakyHandler.delay = 0.3
+
+        with self.assertRaises(requests.Timeout):
+            self.session.get(self.url, timeout=0.1)
+
+        self.assertEqual(FlakyHandler.requests_seen, 1)
+
+    def test_no_retry_without_time_for_another_attempt(self):
+        """測試剩餘時間不足以再等一次逾時時不重試"""
+        FlakyHandler.statuses = [503]
+
+        response = self.session.get(self.url, timeout=5, deadline=Deadline(3))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(FlakyHandler.requests_seen, 1)
+
+    def test_attempt_timeout_capped_by_deadline(self):
+        """測試每次嘗試的逾時不超過剩餘時間"""
+        FlakyHandler.delay = 1.5
+
+        start = time.monotonic()
+        with self.assertRaises(requests.Timeout):
+            self.session.get(self.url, timeout=5, deadline=Deadline(1))
+        self.assertLess(time.monotonic() - start, 1.4)
+        # 縮短後的逾時不代表主機緩慢，不計入斷路器失敗
+        self.assertEqual(self.breakers.for_url(self.url).get_stats()['failures'], 0)
+
+    def test_not_found_is_not_a_failure(self):
+        """測試 404 不計入主機失敗也不重試"""
+        FlakyHandler.statuses = [404, 404]
+
+        self.session.get(self.url, timeout=5)
+        self.session.get(self.url, timeout=5)
+
+        self.assertEqual(FlakyHandler.requests_seen, 2)
+        self.assertEqual(self.breakers.for_url(self.url).state, CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
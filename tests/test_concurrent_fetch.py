@@ -0,0 +1,102 @@
+"""
+並行擷取模組單元測試
+"""
+
+import threading
+import time
+import unittest
+
+from concurrent_fetch import ConcurrentFetcher
+
+
+class TestConcurrentFetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.fetcher = ConcurrentFetcher(max_workers=4, per_host=2)
+
+    def tearDown(self):
+        self.fetcher.shutdown()
+
+    def test_results_keep_input_order(self):
+        """測試結果依輸入順序排列，即使完成順序不同"""
+        delays = {'https://a.com/1': 0.2, 'https://b.com/2': 0.0, 'https://c.com/3': 0.1}
+
+        def fetch(url):
+            time.sleep(delays[url])
+            return url.upper()
+
+        results = self.fetcher.fetch_ordered(fetch, list(delays), 3)
+        self.assertEqual([item for item, _ in results], list(delays))
+
+    def test_skip_failures_and_stop_early(self):
+        """測試跳過失敗項目並在取得 n 筆後停止"""
+        urls = [f"https://test.com/{i}" for i in range(20)]
+
+        def fetch(url):
+            return None if url.endswith('/0') else url
+
+        results = self.fetcher.fetch_ordered(fetch, urls, 2)
+        self.assertEqual([item for item, _ in results], urls[1:3])
+        stats = self.fetcher.get_stats()
+        self.assertLess(stats['submitted'], len(urls))
+
+    def test_window_limits_in_flight_fetches(self):
+        """測試 window 為 n 時只擷取 n 個項目，失敗時才遞補下一個"""
+        urls = [f"https://test.com/{i}" for i in range(20)]
+        called = []
+        lock = threading.Lock()
+
+        def fetch(url):
+            with lock:
+                called.append(url)
+            time.sleep(0.02)
+            return None if url.endswith('/1') else url
+
+        results = self.fetcher.fetch_ordered(fetch, urls, 3, window=3)
+
+        self.assertEqual([item for item, _ in results], [urls[0], urls[2], urls[3]])
+        self.assertEqual(sorted(called, key=urls.index), urls[:4])
+
+    def test_timeout_bounds_wait(self):
+        """測試超過等待上限時回傳已取得的結果，不等待慢速工作"""
+        def fetch(url):
+            time.sleep(0.5 if url.endswith('/1') else 0)
+            return url
+
+        urls = [f"https://test.com/{i}" for i in range(3)]
+        start = time.monotonic()
+        results = self.fetcher.fetch_ordered(fetch, urls, 3, timeout=0.1)
+
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual([item for item, _ in results], urls[:1])
+
+    def test_per_host_limit(self):
+        """測試同一主機的並行數不超過上限"""
+        active = {'now': 0, 'max': 0}
+        lock = threading.Lock()
+
+        def fetch(url):
+            with lock:
+                active['now'] += 1
+                active['max'] = max(active['max'], active['now'])
+            time.sleep(0.05)
+            with lock:
+                active['now'] -= 1
+            return url
+
+        urls = [f"https://test.com/{i}" for i in range(8)]
+        results = self.fetcher.fetch_ordered(fetch, urls, 8)
+
+        self.assertEqual(len(results), 8)
+        self.assertLessEqual(active['max'], 2)
+
+    def test_exception_treated_as_failure(self):
+        """測試擷取拋出例外時視為失敗"""
+        def fetch(url):
+            raise RuntimeError("boom")
+
+        self.assertEqual(self.fetcher.fetch_ordered(fetch, ["https://test.com/1"], 1), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
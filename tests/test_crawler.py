@@ -6,6 +6,31 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock
 import requests
 from crawler import TechOrangeCrawler, fetch_articles
+from concurrent_fetch import ConcurrentFetcher
+
+PAGE_HTML = "<div class='entry-content'>" + "內容" * 100 + "</div>"
+
+
+def fake_site(feed_url, feed, requested, page_html=PAGE_HTML, failing=()):
+    """
+    建立模擬 Session.get：feed_url 回傳 feed，其餘 URL 以串流回傳文章頁面
+
+    requested 會依序記錄請求的 URL，failing 中的 URL 回傳 404
+    """
+    def fake_get(url, **kwargs):
+        requested.append(url)
+        response = Mock()
+        response.status_code = 200
+        response.headers = {}
+        response.raise_for_status.return_value = None
+        if url == feed_url:
+            response.content = feed
+        elif url in failing:
+            response.raise_for_status.side_effect = requests.HTTPError("404")
+        else:
+            response.iter_content.return_value = [page_html.encode('utf-8')]
+        return response
+    return fake_get
 
 class TestTechOrangeCrawler(unittest.TestCase):
     
@@ -19,6 +44,10 @@ class TestTechOrangeCrawler(unittest.TestCase):
         self.assertIsNotNone(self.crawler.rss_url)
         self.assertIsNotNone(self.crawler.session)
     
+    def test_search_executor_is_shared(self):
+        """測試多個爬蟲實例共用同一個搜尋執行緒池"""
+        self.assertIs(TechOrangeCrawler().search_executor, self.crawler.search_executor)
+    
     @patch('crawler.requests.Session.get')
     def test_fetch_articles_success(self, mock_get):
         """測試成功爬取文章"""
@@ -117,6 +146,178 @@ class TestTechOrangeCrawler(unittest.TestCase):
             articles = self.crawler.fetch_articles("AI", 1000)
             self.assertIsInstance(articles, list)
 
+class TestArticleParsing(unittest.TestCase):
+    """測試文章頁面解析"""
+    
+    ARTICLE_HTML = """
+    <html>
+        <head>
+            <link rel="canonical" href="https://buzzorange.com/techorange/2024/01/01/ai/">
+            <meta property="og:image" content="https://buzzorange.com/cover.jpg">
+            <meta property="article:published_time" content="2024-01-01T08:00:00+08:00">
+        </head>
+        <body>
+            <header><h1 class="entry-title">AI 技術的最新發展</h1></header>
+            <div class="entry-content"><p>""" + "人工智慧技術持續進步。" * 20 + """</p></div>
+        </body>
+    </html>"""
+    
+    def setUp(self):
+        self.crawler = TechOrangeCrawler()
+        self.crawler.store = None
+    
+    def test_parse_article_page_record(self):
+        """測試解析結果包含標題、內文與中繼資料"""
+        article = self.crawler._parse_article_page(self.ARTICLE_HTML)
+        
+        self.assertEqual(article['title'], "AI 技術的最新發展")
+        self.assertIn("人工智慧技術持續進步", article['content'])
+        self.assertEqual(article['published'], "2024-01-01T08:00:00+08:00")
+        self.assertEqual(article['canonical_url'], "https://buzzorange.com/techorange/2024/01/01/ai/")
+        self.assertEqual(article['image'], "https://buzzorange.com/cover.jpg")
+    
+    @patch('crawler.requests.Session.get')
+    def test_search_article_single_request(self, mock_get):
+        """測試搜尋結果的內容與標題只需一次請求"""
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.headers = {}
+        mock_response.iter_content.return_value = [self.ARTICLE_HTML.encode('utf-8')]
+        mock_get.return_value = mock_response
+        
+        article = self.crawler._extract_search_article("https://buzzorange.com/techorange/a")
+        
+        self.assertEqual(article['title'], "AI 技術的最新發展")
+        self.assertEqual(mock_get.call_count, 1)
+
+class TestFeedCandidateRanking(unittest.TestCase):
+    """測試以 feed 資料排序候選並只擷取前 n 篇"""
+    
+    FEED = """<?xml version="1.0"?>
+    <rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+        <channel>
+            <item>
+                <title>雲端服務新動向</title>
+                <link>https://buzzorange.com/techorange/cloud</link>
+                <description>本文介紹 AI 推論在雲端的部署</description>
+            </item>
+            <item>
+                <title>晶片產業觀察</title>
+                <link>https://buzzorange.com/techorange/chip</link>
+                <category>AI</category>
+            </item>
+            <item>
+                <title>AI 技術的最新發展</title>
+                <link>https://buzzorange.com/techorange/ai</link>
+            </item>
+            <item>
+                <title>區塊鏈新聞</title>
+                <link>https://buzzorange.com/techorange/blockchain</link>
+            </item>
+        </channel>
+    </rss>"""
+    
+    def setUp(self):
+        self.crawler = TechOrangeCrawler()
+        self.crawler.store = None
+    
+    def test_rank_uses_title_categories_and_description(self):
+        """測試標題優先，其次分類、摘要，不相關文章排除"""
+        import feedparser
+        entries = feedparser.parse(self.FEED).entries
+        
+        candidates = self.crawler._rank_feed_candidates(entries, "ai", [])
+        
+        self.assertEqual([c['url'].rsplit('/', 1)[-1] for c in candidates], ["ai", "chip", "cloud"])
+    
+    @patch('crawler.requests.Session.get')
+    def test_fetches_only_top_n_and_promotes_on_failure(self, mock_get):
+        """測試只擷取前 n 篇內文，失敗時由下一篇遞補"""
+        requested = []
+        mock_get.side_effect = fake_site(self.crawler.rss_url, self.FEED, requested,
+                                         failing={"https://buzzorange.com/techorange/ai"})
+        self.crawler.fetcher = ConcurrentFetcher(max_workers=1)
+        
+        articles = self.crawler._fetch_from_rss("AI", 1, fuzzy_keywords=[])
+        
+        self.assertEqual([a['url'] for a in articles], ["https://buzzorange.com/techorange/chip"])
+        pages = [url for url in requested if url != self.crawler.rss_url]
+        self.assertEqual(pages, ["https://buzzorange.com/techorange/ai", "https://buzzorange.com/techorange/chip"])
+    
+    @patch('crawler.requests.Session.get')
+    def test_fetches_only_n_pages_with_wide_pool(self, mock_get):
+        """測試執行緒池大於 n 時，RSS 與隨機擷取都只擷取 n 篇頁面"""
+        items = "".join(
+            f"<item><title>AI 新聞 {i}</title><link>https://buzzorange.com/techorange/ai-{i}</link></item>"
+            for i in range(20)
+        )
+        feed = f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'
+        requested = []
+        mock_get.side_effect = fake_site(self.crawler.rss_url, feed, requested)
+        self.crawler.fetcher = ConcurrentFetcher(max_workers=8)
+        
+        for fetch in (lambda: self.crawler._fetch_from_rss("ai", 3, fuzzy_keywords=[]),
+                      lambda: self.crawler.fetch_random_articles(3)):
+            requested.clear()
+            self.assertEqual(len(fetch()), 3)
+            self.assertEqual(len([url for url in requested if url != self.crawler.rss_url]), 3)
+
+class TestFeedBody(unittest.TestCase):
+    """測試使用 RSS content:encoded 作為文章內容"""
+    
+    BODY = "人工智慧技術持續進步，在各領域都有重大突破。" * 10
+    
+    def build_feed(self, encoded):
+        return f"""<?xml version="1.0"?>
+        <rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+            <channel>
+                <item>
+                    <title>AI 技術的最新發展</title>
+                    <link>https://buzzorange.com/techorange/ai</link>
+                    <content:encoded><![CDATA[{encoded}]]></content:encoded>
+                </item>
+            </channel>
+        </rss>"""
+    
+    def setUp(self):
+        self.crawler = TechOrangeCrawler()
+        self.crawler.store = None
+    
+    def run_random(self, mock_get, encoded):
+        requested = []
+        mock_get.side_effect = fake_site(self.crawler.rss_url, self.build_feed(encoded), requested,
+                                         page_html=f"<div class='entry-content'>頁面：{self.BODY}</div>")
+        articles = self.crawler.fetch_random_articles(1)
+        return articles, [url for url in requested if url != self.crawler.rss_url]
+    
+    @patch('crawler.requests.Session.get')
+    def test_embedded_body_skips_page_fetch(self, mock_get):
+        """測試內嵌全文直接轉為純文字，不擷取頁面"""
+        articles, pages = self.run_random(mock_get, f"<p>{self.BODY}</p><script>track()</script>")
+        
+        self.assertEqual(pages, [])
+        self.assertEqual(articles[0]['content'], self.BODY)
+    
+    @patch('crawler.requests.Session.get')
+    def test_truncated_body_falls_back_to_page(self, mock_get):
+        """測試內嵌全文被截斷時改為擷取頁面"""
+        articles, pages = self.run_random(mock_get, f"<p>{self.BODY}</p><p>[&#8230;]</p>")
+        
+        self.assertEqual(pages, ["https://buzzorange.com/techorange/ai"])
+        self.assertTrue(articles[0]['content'].startswith("頁面："))
+    
+    def test_truncation_markers_only_at_end(self):
+        """測試只有結尾的截斷字樣才視為摘要，以刪節號結尾的全文照常使用"""
+        self.assertIsNotNone(self.crawler._parse_feed_body(f"<p>{self.BODY}</p><p>未完待續…</p>"))
+        self.assertIsNotNone(self.crawler._parse_feed_body(f"<p>[…] {self.BODY}</p>"))
+        self.assertIsNone(self.crawler._parse_feed_body(f"<p>{self.BODY}</p><a>閱讀全文 »</a>"))
+        self.assertIsNone(self.crawler._parse_feed_body(f"<p>{self.BODY} Read more</p>"))
+    
+    def test_body_budget(self):
+        """測試內嵌全文與頁面解析使用相同的 2000 字上限"""
+        content = self.crawler._parse_feed_body(f"<p>{self.BODY * 20}</p>")
+        self.assertEqual(len(content), 2000)
+
 class TestFetchArticlesFunction(unittest.TestCase):
     """測試便利函數"""
     
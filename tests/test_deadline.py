@@ -0,0 +1,133 @@
+"""
+請求期限模組單元測試
+"""
+
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from crawler import TechOrangeCrawler
+from deadline import Deadline, MIN_TIMEOUT, ensure_deadline
+from line_handler import LINENewsBot
+from rate_limit import RateLimiter
+from search_index import InvertedIndex
+from summarizer import GeminiSummarizer
+
+
+class TestDeadline(unittest.TestCase):
+
+    def test_unlimited(self):
+        """測試未設定預算時不限制"""
+        deadline = ensure_deadline(None)
+        self.assertEqual(deadline.remaining(), float('inf'))
+        self.assertFalse(deadline.expired())
+        self.assertEqual(deadline.timeout(15), 15)
+        self.assertIsNone(deadline.wait_timeout())
+
+    def test_timeout_capped_by_remaining(self):
+        """測試逾時不超過剩餘時間，且不低於最短逾時"""
+        self.assertLessEqual(Deadline(5).timeout(15), 5)
+        self.assertEqual(Deadline(0.1).timeout(15), MIN_TIMEOUT)
+        self.assertLessEqual(Deadline(5).wait_timeout(), 5)
+
+    def test_reserve_shares_degraded(self):
+        """測試子期限提早到期並共用降級記錄"""
+        deadline = Deadline(10)
+        child = deadline.reserve(3)
+
+        self.assertLess(child.remaining(), deadline.remaining() - 2.9)
+        child.degrade("測試降級")
+        self.assertEqual(deadline.degraded, ["測試降級"])
+
+    def test_expired(self):
+        """測試過期判斷"""
+        deadline = Deadline(0.01)
+        time.sleep(0.02)
+        self.assertTrue(deadline.expired())
+        self.assertFalse(deadline.allows(0))
+
+    @patch.dict('os.environ', {'REQUEST_DEADLINE': '0'})
+    def test_from_env_zero_is_unlimited(self):
+        """測試 REQUEST_DEADLINE=0 不限制"""
+        self.assertIsNone(Deadline.from_env().expires_at)
+
+
+class TestDeadlineDegradation(unittest.TestCase):
+
+    @patch.object(TechOrangeCrawler, '_fetch_from_rss', return_value=[])
+    @patch.object(TechOrangeCrawler, '_fetch_from_search', return_value=[])
+    def test_crawler_skips_gemini_and_search(self, mock_search, mock_rss):
+        """測試時間不足時不呼叫 Gemini 擴展，到期後略過網站搜尋"""
+        crawler = TechOrangeCrawler()
+        crawler.index = InvertedIndex()
+        crawler.gemini_model = Mock()
+        deadline = Deadline(0.01)
+        time.sleep(0.02)
+
+        self.assertEqual(crawler.fetch_articles("AI", 3, deadline=deadline), [])
+
+        crawler.gemini_model.generate_content.assert_not_called()
+        self.assertIn("人工智慧", mock_rss.call_args.kwargs['fuzzy_keywords'])
+        mock_search.assert_not_called()
+        self.assertEqual(len(deadline.degraded), 2)
+
+    def test_summarizer_falls_back_to_description(self):
+        """測試時間不足時以文章描述或開頭作為摘要"""
+        summarizer = GeminiSummarizer.__new__(GeminiSummarizer)
+        summarizer.model = Mock()
+        articles = [
+            {'title': "A", 'content': "內容" * 100, 'description': "文章描述"},
+            {'title': "B", 'content': "短內容"},
+        ]
+
+        results = summarizer.summarize_articles(articles, deadline=Deadline(1))
+
+        summarizer.model.generate_content.assert_not_called()
+        self.assertEqual(results[0]['summary'], "文章描述")
+        self.assertEqual(results[1]['summary'], "短內容")
+
+    @patch('crawler.requests.Session.get')
+    def test_crawled_articles_carry_feed_description(self, mock_get):
+        """測試爬蟲回傳的文章帶有 feed 描述，摘要時間不足時使用該描述"""
+        body = "人工智慧技術持續進步，在各領域都有重大突破。" * 10
+        response = Mock()
+        response.status_code = 200
+        response.headers = {}
+        response.content = f"""<?xml version="1.0"?>
+        <rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel><item>
+            <title>AI 技術的最新發展</title>
+            <link>https://buzzorange.com/techorange/ai</link>
+            <description><![CDATA[<p>AI 技術的 <b>最新</b> 發展摘要</p>]]></description>
+            <content:encoded><![CDATA[<p>{body}</p>]]></content:encoded>
+        </item></channel></rss>"""
+        mock_get.return_value = response
+        crawler = TechOrangeCrawler()
+        crawler.store = None
+
+        articles = crawler.fetch_random_articles(1)
+
+        self.assertEqual(articles[0]['description'], "AI 技術的最新發展摘要")
+        summarizer = GeminiSummarizer.__new__(GeminiSummarizer)
+        summarizer.model = Mock()
+        results = summarizer.summarize_articles(articles, deadline=Deadline(1))
+        self.assertEqual(results[0]['summary'], "AI 技術的最新發展摘要")
+
+    @patch('rate_limit.time.sleep')
+    def test_line_combines_remaining_articles(self, mock_sleep):
+        """測試時間不足以逐篇推送時，其餘文章合併為一則訊息"""
+        bot = LINENewsBot.__new__(LINENewsBot)
+        bot.line_bot_api = Mock()
+        bot.rate_limiter = RateLimiter({})
+        articles = [{'title': f"文章 {i}", 'url': f"https://test.com/{i}", 'summary': "摘要"} for i in range(3)]
+
+        bot.send_article_results("user", articles, "AI", deadline=Deadline(2))
+
+        # 總結訊息加上一則合併訊息
+        self.assertEqual(bot.line_bot_api.push_message.call_count, 2)
+        combined = bot.line_bot_api.push_message.call_args.args[1]
+        self.assertIn("文章 2", combined.text)
+        self.assertIn('timeout', bot.line_bot_api.push_message.call_args.kwargs)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
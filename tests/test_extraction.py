@@ -0,0 +1,138 @@
+"""
+文章擷取後端單元測試
+"""
+
+import glob
+import os
+import unittest
+
+from crawler import TechOrangeCrawler
+from extraction import BaseExtractor, LxmlExtractor, SoupExtractor, get_extractor
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'benchmarks', 'fixtures', 'pages')
+
+BODY = "人工智慧技術持續進步，在各領域都有重大突破。" * 10
+
+
+class TestExtractionBackends(unittest.TestCase):
+    """lxml 後端的輸出必須與 BeautifulSoup 後端相同"""
+
+    def setUp(self):
+        self.soup = SoupExtractor()
+        self.lxml = LxmlExtractor()
+
+    def assertSameArticle(self, html):
+        expected = self.soup.parse_article(html)
+        self.assertEqual(self.lxml.parse_article(html), expected)
+        return expected
+
+    def test_fixture_pages(self):
+        """測試頁面樣本的解析結果一致"""
+        paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html')))
+        self.assertTrue(paths)
+        for path in paths:
+            with open(path, 'rb') as f:
+                article = self.assertSameArticle(f.read())
+            self.assertIsNotNone(article['title'])
+            self.assertIsNotNone(article['canonical_url'])
+            self.assertEqual(len(article['content']), 2000)
+
+    def test_noise_and_comments_removed(self):
+        """測試移除頁首、側欄、script 與註解"""
+        html = (f"<html><body><header><h1>網站標題名稱</h1></header><aside>側欄</aside>"
+                f"<article><!-- 廣告 --><script>track()</script><p>{BODY}</p></article></body></html>")
+        article = self.assertSameArticle(html)
+        self.assertEqual(article['title'], "網站標題名稱")
+        self.assertEqual(article['content'], BODY)
+
+    def test_short_and_empty_pages(self):
+        """測試內容不足與空白頁面"""
+        self.assertIsNone(self.assertSameArticle("<html><body><p>太短</p></body></html>"))
+        self.assertIsNone(self.lxml.parse_article(b""))
+
+    def test_declared_charset(self):
+        """測試依 meta 宣告的編碼解碼 bytes"""
+        html = (f'<html><head><meta charset="big5"></head><body>'
+                f'<div class="entry-content">{BODY}</div></body></html>').encode('big5')
+        self.assertEqual(self.assertSameArticle(html)['content'], BODY)
+
+    def test_fragment_text(self):
+        """測試 HTML 片段轉純文字"""
+        html = "<p>AI &#8211; 新聞</p><script>x()</script><iframe>廣告</iframe>"
+        self.assertEqual(self.lxml.fragment_text(html), self.soup.fragment_text(html))
+        self.assertEqual(self.lxml.fragment_text(html), "AI – 新聞")
+        self.assertEqual(self.lxml.fragment_text(""), "")
+
+    def test_search_links(self):
+        """測試搜尋結果連結擷取"""
+        html = ("<html><body>"
+                "<h2 class='entry-title big'><a href='https://test.com/a/'>A</a></h2>"
+                "<h2 class='entry-title'><a href='/relative/'>B</a></h2>"
+                "<article><h3><a href='https://test.com/c/'>C</a></h3></article>"
+                "</body></html>")
+        self.assertEqual(self.lxml.search_links(html), ["https://test.com/a/"])
+        self.assertEqual(self.lxml.search_links(html), self.soup.search_links(html))
+
+    def test_get_extractor(self):
+        """測試依名稱選擇後端，未知名稱使用 lxml"""
+        self.assertIsInstance(get_extractor('bs4'), SoupExtractor)
+        self.assertIsInstance(get_extractor('unknown'), LxmlExtractor)
+
+    def test_incomplete_backend_cannot_be_created(self):
+        """測試缺少抽象方法的後端在建立時失敗"""
+        class PartialExtractor(BaseExtractor):
+            def _load(self, html):
+                return html
+
+        with self.assertRaises(TypeError):
+            PartialExtractor()
+
+
+class TestStreamingExtraction(unittest.TestCase):
+    """增量解析與串流下載"""
+
+    def setUp(self):
+        path = sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html')))[0]
+        with open(path, 'rb') as f:
+            self.page = f.read()
+        self.crawler = TechOrangeCrawler()
+        self.crawler.extractor = LxmlExtractor()
+
+    def chunks(self, data, consumed, size=16 * 1024):
+        for i in range(0, len(data), size):
+            consumed.append(size)
+            yield data[i:i + size]
+
+    def test_early_exit_matches_full_parse(self):
+        """測試內文足夠即停止，結果與解析完整頁面相同"""
+        consumed = []
+        parser = self.crawler.extractor.stream_parser()
+        received = self.crawler._feed_article_chunks(parser, self.chunks(self.page, consumed), 'test')
+
+        self.assertLess(received, len(self.page))
+        self.assertLess(len(consumed), len(self.page) // (16 * 1024))
+        self.assertEqual(parser.close(), SoupExtractor().parse_article(self.page))
+
+    def test_byte_ceiling(self):
+        """測試超過位元組上限即停止讀取"""
+        self.crawler.max_article_bytes = 64 * 1024
+        huge = b"<html><body>" + b"<p>" + "廣告".encode('utf-8') * 10000 + b"</p>" * 200
+        consumed = []
+        parser = self.crawler.extractor.stream_parser()
+
+        received = self.crawler._feed_article_chunks(parser, self.chunks(huge * 10, consumed), 'test')
+
+        self.assertEqual(received, 64 * 1024)
+        self.assertEqual(len(consumed), 4)
+
+    def test_buffered_parser_for_soup_backend(self):
+        """測試不支援增量解析的後端仍可串流接收"""
+        parser = SoupExtractor().stream_parser()
+        for i in range(0, len(self.page), 4096):
+            self.assertFalse(parser.feed(self.page[i:i + 4096]))
+        self.assertEqual(parser.close(), SoupExtractor().parse_article(self.page))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,135 @@
+"""
+RSS Feed 快取模組單元測試
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+import requests
+from feed_cache import FeedSnapshot, get_feed_snapshot, reset_feed_snapshots
+
+RSS_CONTENT = """<?xml version="1.0"?>
+<rss version="2.0">
+    <channel>
+        <item>
+            <title>AI 技術的最新發展</title>
+            <link>https://buzzorange.com/techorange/test1</link>
+        </item>
+    </channel>
+</rss>"""
+
+
+def make_response(status_code=200, content=RSS_CONTENT, headers=None):
+    """建立模擬的 HTTP 回應"""
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    response.raise_for_status.return_value = None
+    return response
+
+
+class TestFeedSnapshot(unittest.TestCase):
+
+    def test_hit_within_ttl(self):
+        """測試 TTL 內不重新下載"""
+        session = Mock()
+        session.get.return_value = make_response()
+        snapshot = FeedSnapshot("https://test.com/feed/", ttl=60)
+
+        first = snapshot.get_entries(session=session)
+        second = snapshot.get_entries(session=session)
+
+        self.assertEqual(len(first), 1)
+        self.assertIs(first, second)
+        self.assertEqual(session.get.call_count, 1)
+        stats = snapshot.get_stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+
+    def test_conditional_revalidation(self):
+        """測試過期後以 ETag 條件式請求並處理 304"""
+        session = Mock()
+        session.get.side_effect = [
+            make_response(headers={'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}),
+            make_response(status_code=304, content=b''),
+        ]
+        snapshot = FeedSnapshot("https://test.com/feed/", ttl=0)
+
+        snapshot.get_entries(session=session)
+        entries = snapshot.get_entries(session=session)
+
+        self.assertEqual(len(entries), 1)
+        sent_headers = session.get.call_args_list[1].kwargs['headers']
+        self.assertEqual(sent_headers['If-None-Match'], '"abc"')
+        self.assertIn('If-Modified-Since', sent_headers)
+        stats = snapshot.get_stats()
+        self.assertEqual(stats['revalidations'], 1)
+        self.assertEqual(stats['not_modified'], 1)
+
+    def test_single_flight_refresh(self):
+        """測試同時呼叫只發送一次請求"""
+        def slow_get(*args, **kwargs):
+            time.sleep(0.2)
+            return make_response()
+
+        session = Mock()
+        session.get.side_effect = slow_get
+        snapshot = FeedSnapshot("https://test.com/feed/", ttl=60)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(snapshot.get_entries(session=session)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(session.get.call_count, 1)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(snapshot.get_stats()['coalesced'], 4)
+
+    def test_refresh_error_propagates(self):
+        """測試刷新失敗時拋出例外"""
+        session = Mock()
+        session.get.side_effect = requests.RequestException("Network error")
+        snapshot = FeedSnapshot("https://test.com/feed/", ttl=60)
+
+        with self.assertRaises(requests.RequestException):
+            snapshot.get_entries(session=session)
+        self.assertEqual(snapshot.get_stats()['errors'], 1)
+
+    def test_stale_snapshot_served_on_error(self):
+        """測試刷新失敗但已有快照時沿用過期的快照"""
+        session = Mock()
+        session.get.side_effect = [make_response(), requests.ConnectionError("down")]
+        snapshot = FeedSnapshot("https://test.com/feed/", ttl=60)
+
+        first = snapshot.get_entries(session=session)
+        snapshot.invalidate()
+        second = snapshot.get_entries(session=session)
+
+        self.assertIs(first, second)
+        stats = snapshot.get_stats()
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['stale'], 1)
+
+
+class TestSnapshotRegistry(unittest.TestCase):
+
+    def tearDown(self):
+        reset_feed_snapshots()
+
+    def test_shared_instance(self):
+        """測試同一網址共用快照"""
+        first = get_feed_snapshot("https://test.com/feed/")
+        second = get_feed_snapshot("https://test.com/feed/")
+        self.assertIs(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
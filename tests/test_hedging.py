@@ -0,0 +1,126 @@
+"""
+請求對沖模組單元測試
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+import unittest
+
+from hedging import RequestHedger
+
+URL = "https://buzzorange.com/techorange/a/"
+
+
+def seed(hedger, latency=0.01, count=20):
+    """為主機填入延遲樣本"""
+    for _ in range(count):
+        hedger.record_latency(URL, latency)
+
+
+class SlowFirstCall:
+    """第一次呼叫很慢、之後立即完成的請求函數"""
+
+    def __init__(self, slow=1.0):
+        self.slow = slow
+        self.calls = itertools.count()
+        self.lock = threading.Lock()
+
+    def __call__(self, url):
+        with self.lock:
+            call = next(self.calls)
+        if call == 0:
+            time.sleep(self.slow)
+            return 'primary'
+        return 'hedge'
+
+
+class TestRequestHedger(unittest.TestCase):
+
+    def test_percentile_threshold(self):
+        """測試以主機延遲的 p90 作為對沖門檻，樣本不足時不對沖"""
+        hedger = RequestHedger(min_samples=10)
+        self.assertIsNone(hedger.hedge_delay(URL))
+
+        for i in range(1, 11):
+            hedger.record_latency(URL, i / 10)
+
+        self.assertAlmostEqual(hedger.hedge_delay(URL), 0.9)
+        self.assertAlmostEqual(hedger.hedge_delay("https://www.buzzorange.com/other"), 0.9)
+
+    def test_hedge_wins_over_slow_primary(self):
+        """測試主要請求超過門檻時送出對沖請求並取先完成者"""
+        hedger = RequestHedger(max_rate=1.0)
+        seed(hedger)
+
+        start = time.monotonic()
+        result = hedger.run(SlowFirstCall(), URL)
+
+        self.assertEqual(result, 'hedge')
+        self.assertLess(time.monotonic() - start, 0.5)
+        stats = hedger.get_stats()
+        self.assertEqual(stats['hedged'], 1)
+        self.assertEqual(stats['hedge_wins'], 1)
+        self.assertEqual(stats['hedge_win_rate'], 1.0)
+
+    def test_hedge_rate_cap(self):
+        """測試超過全域比例上限時不送出對沖請求"""
+        hedger = RequestHedger(max_rate=0.0)
+        seed(hedger)
+
+        result = hedger.run(SlowFirstCall(slow=0.2), URL)
+
+        self.assertEqual(result, 'primary')
+        self.assertEqual(hedger.get_stats()['suppressed'], 1)
+
+    def test_failed_hedge_falls_back_to_primary(self):
+        """測試對沖請求失敗時等待主要請求的結果"""
+        hedger = RequestHedger(max_rate=1.0)
+        seed(hedger)
+        calls = itertools.count()
+
+        def fetch(url):
+            if next(calls) == 0:
+                time.sleep(0.2)
+                return 'primary'
+            raise IOError("hedge failed")
+
+        self.assertEqual(hedger.run(fetch, URL), 'primary')
+        self.assertEqual(hedger.get_stats()['primary_wins'], 1)
+
+    def test_disabled_only_records_latency(self):
+        """測試停用時不對沖但仍記錄延遲"""
+        hedger = RequestHedger(enabled=False, min_samples=1)
+
+        self.assertEqual(hedger.run(lambda url: 'ok', URL), 'ok')
+
+        self.assertEqual(hedger.get_stats()['hedged'], 0)
+        self.assertIsNotNone(hedger.hedge_delay(URL))
+
+    def test_async_hedge(self):
+        """測試非同步請求的對沖與取消落後的請求"""
+        hedger = RequestHedger(max_rate=1.0)
+        seed(hedger)
+        calls = itertools.count()
+        cancelled = []
+
+        async def fetch(url):
+            if next(calls) == 0:
+                try:
+                    await asyncio.sleep(1.0)
+                except asyncio.CancelledError:
+                    cancelled.append(url)
+                    raise
+                return 'primary'
+            return 'hedge'
+
+        result = asyncio.run(hedger.run_async(fetch, URL))
+
+        self.assertEqual(result, 'hedge')
+        self.assertEqual(cancelled, [URL])
+        self.assertEqual(hedger.get_stats()['hedge_wins'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
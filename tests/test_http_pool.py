@@ -0,0 +1,89 @@
+"""
+HTTP 連線池模組單元測試
+"""
+
+import gzip
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from http_pool import PooledSession, get_http_session, get_line_session
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """支援 keep-alive 與 gzip 的測試伺服器"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = "科技報橘測試內容".encode('utf-8')
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header('Content-Encoding', 'gzip')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestPooledSession(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self.session = PooledSession(per_host=2)
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connection_reuse(self):
+        """測試連續請求重複使用同一條連線"""
+        for _ in range(5):
+            self.session.get(self.url, timeout=5)
+
+        stats = self.session.get_stats()
+        self.assertEqual(stats['requests'], 5)
+        self.assertEqual(stats['connections'], 1)
+        self.assertEqual(stats['reused'], 4)
+
+    def test_gzip_decoding(self):
+        """測試自動解碼 gzip 回應"""
+        response = self.session.get(self.url, timeout=5)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.text, "科技報橘測試內容")
+
+    def test_per_host_limit_under_threads(self):
+        """測試多執行緒下連線數不超過每主機上限"""
+        threads = [
+            threading.Thread(target=lambda: self.session.get(self.url, timeout=5))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = self.session.get_stats()
+        self.assertEqual(stats['requests'], 8)
+        self.assertLessEqual(stats['connections'], 2)
+
+
+    def test_line_session_is_separate(self):
+        """測試 LINE API 使用獨立的連線池，不套用爬蟲的斷路器"""
+        line_session = get_line_session()
+
+        self.assertIs(line_session, get_line_session())
+        self.assertIsNot(line_session, get_http_session())
+        self.assertIsNone(line_session.breakers)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
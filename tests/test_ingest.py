@@ -0,0 +1,99 @@
+"""
+背景擷取模組單元測試
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from article_store import ArticleStore
+from crawler import TechOrangeCrawler
+from feed_cache import FeedSnapshot
+from ingest import FeedIngestor
+from search_index import InvertedIndex
+
+FEED_URL = "https://test.com/feed/"
+
+
+def build_feed(count):
+    """建立包含 count 篇文章的 RSS"""
+    items = "".join(
+        f"""<item>
+            <title>AI 新聞 {i}</title>
+            <link>https://test.com/article/{i}/</link>
+            <guid>post-{i}</guid>
+            <category>人工智慧</category>
+            <pubDate>Mon, 0{i + 1} Jan 2024 00:00:00 GMT</pubDate>
+        </item>"""
+        for i in range(count)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'
+
+
+def make_response(content):
+    response = Mock()
+    response.status_code = 200
+    response.headers = {}
+    response.content = content
+    response.iter_content.return_value = [content.encode('utf-8')]
+    response.raise_for_status.return_value = None
+    return response
+
+
+class TestFeedIngestor(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.crawler = TechOrangeCrawler()
+        self.crawler.store = ArticleStore(os.path.join(self.temp_dir, 'articles.db'))
+        self.crawler.rss_url = FEED_URL
+        self.crawler.feed = FeedSnapshot(FEED_URL, ttl=60)
+        self.crawler.index = InvertedIndex()
+        self.ingestor = FeedIngestor(self.crawler, interval=60)
+        self.feed_size = 2
+        self.requested = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def fake_get(self, url, **kwargs):
+        self.requested.append(url)
+        if url == FEED_URL:
+            return make_response(build_feed(self.feed_size))
+        body = "人工智慧技術持續進步。" * 20
+        return make_response(f"<html><body><div class='entry-content'>{body}</div></body></html>")
+
+    @patch('crawler.requests.Session.get')
+    def test_only_new_entries_are_extracted(self, mock_get):
+        """測試只擷取新出現的 GUID"""
+        mock_get.side_effect = self.fake_get
+
+        self.assertEqual(self.ingestor.poll_once(), 2)
+        self.feed_size = 3
+        self.assertEqual(self.ingestor.poll_once(), 1)
+
+        article_requests = [url for url in self.requested if url != FEED_URL]
+        self.assertEqual(len(article_requests), 3)
+        self.assertEqual(self.crawler.store.get_stats()['corpus'], 3)
+
+    @patch('crawler.requests.Session.get')
+    def test_fetch_articles_answers_from_corpus(self, mock_get):
+        """測試查詢由語料回答，不需網路請求"""
+        mock_get.side_effect = self.fake_get
+        self.feed_size = 3
+        self.ingestor.poll_once()
+        self.requested.clear()
+
+        articles = self.crawler.fetch_articles("AI", 2)
+
+        self.assertEqual(len(articles), 2)
+        # 語料依發布時間由新到舊
+        self.assertEqual(articles[0]['title'], "AI 新聞 2")
+        self.assertEqual(articles[0]['url'], "https://test.com/article/2/")
+        self.assertEqual(self.requested, [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,100 @@
+"""
+模糊關鍵字快取模組單元測試
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from crawler import TechOrangeCrawler
+from keyword_cache import KeywordExpansionCache, normalize_keyword
+from search_index import InvertedIndex
+
+
+class TestKeywordExpansionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'keywords.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_normalize_keyword(self):
+        """測試關鍵字標準化"""
+        self.assertEqual(normalize_keyword("  ＡＩ   Chip "), "ai chip")
+
+    def test_hit_after_put(self):
+        """測試寫入後以標準化關鍵字命中"""
+        cache = KeywordExpansionCache(self.path, ttl=60)
+        self.assertIsNone(cache.get("AI"))
+        cache.put("AI", ["人工智慧", "machine learning"])
+
+        self.assertEqual(cache.get(" ai "), ["人工智慧", "machine learning"])
+        stats = cache.get_stats()
+        self.assertEqual(stats['memory_hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_shared_through_disk(self):
+        """測試不同實例（模擬不同 worker）經由 SQLite 共用"""
+        KeywordExpansionCache(self.path, ttl=60).put("AI", ["人工智慧"])
+
+        other = KeywordExpansionCache(self.path, ttl=60)
+        self.assertEqual(other.get("ai"), ["人工智慧"])
+        self.assertEqual(other.get_stats()['disk_hits'], 1)
+
+    def test_expired_entry_misses(self):
+        """測試過期的擴展結果不會命中"""
+        cache = KeywordExpansionCache(self.path, ttl=60)
+        cache.put("AI", ["人工智慧"])
+
+        with patch('keyword_cache.time.time', return_value=time.time() + 120):
+            self.assertIsNone(cache.get("AI"))
+            self.assertIsNone(KeywordExpansionCache(self.path, ttl=60).get("AI"))
+
+
+class TestCrawlerKeywordCache(unittest.TestCase):
+
+    def setUp(self):
+        self.crawler = TechOrangeCrawler()
+        self.crawler.index = InvertedIndex()
+        self.crawler.keyword_cache = KeywordExpansionCache(None, ttl=60)
+        self.crawler.gemini_model = Mock()
+        self.crawler.gemini_model.generate_content.return_value = Mock(text='["人工智慧", "machine learning"]')
+
+    def test_gemini_called_once_per_keyword(self):
+        """測試相同關鍵字只呼叫 Gemini 一次"""
+        first = self.crawler._generate_fuzzy_keywords("ai")
+        second = self.crawler._generate_fuzzy_keywords("AI")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.crawler.gemini_model.generate_content.call_count, 1)
+        stats = self.crawler.get_keyword_cache_stats()
+        self.assertEqual(stats['gemini_calls'], 1)
+        self.assertEqual(stats['gemini_calls_saved'], 1)
+
+    def test_failed_generation_is_not_cached(self):
+        """測試 Gemini 失敗時回退結果不寫入快取"""
+        self.crawler.gemini_model.generate_content.side_effect = Exception("quota")
+
+        self.crawler._generate_fuzzy_keywords("ai")
+        self.assertEqual(self.crawler.keyword_cache.get_stats()['writes'], 0)
+
+    @patch.object(TechOrangeCrawler, '_fetch_from_search', return_value=[])
+    @patch.object(TechOrangeCrawler, '_fetch_from_rss', return_value=[])
+    @patch.object(TechOrangeCrawler, '_generate_fuzzy_keywords', return_value=["人工智慧"])
+    def test_expansion_shared_within_request(self, mock_generate, mock_rss, mock_search):
+        """測試同一次請求中 RSS 與搜尋共用同一份擴展結果"""
+        self.crawler.fetch_articles("AI", 3)
+
+        mock_generate.assert_called_once_with("ai")
+        self.assertEqual(mock_rss.call_args.kwargs['fuzzy_keywords'], ["人工智慧"])
+        self.assertEqual(mock_search.call_args.kwargs['fuzzy_keywords'], ["人工智慧"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,70 @@
+"""
+多關鍵字比對模組單元測試
+"""
+
+import unittest
+
+from crawler import TechOrangeCrawler
+from keyword_matcher import AhoCorasickMatcher
+
+
+class TestAhoCorasickMatcher(unittest.TestCase):
+
+    def test_reports_every_occurrence(self):
+        """測試回報所有關鍵字與出現位置（含重疊）"""
+        matcher = AhoCorasickMatcher(["he", "she", "hers", "his"])
+
+        hits = matcher.search("ushers")
+
+        self.assertEqual(hits, {0: [2], 1: [1], 2: [2]})
+
+    def test_matches_naive_search(self):
+        """測試結果與逐一子字串搜尋相同"""
+        patterns = ["人工智慧", "智慧", "ai", "machine learning", "learn"]
+        text = "ai 與人工智慧：machine learning 讓智慧製造持續 learning"
+        matcher = AhoCorasickMatcher(patterns)
+
+        hits = matcher.search(text)
+
+        for index, pattern in enumerate(patterns):
+            expected = [i for i in range(len(text)) if text.startswith(pattern, i)]
+            self.assertEqual(hits.get(index, []), expected, pattern)
+
+    def test_duplicate_and_case(self):
+        """測試重複模式各自保留索引，模式轉為小寫"""
+        matcher = AhoCorasickMatcher(["AI", "ai"])
+        self.assertEqual(matcher.search("open ai"), {0: [5], 1: [5]})
+
+
+class TestTitleScoring(unittest.TestCase):
+
+    def setUp(self):
+        self.crawler = TechOrangeCrawler()
+        self.fuzzy = ["人工智慧", "機器學習", "深度學習", "neural network"]
+        self.matcher = self.crawler._build_title_matcher("ai", self.fuzzy)
+
+    def score(self, title):
+        return self.crawler._calculate_match_score(title, "ai", self.fuzzy, self.matcher)
+
+    def test_tiers(self):
+        """測試分數層級"""
+        self.assertEqual(self.score("openai 發表新模型"), 100)
+        self.assertEqual(self.score("人工智慧的未來"), 95)
+        self.assertEqual(self.score("深度學習入門"), 85)
+        self.assertEqual(self.score("neural network 101"), 70)
+        self.assertEqual(self.score("區塊鏈新聞"), 0)
+
+    def test_multiple_hits_bonus(self):
+        """測試多個關鍵字命中加分"""
+        self.assertEqual(self.score("人工智慧與機器學習"), 99)
+
+    def test_partial_keyword_match(self):
+        """測試主要關鍵字片段的部分匹配"""
+        fuzzy = []
+        matcher = self.crawler._build_title_matcher("cloud computing", fuzzy)
+        score = self.crawler._calculate_match_score("cloud 服務大戰", "cloud computing", fuzzy, matcher)
+        self.assertEqual(score, 50)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
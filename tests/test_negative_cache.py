@@ -0,0 +1,145 @@
+"""
+失敗 URL 快取單元測試
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+from urllib3.exceptions import ReadTimeoutError
+
+from crawler import TechOrangeCrawler
+from deadline import Deadline
+from negative_cache import DEFAULT_TTLS, NegativeCache, failure_class_for_status, parse_ttls
+
+URL = "https://buzzorange.com/techorange/dead/"
+
+
+class TestNegativeCache(unittest.TestCase):
+
+    def test_record_and_check(self):
+        """測試記錄後在有效期間內回傳失敗類型，並以標準化 URL 比對"""
+        cache = NegativeCache()
+        cache.record(URL, 'not_found')
+
+        self.assertEqual(cache.check(URL + "?utm_source=line"), 'not_found')
+        self.assertIsNone(cache.check("https://buzzorange.com/techorange/alive/"))
+
+    @patch('negative_cache.time.time')
+    def test_ttl_per_failure_class(self, mock_time):
+        """測試逾時的有效時間比 404 短"""
+        cache = NegativeCache()
+        mock_time.return_value = 1000.0
+        cache.record(URL, 'timeout')
+        cache.record(URL + "404", 'not_found')
+
+        mock_time.return_value = 1000.0 + DEFAULT_TTLS['timeout'] + 1
+        self.assertIsNone(cache.check(URL))
+        self.assertEqual(cache.check(URL + "404"), 'not_found')
+
+    def test_zero_ttl_not_recorded(self):
+        """測試 TTL 為 0 的類型只計數不記錄"""
+        cache = NegativeCache(parse_ttls('0'))
+        cache.record(URL, 'too_short')
+
+        self.assertIsNone(cache.check(URL))
+        self.assertEqual(cache.get_stats()['failures']['too_short'], 1)
+
+    def test_max_entries(self):
+        """測試超過上限時移除最早記錄的 URL"""
+        cache = NegativeCache(max_entries=2)
+        for i in range(3):
+            cache.record(f"{URL}{i}", 'not_found')
+
+        self.assertIsNone(cache.check(f"{URL}0"))
+        self.assertEqual(cache.get_stats()['entries'], 2)
+
+    def test_parse_ttls(self):
+        """測試解析 NEGATIVE_CACHE_TTLS 設定"""
+        ttls = parse_ttls('timeout=60, not_found=604800')
+        self.assertEqual(ttls['timeout'], 60)
+        self.assertEqual(ttls['not_found'], 604800)
+        self.assertEqual(ttls['too_short'], DEFAULT_TTLS['too_short'])
+
+    def test_failure_class_for_status(self):
+        """測試依 HTTP 狀態碼分類"""
+        self.assertEqual(failure_class_for_status(404), 'not_found')
+        self.assertEqual(failure_class_for_status(410), 'not_found')
+        self.assertEqual(failure_class_for_status(429), 'throttled')
+        self.assertEqual(failure_class_for_status(503), 'server_error')
+        self.assertEqual(failure_class_for_status(403), 'client_error')
+
+
+class TestCrawlerNegativeCache(unittest.TestCase):
+
+    def setUp(self):
+        self.crawler = TechOrangeCrawler()
+        self.crawler.store = None
+        self.crawler.negative_cache = NegativeCache()
+
+    @patch('crawler.requests.Session.get')
+    def test_not_found_skipped_on_next_query(self, mock_get):
+        """測試 404 的 URL 在下一次查詢時不再請求"""
+        mock_response = Mock()
+        mock_response.status_code = 404
+        mock_response.raise_for_status.side_effect = requests.HTTPError(response=mock_response)
+        mock_get.return_value = mock_response
+
+        self.assertIsNone(self.crawler._extract_article_content(URL))
+        self.assertIsNone(self.crawler._extract_article_content(URL))
+
+        self.assertEqual(mock_get.call_count, 1)
+        stats = self.crawler.get_negative_cache_stats()
+        self.assertEqual(stats['failures']['not_found'], 1)
+        self.assertEqual(stats['skipped']['not_found'], 1)
+
+    @patch('crawler.requests.Session.get')
+    def test_timeout_and_short_pages_classified(self, mock_get):
+        """測試逾時與內文不足分別記錄"""
+        short_page = Mock()
+        short_page.headers = {}
+        short_page.iter_content.return_value = [b"<html><body><div class='entry-content'>short</div></body></html>"]
+        mock_get.side_effect = [requests.Timeout("timed out"), short_page]
+
+        self.crawler._extract_article_content(URL + "slow")
+        self.crawler._extract_article_content(URL + "short")
+
+        self.assertEqual(self.crawler.negative_cache.check(URL + "slow"), 'timeout')
+        self.assertEqual(self.crawler.negative_cache.check(URL + "short"), 'too_short')
+
+    @patch('crawler.requests.Session.get')
+    def test_deadline_limited_timeout_not_cached(self, mock_get):
+        """測試逾時因請求期限縮短時，逾時失敗不記錄"""
+        mock_get.side_effect = requests.Timeout("timed out")
+
+        self.assertIsNone(self.crawler._fetch_article(URL, Deadline(2)))
+        self.assertIsNone(self.crawler.negative_cache.check(URL))
+
+    @patch('crawler.requests.Session.get')
+    def test_body_read_timeout_classified_as_timeout(self, mock_get):
+        """測試讀取內文逾時（包成 ConnectionError）視為逾時，期限縮短時不記錄"""
+        stalled = Mock()
+        stalled.headers = {}
+        stalled.iter_content.side_effect = requests.ConnectionError(
+            ReadTimeoutError(None, URL, "Read timed out.")
+        )
+        mock_get.return_value = stalled
+
+        self.assertIsNone(self.crawler._fetch_article(URL, Deadline(2)))
+        self.assertIsNone(self.crawler.negative_cache.check(URL))
+
+        self.crawler._extract_article_content(URL)
+        self.assertEqual(self.crawler.negative_cache.check(URL), 'timeout')
+
+    @patch('crawler.requests.Session.get')
+    def test_parse_errors_not_cached(self, mock_get):
+        """測試非網路錯誤不記錄"""
+        mock_get.side_effect = ValueError("unexpected")
+
+        self.crawler._extract_article_content(URL)
+
+        self.assertIsNone(self.crawler.negative_cache.check(URL))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
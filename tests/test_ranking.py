@@ -0,0 +1,76 @@
+"""
+BM25 排名模組單元測試
+"""
+
+import unittest
+
+from ranking import BM25Ranker, reciprocal_rank_fusion
+from search_index import InvertedIndex
+
+DAY = 86400
+NOW = 1_700_000_000
+
+
+class TestBM25Ranker(unittest.TestCase):
+
+    def setUp(self):
+        self.index = InvertedIndex()
+        self.index.add('title_hit', "人工智慧新創募資", "新創公司完成募資", published_ts=NOW)
+        self.index.add('body_hit', "電動車市場", "特斯拉導入人工智慧自駕", published_ts=NOW)
+        self.index.add('other', "區塊鏈應用", "加密貨幣交易所", published_ts=NOW)
+        self.ranker = BM25Ranker(self.index)
+
+    def test_title_outranks_body(self):
+        """測試標題命中的分數高於內文命中"""
+        ranked = [doc_id for doc_id, _ in self.ranker.rank(["人工智慧"], now=NOW)]
+        self.assertEqual(ranked, ['title_hit', 'body_hit'])
+
+    def test_rare_terms_weigh_more(self):
+        """測試罕見詞的 idf 較高"""
+        for i in range(5):
+            self.index.add(f'filler{i}', "人工智慧週報", "人工智慧", published_ts=NOW)
+        common = self.ranker._idf("人工", len(self.index))
+        rare = self.ranker._idf("區塊", len(self.index))
+        self.assertGreater(rare, common)
+
+    def test_fuzzy_terms_down_weighted(self):
+        """測試模糊關鍵字權重較低"""
+        ranked = self.ranker.rank(["區塊鏈", "人工智慧"], weights=[1.0, 0.1], now=NOW)
+        self.assertEqual(ranked[0][0], 'other')
+
+    def test_recency_decay(self):
+        """測試同樣內容下較新的文章排名較前"""
+        index = InvertedIndex()
+        index.add('old', "人工智慧", "內容", published_ts=NOW - 90 * DAY)
+        index.add('new', "人工智慧", "內容", published_ts=NOW - DAY)
+        ranked = BM25Ranker(index, half_life_days=30).rank(["人工智慧"], now=NOW)
+        self.assertEqual([doc_id for doc_id, _ in ranked], ['new', 'old'])
+        self.assertGreater(ranked[0][1], ranked[1][1])
+
+    def test_no_candidates(self):
+        """測試沒有候選文章時回傳空列表"""
+        self.assertEqual(self.ranker.rank(["量子電腦"], now=NOW), [])
+
+
+class TestReciprocalRankFusion(unittest.TestCase):
+
+    def test_items_in_several_lists_rank_higher(self):
+        """測試出現在多個列表的項目分數較高，且只保留一份"""
+        fused = reciprocal_rank_fusion([['a', 'b'], ['c', 'b'], ['b']], key=str)
+        self.assertEqual(fused, ['b', 'a', 'c'])
+
+    def test_ties_prefer_earlier_list(self):
+        """測試同分時名次相同者以列表順序決定"""
+        fused = reciprocal_rank_fusion([['a', 'b'], ['c', 'd']], key=str)
+        self.assertEqual(fused, ['a', 'c', 'b', 'd'])
+
+    def test_key_merges_equivalent_items(self):
+        """測試以鍵合併等價項目並保留第一次出現的版本"""
+        first = {'url': 'https://example.com/a/', 'source': 'first'}
+        second = {'url': 'https://example.com/a', 'source': 'second'}
+        fused = reciprocal_rank_fusion([[first], [second]], key=lambda item: item['url'].rstrip('/'))
+        self.assertEqual(fused, [first])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
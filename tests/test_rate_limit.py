@@ -0,0 +1,92 @@
+"""
+速率限制模組單元測試
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from rate_limit import RateLimiter, TokenBucket, parse_rate
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_does_not_wait(self):
+        """測試額度內的請求不需等待"""
+        bucket = TokenBucket(rate=1, burst=3)
+        waits = [bucket.reserve() for _ in range(3)]
+        self.assertEqual(waits, [0.0, 0.0, 0.0])
+
+    def test_waits_only_when_over_budget(self):
+        """測試超出額度時依速率排隊"""
+        bucket = TokenBucket(rate=10, burst=1)
+        bucket.reserve()
+        second = bucket.reserve()
+        third = bucket.reserve()
+
+        self.assertAlmostEqual(second, 0.1, delta=0.01)
+        self.assertAlmostEqual(third, 0.2, delta=0.01)
+
+    def test_concurrent_acquire_respects_rate(self):
+        """測試多執行緒同時取得時總耗時符合速率"""
+        bucket = TokenBucket(rate=50, burst=1)
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+        self.assertEqual(bucket.get_stats()['waited'], 5)
+
+    def test_wait_histogram(self):
+        """測試等待時間分布"""
+        bucket = TokenBucket(rate=4, burst=1)
+        bucket.reserve()
+        bucket.reserve()
+
+        histogram = bucket.get_stats()['wait_histogram']
+        self.assertEqual(histogram['<=0s'], 1)
+        self.assertEqual(histogram['<=0.25s'], 1)
+        self.assertEqual(sum(histogram.values()), 2)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_parse_rate(self):
+        """測試速率設定格式"""
+        self.assertEqual(parse_rate("0.5:4"), (0.5, 4))
+        self.assertEqual(parse_rate("2"), (2.0, 1))
+
+    def test_key_for_url(self):
+        """測試以主機名稱作為鍵"""
+        self.assertEqual(RateLimiter.key_for_url("https://www.buzzorange.com/techorange/?s=ai"), "buzzorange.com")
+
+    def test_unconfigured_key_is_unlimited(self):
+        """測試未設定或速率為 0 的鍵不限制"""
+        limiter = RateLimiter({'gemini': (0, 1)})
+        self.assertEqual([limiter.reserve('gemini') for _ in range(5)], [0.0] * 5)
+        self.assertEqual(limiter.reserve('example.com'), 0.0)
+        self.assertEqual(limiter.get_stats(), {})
+
+    @patch('rate_limit.time.sleep')
+    def test_line_pushes_without_fixed_delay(self, mock_sleep):
+        """測試 LINE 推送在額度內不再固定等待"""
+        from line_handler import LINENewsBot
+
+        bot = LINENewsBot.__new__(LINENewsBot)
+        bot.line_bot_api = Mock()
+        bot.rate_limiter = RateLimiter({'line_push': (2, 5)})
+        articles = [{'title': f"文章 {i}", 'url': f"https://test.com/{i}", 'summary': "摘要"} for i in range(3)]
+
+        bot.send_article_results("user", articles, "AI")
+
+        self.assertEqual(bot.line_bot_api.push_message.call_count, 4)
+        mock_sleep.assert_not_called()
+        self.assertEqual(bot.rate_limiter.get_stats()['line_push']['acquired'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,143 @@
+"""
+HTTP 錄製／重播模組單元測試
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from crawler import TechOrangeCrawler
+from http_pool import PooledSession
+from replay import HttpArchive, ReplayAdapter, install_transport, request_key
+from search_index import InvertedIndex
+
+FIXTURE_ARCHIVE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'benchmarks', 'fixtures', 'archive')
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """回傳固定內容與 ETag 的測試伺服器"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = f"<rss>{self.path}</rss>".encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml; charset=UTF-8')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestRecordReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/feed/?b=2&a=1"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def record(self):
+        session = PooledSession()
+        install_transport(session, mode='record', archive_path=self.temp_dir)
+        response = session.get(self.url, timeout=5)
+        session.close()
+        return response
+
+    def replay_session(self, latency=0.0):
+        session = requests.Session()
+        adapter = install_transport(session, mode='replay', archive_path=self.temp_dir, latency=latency)
+        return session, adapter
+
+    def test_request_key_sorts_query(self):
+        """測試查詢參數順序不影響鍵"""
+        self.assertEqual(request_key('get', 'https://A.com/p?b=2&a=1#x'), 'GET https://a.com/p?a=1&b=2')
+
+    def test_replay_without_server(self):
+        """測試關閉伺服器後仍可從封存重播狀態碼、標頭與內容"""
+        recorded = self.record()
+        self.server.shutdown()
+
+        session, adapter = self.replay_session()
+        response = session.get(self.url, timeout=5)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, recorded.content)
+        self.assertEqual(response.headers['ETag'], '"v1"')
+        self.assertEqual(response.encoding, 'UTF-8')
+        self.assertEqual(adapter.get_stats()['hits'], 1)
+
+    def test_streamed_replay(self):
+        """測試串流讀取重播的內容"""
+        recorded = self.record()
+        session, _ = self.replay_session()
+
+        with session.get(self.url, timeout=5, stream=True) as response:
+            self.assertEqual(b''.join(response.iter_content(4)), recorded.content)
+
+    def test_conditional_request_returns_304(self):
+        """測試 If-None-Match 與錄製的 ETag 相同時回傳 304"""
+        self.record()
+        session, adapter = self.replay_session()
+
+        response = session.get(self.url, headers={'If-None-Match': '"v1"'}, timeout=5)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(adapter.get_stats()['not_modified'], 1)
+
+    def test_miss_returns_404(self):
+        """測試沒有錄製的請求回傳 404"""
+        self.record()
+        session, adapter = self.replay_session()
+
+        self.assertEqual(session.get(self.url + "&c=3", timeout=5).status_code, 404)
+        self.assertEqual(adapter.get_stats()['misses'], 1)
+
+    def test_recorded_latency(self):
+        """測試依錄製耗時與倍數等待"""
+        archive = HttpArchive(self.temp_dir)
+        archive.add('GET', 'https://example.com/', 200, {}, b'ok', elapsed=0.2)
+        session = requests.Session()
+        session.mount('https://', ReplayAdapter(archive, latency=0.5))
+
+        start = time.monotonic()
+        session.get('https://example.com/', timeout=5)
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+
+class TestCrawlerReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.session = PooledSession()
+        install_transport(self.session, mode='replay', archive_path=FIXTURE_ARCHIVE)
+        self.crawler = TechOrangeCrawler()
+        self.crawler.session = self.session
+        self.crawler.index = InvertedIndex()
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_fetch_random_articles_offline(self):
+        """測試以封存的 feed 與文章頁面離線擷取文章"""
+        articles = self.crawler.fetch_random_articles(3)
+
+        self.assertEqual(len(articles), 3)
+        self.assertTrue(all(len(article['content']) > 100 for article in articles))
+        self.assertEqual(self.session.get_adapter('https://').get_stats()['misses'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,147 @@
+"""
+WordPress REST API 搜尋後端單元測試
+"""
+
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from crawler import TechOrangeCrawler
+
+ARTICLE_BODY = "人工智慧技術持續進步，在各領域都有重大突破。" * 10
+TOTAL_POSTS = 7
+
+
+class WordPressHandler(BaseHTTPRequestHandler):
+    """模擬 WordPress REST API 與搜尋頁面的測試伺服器"""
+    protocol_version = 'HTTP/1.1'
+    api_enabled = True
+    requests_seen = []
+    delays = {}
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        type(self).requests_seen.append(self.path)
+
+        if parsed.path == '/wp-json/wp/v2/posts' and self.api_enabled:
+            time.sleep(self.delays.get(query['search'][0], 0))
+            page = int(query['page'][0])
+            per_page = int(query['per_page'][0])
+            posts = [
+                {
+                    'id': i,
+                    'link': f"{base}/post/{i}/",
+                    'title': {'rendered': f"AI &#8211; 新聞 {i}"},
+                    'content': {'rendered': f"<p>{ARTICLE_BODY}</p>"},
+                    'date': '2024-01-01T08:00:00'
+                }
+                for i in range(TOTAL_POSTS)
+            ][(page - 1) * per_page:page * per_page]
+            pages = -(-TOTAL_POSTS // per_page)
+            self.respond(200, json.dumps(posts), 'application/json', {'X-WP-TotalPages': str(pages)})
+        elif parsed.path == '/':
+            links = "".join(f"<h2 class='entry-title'><a href='{base}/html/{i}/'>文章</a></h2>" for i in range(2))
+            self.respond(200, f"<html><body>{links}</body></html>", 'text/html')
+        elif parsed.path.startswith('/html/'):
+            html = (f"<html><body><h1 class='entry-title'>網頁搜尋文章標題</h1>"
+                    f"<div class='entry-content'>{ARTICLE_BODY}</div></body></html>")
+            self.respond(200, html, 'text/html')
+        else:
+            self.respond(404, '{"code": "rest_no_route"}', 'application/json')
+
+    def respond(self, status, body, content_type, headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestSearchApi(unittest.TestCase):
+
+    def setUp(self):
+        WordPressHandler.api_enabled = True
+        WordPressHandler.requests_seen = []
+        WordPressHandler.delays = {}
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), WordPressHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        self.crawler = TechOrangeCrawler()
+        self.crawler.store = None
+        self.crawler.search_backend = 'api'
+        self.crawler.search_url = f"{base}/"
+        self.crawler.search_api_url = f"{base}/wp-json/wp/v2/posts"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_api_returns_titles_and_bodies(self):
+        """測試一次 API 回應即取得標題與內文，且只要求必要欄位"""
+        articles = self.crawler._search_via_api("AI", 2, set())
+
+        self.assertEqual([a['title'] for a in articles], ["AI – 新聞 0", "AI – 新聞 1"])
+        self.assertTrue(articles[0]['content'].startswith("人工智慧"))
+        self.assertEqual(len(WordPressHandler.requests_seen), 1)
+        query = parse_qs(urlparse(WordPressHandler.requests_seen[0]).query)
+        self.assertEqual(query['_fields'], ['id,link,title,content,date'])
+
+    def test_api_pagination(self):
+        """測試依 X-WP-TotalPages 翻頁並跳過已處理的文章"""
+        processed = set()
+        first = self.crawler._search_via_api("AI", 5, processed)
+        rest = self.crawler._search_via_api("AI", 10, processed)
+
+        self.assertEqual(len(first), 5)
+        self.assertEqual(len(rest), TOTAL_POSTS - 5)
+        self.assertEqual(len(processed), TOTAL_POSTS)
+
+    def test_fallback_to_html_when_api_unavailable(self):
+        """測試 API 無法使用時改用搜尋頁面"""
+        WordPressHandler.api_enabled = False
+
+        articles = self.crawler._fetch_from_search("AI", 2, fuzzy_keywords=[])
+
+        self.assertEqual([a['title'] for a in articles], ["網頁搜尋文章標題", "網頁搜尋文章標題"])
+        self.assertTrue(all('/html/' in a['url'] for a in articles))
+
+
+    def test_search_terms_queried_concurrently(self):
+        """測試各搜尋詞同時查詢，且結果依 URL 去除重複"""
+        terms = ["人工智慧", "機器學習", "深度學習"]
+        WordPressHandler.delays = {term: 0.3 for term in ["AI"] + terms}
+
+        start = time.monotonic()
+        articles = self.crawler._fetch_from_search("AI", 20, fuzzy_keywords=terms)
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.9)
+        self.assertEqual(len(WordPressHandler.requests_seen), 4)
+        self.assertEqual([a['title'] for a in articles], [f"AI – 新聞 {i}" for i in range(TOTAL_POSTS)])
+
+    def test_stops_waiting_once_enough_articles(self):
+        """測試確認足夠的不重複文章後不再等待較慢的搜尋詞"""
+        WordPressHandler.delays = {"慢速": 1.0}
+
+        start = time.monotonic()
+        articles = self.crawler._fetch_from_search("AI", 2, fuzzy_keywords=["慢速"])
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(len(articles), 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,86 @@
+"""
+文章倒排索引模組單元測試
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from article_store import ArticleStore
+from search_index import InvertedIndex, sync_index_from_store, tokenize
+
+
+class TestTokenize(unittest.TestCase):
+
+    def test_cjk_bigrams_and_latin_words(self):
+        """測試中文切為二元組、英文切為小寫字詞"""
+        self.assertEqual(tokenize("Open-AI 人工智慧"), ['open', 'ai', '人工', '工智', '智慧'])
+
+    def test_single_cjk_character(self):
+        """測試單一中文字保留為單字"""
+        self.assertEqual(tokenize("車 EV"), ['車', 'ev'])
+
+
+class TestInvertedIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = InvertedIndex()
+        self.index.add('a', "人工智慧新創募資", "AI 新創公司完成募資", url='https://test.com/a', published_ts=1)
+        self.index.add('b', "電動車市場", "特斯拉與人工智慧自駕", url='https://test.com/b', published_ts=2)
+        self.index.add('c', "區塊鏈應用", "加密貨幣交易所", url='https://test.com/c', published_ts=3)
+
+    def test_match_requires_all_bigrams(self):
+        """測試查詢詞需符合所有二元組"""
+        self.assertEqual(self.index.match("人工智慧"), {'a', 'b'})
+        self.assertEqual(self.index.match("智慧城市"), set())
+
+    def test_candidates_union(self):
+        """測試候選文章為各查詢詞結果的聯集"""
+        self.assertEqual(self.index.candidates(["募資", "區塊鏈"]), {'a', 'c'})
+
+    def test_remove_cleans_postings(self):
+        """測試移除文章後不再出現在結果中"""
+        self.assertTrue(self.index.remove('a'))
+        self.assertEqual(self.index.match("人工智慧"), {'b'})
+        self.assertEqual(self.index.match("募資"), set())
+        self.assertFalse(self.index.remove('a'))
+
+    def test_add_replaces_existing(self):
+        """測試重複新增會取代舊內容"""
+        self.index.add('c', "半導體", "晶片製程", url='https://test.com/c')
+        self.assertEqual(self.index.match("區塊鏈"), set())
+        self.assertEqual(self.index.match("晶片"), {'c'})
+        self.assertEqual(len(self.index), 3)
+
+
+class TestSyncFromStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ArticleStore(os.path.join(self.temp_dir, 'articles.db'))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def add_article(self, guid, title):
+        url = f"https://test.com/{guid}"
+        self.store.put(url, f"{title}的內容")
+        self.store.add_corpus_entry(guid, url, title, published_ts=time.time())
+
+    def test_incremental_sync(self):
+        """測試只同步新寫入的語料"""
+        index = InvertedIndex()
+        self.add_article('a', "人工智慧")
+        self.assertEqual(sync_index_from_store(index, self.store), 1)
+        self.assertEqual(sync_index_from_store(index, self.store), 0)
+
+        time.sleep(0.01)
+        self.add_article('b', "區塊鏈")
+        self.assertEqual(sync_index_from_store(index, self.store), 1)
+        self.assertEqual(index.match("區塊鏈"), {'b'})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
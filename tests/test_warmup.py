@@ -0,0 +1,161 @@
+"""
+連線預熱模組單元測試
+"""
+
+import os
+import socket
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+from http_pool import PooledSession
+from summarizer import GeminiSummarizer
+from warmup import ConnectionWarmer, DNSCache, get_dns_cache
+
+
+class HeadHandler(BaseHTTPRequestHandler):
+    """支援 keep-alive 的 HEAD 測試伺服器"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDNSCache(unittest.TestCase):
+
+    def setUp(self):
+        self.resolver = Mock(return_value=[(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', 443))])
+        self.cache = DNSCache(ttl=60)
+        self.cache._resolver = self.resolver
+
+    def test_hit_within_ttl(self):
+        """測試 TTL 內不重複查詢"""
+        first = self.cache.getaddrinfo('example.com', 443, 0, socket.SOCK_STREAM)
+        second = self.cache.getaddrinfo('example.com', 443, 0, socket.SOCK_STREAM)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.resolver.call_count, 1)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_expired_entry_is_resolved_again(self):
+        """測試過期後重新查詢"""
+        self.cache.getaddrinfo('example.com', 443)
+        with patch('warmup.time.monotonic', return_value=10 ** 9):
+            self.cache.getaddrinfo('example.com', 443)
+        self.assertEqual(self.resolver.call_count, 2)
+
+    def test_prefetch_matches_urllib3_lookup(self):
+        """測試預先解析的結果可被 urllib3 建立連線時的查詢命中"""
+        from urllib3.util.connection import allowed_gai_family
+
+        self.cache.resolve('example.com', 443)
+        self.cache.getaddrinfo('example.com', 443, allowed_gai_family(), socket.SOCK_STREAM)
+
+        self.assertEqual(self.resolver.call_count, 1)
+        self.assertEqual(self.cache.get_stats()['hits'], 1)
+
+    def test_install_and_uninstall(self):
+        """測試安裝後取代 socket.getaddrinfo，移除後還原"""
+        original = socket.getaddrinfo
+        cache = DNSCache(ttl=60)
+        cache.install()
+        try:
+            self.assertEqual(socket.getaddrinfo, cache.getaddrinfo)
+            socket.getaddrinfo('localhost', 80)
+        finally:
+            cache.uninstall()
+        self.assertIs(socket.getaddrinfo, original)
+
+    def test_disabled_by_default(self):
+        """測試未設定 DNS_CACHE_TTL 時不取代 socket.getaddrinfo"""
+        original = socket.getaddrinfo
+        with patch.dict(os.environ):
+            os.environ.pop('DNS_CACHE_TTL', None)
+            self.assertIsNone(get_dns_cache())
+        self.assertIs(socket.getaddrinfo, original)
+
+
+class TestConnectionWarmer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), HeadHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self.session = PooledSession(per_host=2)
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_warm_once_opens_reusable_connection(self):
+        """測試預熱後的請求重複使用已建立的連線"""
+        warmer = ConnectionWarmer(session=self.session, targets={'local': self.url},
+                                  interval=60, dns_cache=DNSCache(ttl=60))
+        upstreams = warmer.warm_once()
+
+        self.assertIn('local', upstreams)
+        self.assertGreaterEqual(upstreams['local']['saved'], 0.0)
+        self.session.get(self.url, timeout=5)
+        self.assertEqual(self.session.get_stats()['connections'], 1)
+
+    def test_target_uses_its_own_session(self):
+        """測試指定連線池的上游經由該連線池預熱"""
+        line_session = PooledSession(per_host=2)
+        self.addCleanup(line_session.close)
+        warmer = ConnectionWarmer(session=self.session, targets={'line': self.url},
+                                  interval=60, dns_cache=DNSCache(ttl=60), sessions={'line': line_session})
+        warmer.warm_once()
+
+        self.assertEqual(line_session.get_stats()['requests'], 2)
+        self.assertEqual(self.session.get_stats()['requests'], 0)
+
+    def test_refresh_keeps_first_measurement(self):
+        """測試刷新只更新最近延遲，不重新估算省下的時間"""
+        probe = Mock()
+        warmer = ConnectionWarmer(session=self.session, targets={}, probes={'sdk': probe},
+                                  interval=60, dns_cache=DNSCache(ttl=60))
+        first = warmer.warm_once()['sdk']
+        second = warmer.warm_once()['sdk']
+
+        # 第一次預熱送出冷、熱兩次請求，之後每輪一次
+        self.assertEqual(probe.call_count, 3)
+        self.assertEqual(first['saved'], second['saved'])
+        self.assertEqual(warmer.get_stats()['rounds'], 2)
+
+    def test_failure_is_counted(self):
+        """測試上游無法連線時只記錄錯誤"""
+        warmer = ConnectionWarmer(session=self.session, targets={},
+                                  probes={'down': Mock(side_effect=ConnectionError("down"))},
+                                  interval=60, dns_cache=DNSCache(ttl=60))
+
+        self.assertEqual(warmer.warm_once(), {})
+        self.assertEqual(warmer.get_stats()['errors'], 1)
+
+
+
+class TestSummarizerWarmUp(unittest.TestCase):
+
+    @patch('summarizer.genai.configure')
+    @patch('summarizer.genai.GenerativeModel')
+    def test_warm_up_uses_rate_limiter(self, mock_model_class, mock_configure):
+        """測試 Gemini 預熱的 count_tokens 經過 gemini 速率限制"""
+        mock_model_class.return_value = Mock()
+        summarizer = GeminiSummarizer(api_key="test_api_key")
+        summarizer.rate_limiter = Mock()
+
+        summarizer.warm_up()
+
+        summarizer.rate_limiter.acquire.assert_called_once_with('gemini')
+        summarizer.model.count_tokens.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
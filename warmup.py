@@ -0,0 +1,301 @@
+"""
+連線預熱模組
+啟動時先解析上游主機（TechOrange、LINE API、Gemini）的 DNS（啟用 DNS 快取時一併快取），
+再透過共用連線池建立 keep-alive 連線，之後定期刷新，避免閒置後第一個使用者請求
+需要重新進行 DNS 查詢與 TLS 交握；並統計預熱省下的交握時間
+
+設定由環境變數決定：
+    WARMUP_INTERVAL  刷新間隔秒數（預設 120，0 表示停用預熱）
+    DNS_CACHE_TTL    DNS 快取存活秒數（預設 0 表示不快取；啟用時會取代整個行程的 socket.getaddrinfo）
+"""
+
+import os
+import socket
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from urllib3.util.connection import allowed_gai_family
+
+from http_pool import get_http_session, get_line_session
+from rate_limit import RateLimiter, get_rate_limiter
+
+# 設置日誌
+logger = logging.getLogger(__name__)
+
+# 預設預熱的上游服務
+DEFAULT_TARGETS = {
+    'techorange': 'https://buzzorange.com/techorange/',
+    'line': 'https://api.line.me/',
+    'gemini': 'https://generativelanguage.googleapis.com/',
+}
+
+# 預熱請求的逾時秒數
+WARMUP_TIMEOUT = 5
+
+
+class DNSCache:
+    """
+    行程內 DNS 快取
+
+    功能：
+    - 取代 socket.getaddrinfo，TTL 內直接回傳快取的解析結果
+      （urllib3 與 aiohttp 的預設解析器都經由 socket.getaddrinfo）
+    - 預先解析指定主機，並在刷新時更新快取
+    - 統計命中、未命中與省下的查詢時間
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 256):
+        """
+        初始化 DNS 快取
+
+        Args:
+            ttl: 解析結果的存活秒數
+            max_entries: 最多快取的查詢數，超過時清除最舊的項目
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._resolver = socket.getaddrinfo
+        self._installed = False
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'prefetches': 0, 'lookup_time': 0.0, 'saved_time': 0.0}
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """與 socket.getaddrinfo 相同的介面，TTL 內回傳快取結果"""
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._stats['hits'] += 1
+                self._stats['saved_time'] += entry[2]
+                return list(entry[1])
+
+        result, _ = self._lookup(key)
+        with self._lock:
+            self._stats['misses'] += 1
+        return list(result)
+
+    def resolve(self, host: str, port: int = 443) -> float:
+        """
+        預先解析主機並寫入快取（使用與 urllib3 建立連線時相同的查詢參數）
+
+        Args:
+            host: 主機名稱
+            port: 連接埠
+
+        Returns:
+            本次查詢耗時（秒）
+        """
+        _, elapsed = self._lookup((host, port, allowed_gai_family(), socket.SOCK_STREAM, 0, 0))
+        with self._lock:
+            self._stats['prefetches'] += 1
+        return elapsed
+
+    def _lookup(self, key: tuple):
+        """實際查詢 DNS 並寫入快取"""
+        start = time.monotonic()
+        result = self._resolver(*key)
+        elapsed = time.monotonic() - start
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                self._entries.pop(min(self._entries, key=lambda k: self._entries[k][0]))
+            self._entries[key] = (time.monotonic(), tuple(result), elapsed)
+            self._stats['lookup_time'] += elapsed
+        return result, elapsed
+
+    def install(self):
+        """以快取取代 socket.getaddrinfo（重複呼叫無作用）"""
+        with self._lock:
+            if self._installed:
+                return
+            self._resolver = socket.getaddrinfo
+            socket.getaddrinfo = self.getaddrinfo
+            self._installed = True
+
+    def uninstall(self):
+        """還原原本的 socket.getaddrinfo"""
+        with self._lock:
+            if self._installed and socket.getaddrinfo == self.getaddrinfo:
+                socket.getaddrinfo = self._resolver
+            self._installed = False
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        取得快取統計
+
+        Returns:
+            快取項目數、命中、未命中、預先解析次數、查詢總耗時與省下的查詢時間
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+
+class ConnectionWarmer:
+    """
+    上游連線預熱器
+
+    功能：
+    - 預先解析各上游主機的 DNS
+    - 以 HEAD 請求在各上游使用的連線池建立 keep-alive 連線，可另外註冊預熱函數
+      （例如讓 Gemini SDK 建立自己的連線）
+    - 第一次預熱時比較冷連線與熱連線的延遲，估算每個上游省下的交握時間
+    - 依固定間隔刷新，讓閒置連線保持可用
+    """
+
+    def __init__(self, session=None, targets: Optional[Dict[str, str]] = None,
+                 probes: Optional[Dict[str, Callable[[], Any]]] = None,
+                 interval: Optional[float] = None, dns_cache: Optional[DNSCache] = None,
+                 sessions: Optional[Dict[str, Any]] = None):
+        """
+        初始化連線預熱器
+
+        Args:
+            session: 用於預熱的 requests Session，預設使用共用連線池
+            targets: {名稱 -> URL}，預設 DEFAULT_TARGETS
+            probes: {名稱 -> 預熱函數}，用於不經過共用連線池的用戶端
+            interval: 刷新間隔秒數，預設讀取 WARMUP_INTERVAL（預設 120）
+            dns_cache: DNS 快取，預設使用共用快取（未啟用時只預熱連線）
+            sessions: {名稱 -> requests Session}，不使用 session 的上游，預設 LINE 使用專用連線池
+        """
+        self.session = session if session is not None else get_http_session()
+        self.targets = dict(DEFAULT_TARGETS if targets is None else targets)
+        self.sessions = dict({'line': get_line_session()} if sessions is None else sessions)
+        self.probes = dict(probes or {})
+        self.interval = interval if interval is not None else float(os.getenv('WARMUP_INTERVAL', 120))
+        self.dns_cache = dns_cache if dns_cache is not None else get_dns_cache()
+        self.rate_limiter = get_rate_limiter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._upstreams: Dict[str, Dict[str, Optional[float]]] = {}
+        self._stats = {'rounds': 0, 'warmed': 0, 'errors': 0}
+
+    def warm_once(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        預熱所有上游一次
+
+        Returns:
+            {名稱 -> 該上游的延遲統計}
+        """
+        for name, url in self.targets.items():
+            parts = urlsplit(url)
+            session = self.sessions.get(name, self.session)
+            self._warm(name, lambda url=url, session=session: self._head(session, url),
+                       host=parts.hostname, port=parts.port or (443 if parts.scheme == 'https' else 80))
+        for name, probe in self.probes.items():
+            self._warm(name, probe)
+
+        with self._lock:
+            self._stats['rounds'] += 1
+            return {name: dict(upstream) for name, upstream in self._upstreams.items()}
+
+    def _head(self, session, url: str):
+        """送出預熱用的 HEAD 請求（不跟隨轉址，回應狀態碼不影響預熱）"""
+        self.rate_limiter.acquire(RateLimiter.key_for_url(url))
+        session.head(url, timeout=WARMUP_TIMEOUT, allow_redirects=False).close()
+
+    def _warm(self, name: str, request: Callable[[], Any], host: Optional[str] = None, port: int = 443):
+        """
+        預熱單一上游；第一次成功時再送出一次請求，以兩次延遲的差估算省下的交握時間
+
+        Args:
+            name: 上游名稱
+            request: 預熱請求
+            host: 需要預先解析的主機名稱
+            port: 連接埠
+        """
+        try:
+            dns_time = self.dns_cache.resolve(host, port) if host and self.dns_cache else 0.0
+            first = self._timed(request)
+
+            with self._lock:
+                upstream = self._upstreams.get(name)
+            if upstream is None:
+                # 冷連線包含 DNS 查詢、TCP 與 TLS 交握，緊接著的請求重複使用同一條連線
+                warm = self._timed(request)
+                cold = dns_time + first
+                upstream = {'cold': cold, 'warm': warm, 'saved': max(0.0, cold - warm), 'last': warm}
+                logger.info(
+                    f"{name} 連線預熱完成：冷連線 {cold * 1000:.0f} ms，熱連線 {warm * 1000:.0f} ms，"
+                    f"每次可省下約 {upstream['saved'] * 1000:.0f} ms"
+                )
+            else:
+                upstream = dict(upstream, last=first)
+
+            with self._lock:
+                self._upstreams[name] = upstream
+                self._stats['warmed'] += 1
+        except Exception as e:
+            with self._lock:
+                self._stats['errors'] += 1
+            logger.warning(f"{name} 連線預熱失敗: {str(e)}")
+
+    @staticmethod
+    def _timed(request: Callable[[], Any]) -> float:
+        """執行請求並回傳耗時（秒）"""
+        start = time.monotonic()
+        request()
+        return time.monotonic() - start
+
+    def run_forever(self):
+        """預熱後定期刷新，直到 stop() 被呼叫"""
+        logger.info(f"連線預熱啟動，刷新間隔 {self.interval} 秒")
+        while not self._stop.is_set():
+            self.warm_once()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """在 daemon 執行緒啟動預熱與定期刷新"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name='connection-warmer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止定期刷新"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def get_stats(self) -> Dict:
+        """
+        取得預熱統計
+
+        Returns:
+            預熱輪數、成功與失敗次數、各上游的冷/熱連線延遲與省下的交握時間、DNS 快取統計
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['upstreams'] = {name: dict(upstream) for name, upstream in self._upstreams.items()}
+        stats['handshake_saved'] = sum(upstream['saved'] for upstream in stats['upstreams'].values())
+        stats['dns'] = self.dns_cache.get_stats() if self.dns_cache else None
+        return stats
+
+
+# 便利函數和全域變數
+_dns_cache_instance = None
+_dns_cache_lock = threading.Lock()
+
+
+def get_dns_cache() -> Optional[DNSCache]:
+    """
+    取得行程內共用的 DNS 快取（單例模式），首次取得時安裝到 socket.getaddrinfo
+
+    Returns:
+        DNSCache 實例，未設定 DNS_CACHE_TTL 或為 0 時返回 None（預設不修改 socket.getaddrinfo）
+    """
+    global _dns_cache_instance
+    ttl = float(os.getenv('DNS_CACHE_TTL', 0))
+    if ttl <= 0:
+        return None
+    with _dns_cache_lock:
+        if _dns_cache_instance is None:
+            _dns_cache_instance = DNSCache(ttl)
+            _dns_cache_instance.install()
+            logger.info(f"DNS 快取已啟用 (TTL {ttl:g} 秒)")
+        return _dns_cache_instance